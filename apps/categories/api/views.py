@@ -1,5 +1,6 @@
 import logging
 from django.core.cache import cache
+from django.http import HttpResponse
 from rest_framework.response import Response
 from rest_framework import status, viewsets
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
@@ -117,8 +118,9 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet, BaseResponseMixin):
             request.query_params.get("include_inactive", "false").lower() == "true"
         )
 
-        tree_data = CategoryService.get_category_tree(max_depth, include_inactive)
-        return Response(tree_data)
+        # The tree is cached pre-serialized, so skip the renderer entirely
+        tree_json = CategoryService.get_category_tree_json(max_depth, include_inactive)
+        return HttpResponse(tree_json, content_type="application/json")
 
     @extend_schema(**category_viewset_schema.get("subcategories", {}))
     @action(detail=True, methods=["get"])
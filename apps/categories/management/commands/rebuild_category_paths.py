@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.categories.models import Category
+from apps.categories.services import CategoryService
+from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized category paths and depths from parent links"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows updated per batch (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding category paths...")
+
+        with transaction.atomic():
+            updated = Category.rebuild_paths(batch_size=options["batch_size"])
+        CategoryService.rebuild_category_tree_cache()
+        CategoryBreadcrumbIndex.bump_generation()
+
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} category paths"))
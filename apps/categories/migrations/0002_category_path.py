@@ -0,0 +1,48 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:45
+
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    Category = apps.get_model("categories", "Category")
+    rows = list(Category.objects.values_list("id", "parent_id"))
+    children = {}
+    for category_id, parent_id in rows:
+        children.setdefault(parent_id, []).append(category_id)
+
+    updated = []
+    stack = [(category_id, "") for category_id in children.get(None, [])]
+    while stack:
+        category_id, parent_path = stack.pop()
+        path = f"{parent_path}{category_id.hex}/"
+        updated.append(
+            Category(id=category_id, path=path, depth=path.count("/") - 1)
+        )
+        stack.extend((child, path) for child in children.get(category_id, []))
+
+    Category.objects.bulk_update(updated, ["path", "depth"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('categories', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='path',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1024),
+        ),
+        migrations.AddIndex(
+            model_name='category',
+            index=models.Index(fields=['path'], name='categories_path_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,14 @@
+import uuid
+
 from django.utils.text import slugify
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, Q, Value
+from django.db.models.functions import Concat, Substr
 
 from apps.core.models import BaseModel
 
+PATH_SEPARATOR = "/"
+
 
 class Category(BaseModel):
     name = models.CharField(max_length=100)
@@ -17,13 +23,70 @@ class Category(BaseModel):
     )
     is_active = models.BooleanField(default=True)
 
+    # Materialized path: hex ids from the root down to this category, each
+    # followed by PATH_SEPARATOR. Maintained in save()/delete() so ancestors,
+    # descendants and subtree filters are single indexed queries.
+    path = models.CharField(max_length=1024, blank=True, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
     class Meta:
         db_table = "categories"
         verbose_name_plural = "Categories"
+        indexes = [
+            # varchar_pattern_ops lets PostgreSQL use the index for LIKE 'prefix%'
+            models.Index(
+                fields=["path"],
+                name="categories_path_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    @staticmethod
+    def build_path(category_id, parent_path=""):
+        return f"{parent_path}{category_id.hex}{PATH_SEPARATOR}"
+
+    @property
+    def ancestor_ids(self):
+        """Ids of all ancestors, root first, parsed from the path"""
+        return [
+            uuid.UUID(segment) for segment in self.path.split(PATH_SEPARATOR)[:-2]
+        ]
+
+    def set_path(self, parent_path=None):
+        """Recompute path/depth from the parent, loading its path if not given"""
+        if not self.parent_id:
+            parent_path = ""
+        elif parent_path is None:
+            parent_path = (
+                Category.objects.filter(pk=self.parent_id)
+                .values_list("path", flat=True)
+                .first()
+                or ""
+            )
+        self.path = self.build_path(self.id, parent_path)
+        self.depth = self.path.count(PATH_SEPARATOR) - 1
+
+    def get_ancestors(self):
+        """All ancestors root first, in one query"""
+        ancestor_ids = self.ancestor_ids
+        if not ancestor_ids:
+            return []
+        return list(Category.objects.filter(id__in=ancestor_ids).order_by("depth"))
+
+    def get_descendants(self, include_self=False):
+        """All descendants at any depth, in one indexed prefix query"""
+        queryset = Category.objects.filter(path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        return queryset
+
+    def subtree_q(self, prefix="category__"):
+        """Q object matching rows whose category is in this subtree"""
+        return Q(**{f"{prefix}path__startswith": self.path})
+
     def save(self, *args, **kwargs):
         if not self.slug:
             base_slug = slugify(self.name)
@@ -33,4 +96,94 @@ class Category(BaseModel):
                 slug = f"{base_slug}-{num}"
                 num += 1
             self.slug = slug
-        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" not in update_fields:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                self._schedule_cache_refresh()
+            return
+
+        old_path = None
+        if not self._state.adding:
+            old_path = (
+                Category.objects.filter(pk=self.pk)
+                .values_list("path", flat=True)
+                .first()
+            )
+        self.set_path()
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "path", "depth"}
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if old_path and old_path != self.path:
+                self._move_descendants(old_path, self.path)
+            self._schedule_cache_refresh()
+
+    def delete(self, *args, **kwargs):
+        # Children are re-parented to NULL by SET_NULL, so the subtree below
+        # this category becomes a set of new roots.
+        old_path = self.path
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            if old_path:
+                self._move_descendants(old_path, "")
+            self._schedule_cache_refresh()
+        return result
+
+    @staticmethod
+    def _schedule_cache_refresh():
+        """
+        Refresh the derived tree and breadcrumb caches after commit. Call it
+        inside the write's atomic block, after the write, so a failed write
+        queues nothing and the callbacks never run ahead of the data.
+        """
+        from apps.categories.services import CategoryService
+        from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
+
+        CategoryService.schedule_tree_rebuild()
+        transaction.on_commit(CategoryBreadcrumbIndex.bump_generation)
+
+    @staticmethod
+    def _move_descendants(old_prefix, new_prefix):
+        """Rewrite the path prefix of every descendant in a single UPDATE"""
+        depth_delta = new_prefix.count(PATH_SEPARATOR) - old_prefix.count(
+            PATH_SEPARATOR
+        )
+        Category.objects.filter(path__startswith=old_prefix).exclude(
+            path=old_prefix
+        ).update(
+            path=Concat(Value(new_prefix), Substr("path", len(old_prefix) + 1)),
+            depth=F("depth") + depth_delta,
+        )
+
+    @classmethod
+    def rebuild_paths(cls, batch_size=1000):
+        """
+        Recompute every path/depth from parent ids. Returns the number of
+        rows updated; categories caught in a parent cycle are left untouched.
+        """
+        rows = list(cls.objects.values_list("id", "parent_id", "path"))
+        children = {}
+        for category_id, parent_id, _ in rows:
+            children.setdefault(parent_id, []).append(category_id)
+        current_paths = {category_id: path for category_id, _, path in rows}
+
+        changed = []
+        stack = [(category_id, "") for category_id in children.get(None, [])]
+        while stack:
+            category_id, parent_path = stack.pop()
+            path = cls.build_path(category_id, parent_path)
+            if current_paths[category_id] != path:
+                changed.append(
+                    cls(
+                        id=category_id,
+                        path=path,
+                        depth=path.count(PATH_SEPARATOR) - 1,
+                    )
+                )
+            stack.extend((child, path) for child in children.get(category_id, []))
+
+        cls.objects.bulk_update(changed, ["path", "depth"], batch_size=batch_size)
+        return len(changed)
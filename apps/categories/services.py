@@ -1,13 +1,16 @@
 from django.db import transaction
 from django.core.cache import cache
-from django.db.models import Count, Prefetch, Q
+from django.db.models import Count, Q
 from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
 from typing import List, Dict, Optional, Any
+import json
 import logging
 from django.core.exceptions import ValidationError
 from django.utils.text import slugify
 
 from apps.categories.models import Category
+from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
 from apps.core.utils.cache_key_manager import CacheKeyManager
 from apps.core.utils.cache_manager import CacheManager
 from apps.products.models import Product
@@ -15,6 +18,10 @@ from apps.products.models import Product
 logger = logging.getLogger(__name__)
 
 CACHE_TTL = getattr(settings, "CATEGORIES_CACHE_TTL", 300)
+# Deepest tree the API serves; one blob is kept per depth up to this
+TREE_MAX_DEPTH = 5
+TREE_CACHE_TIMEOUT = getattr(settings, "CATEGORY_TREE_CACHE_TIMEOUT", 60 * 60 * 24)
+TREE_REBUILD_PENDING_TTL = 60
 
 
 class CategoryService:
@@ -29,98 +36,119 @@ class CategoryService:
     def get_category_tree(
         cls, max_depth: int = 3, include_inactive: bool = False
     ) -> List[Dict]:
+        """Get the hierarchical category tree as Python data."""
+        return json.loads(cls.get_category_tree_json(max_depth, include_inactive))
+
+    @classmethod
+    def get_category_tree_json(
+        cls, max_depth: int = 3, include_inactive: bool = False
+    ) -> str:
         """
-        Get hierarchical category tree with optimized queries and caching.
+        Get the pre-serialized category tree. The blobs are rebuilt in the
+        background after category writes, so this is normally one cache read.
         """
-        if CacheManager.cache_exists(
-            "category", "tree", max_depth=max_depth, include_inactive=include_inactive
-        ):
-            cache_key = CacheKeyManager.make_key(
-                "category",
-                "tree",
-                max_depth=max_depth,
-                include_inactive=include_inactive,
-            )
-            cached_result = cache.get(cache_key)
-            return cached_result
-
-        # Build optimized queryset with prefetch
-        base_queryset = Category.objects.select_related("parent")
+        if max_depth < 1:
+            return "[]"
+        max_depth = min(max_depth, TREE_MAX_DEPTH)
 
-        if not include_inactive:
-            base_queryset = base_queryset.filter(is_active=True)
+        cache_key = CacheKeyManager.make_key(
+            "category", "tree", max_depth=max_depth, include_inactive=include_inactive
+        )
+        tree_json = cache.get(cache_key)
+        if tree_json is None:
+            tree_json = cls.rebuild_category_tree_cache()[
+                (max_depth, include_inactive)
+            ]
+        return tree_json
 
-        # Get root categories with all descendants in one query
-        root_categories = base_queryset.filter(parent=None).prefetch_related(
-            Prefetch(
-                "subcategories",
-                queryset=cls._get_nested_subcategories_queryset(
-                    max_depth - 1, include_inactive
-                ),
-                to_attr="prefetched_subcategories",
+    @classmethod
+    def rebuild_category_tree_cache(cls) -> Dict:
+        """
+        Rebuild every (max_depth, include_inactive) tree blob from a single
+        flat scan of the categories table. Returns the blobs by variant.
+        """
+        rows = list(
+            Category.objects.filter(depth__lt=TREE_MAX_DEPTH)
+            .order_by("depth", "name")
+            .values(
+                "id",
+                "parent_id",
+                "depth",
+                "name",
+                "description",
+                "slug",
+                "is_active",
             )
         )
+        active_rows = [row for row in rows if row["is_active"]]
 
-        def build_tree_data(categories, current_depth=0):
-            if current_depth >= max_depth:
-                return []
-
-            result = []
-            for category in categories:
-                category_data = {
-                    "id": category.id,
-                    "name": category.name,
-                    "description": category.description,
-                    "slug": category.slug,
-                    "is_active": category.is_active,
-                    "subcategories": [],
-                }
-
-                if (
-                    hasattr(category, "prefetched_subcategories")
-                    and current_depth < max_depth - 1
-                ):
-                    category_data["subcategories"] = build_tree_data(
-                        category.prefetched_subcategories, current_depth + 1
-                    )
-
-                result.append(category_data)
-
-            return result
+        blobs = {}
+        for include_inactive, variant_rows in ((False, active_rows), (True, rows)):
+            for max_depth in range(1, TREE_MAX_DEPTH + 1):
+                blobs[(max_depth, include_inactive)] = json.dumps(
+                    cls._build_tree(variant_rows, max_depth), cls=DjangoJSONEncoder
+                )
 
-        tree_data = build_tree_data(root_categories)
-        cache_key = CacheKeyManager.make_key(
-            "category", "tree", max_depth=max_depth, include_inactive=include_inactive
+        cache.set_many(
+            {
+                CacheKeyManager.make_key(
+                    "category",
+                    "tree",
+                    max_depth=max_depth,
+                    include_inactive=include_inactive,
+                ): blob
+                for (max_depth, include_inactive), blob in blobs.items()
+            },
+            TREE_CACHE_TIMEOUT,
         )
-        cache.set(cache_key, tree_data, cls.CACHE_TIMEOUT)
+        logger.info(f"Rebuilt category tree cache from {len(rows)} categories")
+        return blobs
 
-        return tree_data
+    @staticmethod
+    def _build_tree(rows, max_depth: int) -> List[Dict]:
+        """
+        Assemble nested tree data in O(n). Rows must be ordered by depth so
+        parents are indexed before their children; children of a filtered
+        out parent are dropped along with it.
+        """
+        nodes = {}
+        roots = []
+        for row in rows:
+            if row["depth"] >= max_depth:
+                break
+            node = {
+                "id": row["id"],
+                "name": row["name"],
+                "description": row["description"],
+                "slug": row["slug"],
+                "is_active": row["is_active"],
+                "subcategories": [],
+            }
+            if row["parent_id"] is None:
+                roots.append(node)
+            elif row["parent_id"] in nodes:
+                nodes[row["parent_id"]]["subcategories"].append(node)
+            else:
+                continue
+            nodes[row["id"]] = node
+        return roots
+
+    @staticmethod
+    def schedule_tree_rebuild():
+        """
+        Queue a background rebuild of the tree blobs once the current
+        transaction commits. Writes landing before the queued task starts
+        share that task, so bursts of writes trigger a single rebuild.
+        """
+        from apps.categories.tasks import rebuild_category_tree_cache
 
-    @classmethod
-    def _get_nested_subcategories_queryset(
-        cls, depth: int, include_inactive: bool = False
-    ):
-        """Helper to build nested prefetch queryset."""
-        if depth <= 0:
-            return Category.objects.none()
-
-        queryset = Category.objects.select_related("parent")
-
-        if not include_inactive:
-            queryset = queryset.filter(is_active=True)
-
-        if depth > 1:
-            queryset = queryset.prefetch_related(
-                Prefetch(
-                    "subcategories",
-                    queryset=cls._get_nested_subcategories_queryset(
-                        depth - 1, include_inactive
-                    ),
-                    to_attr="prefetched_subcategories",
-                )
-            )
+        pending_key = CacheKeyManager.make_key("category", "tree_rebuild_pending")
 
-        return queryset
+        def enqueue():
+            if cache.add(pending_key, 1, TREE_REBUILD_PENDING_TTL):
+                rebuild_category_tree_cache.delay()
+
+        transaction.on_commit(enqueue)
 
     @classmethod
     def get_category_with_products(
@@ -141,9 +169,8 @@ class CategoryService:
 
         # Build product queryset
         if include_subcategories:
-            category_ids = cls.get_all_subcategory_ids(category_id)
             product_queryset = Product.objects.filter(
-                category_id__in=category_ids, is_active=True
+                category.subtree_q(), is_active=True
             )
         else:
             product_queryset = Product.objects.filter(category=category, is_active=True)
@@ -162,8 +189,8 @@ class CategoryService:
     @classmethod
     def get_all_subcategory_ids(cls, category_id: int) -> List[int]:
         """
-        Get all subcategory IDs recursively using a single query.
-        More efficient than recursive function calls.
+        Get the ids of a category and all of its descendants.
+        Uses the materialized path, so the subtree is one indexed prefix query.
         """
         if CacheManager.cache_exists(
             "category", "subcategory_ids", category_id=category_id
@@ -174,25 +201,19 @@ class CategoryService:
             cached_result = cache.get(cache_key)
             return cached_result
 
-        # Use CTE (Common Table Expression) for PostgreSQL or recursive query
-        # This is more efficient than multiple queries
-        from django.db import connection
-
-        with connection.cursor() as cursor:
-            cursor.execute(
-                """
-                WITH RECURSIVE subcategories AS (
-                    SELECT id FROM categories WHERE id = %s
-                    UNION ALL
-                    SELECT c.id FROM categories c
-                    INNER JOIN subcategories s ON c.parent_id = s.id
-                )
-                SELECT id FROM subcategories
-            """,
-                [category_id],
-            )
+        path = (
+            Category.objects.filter(id=category_id)
+            .values_list("path", flat=True)
+            .first()
+        )
+        if not path:
+            return []
 
-            category_ids = [row[0] for row in cursor.fetchall()]
+        category_ids = list(
+            Category.objects.filter(path__startswith=path).values_list(
+                "id", flat=True
+            )
+        )
 
         cache_key = CacheKeyManager.make_key(
             "category", "subcategory_ids", category_id=category_id
@@ -200,6 +221,14 @@ class CategoryService:
         cache.set(cache_key, category_ids, cls.CACHE_TIMEOUT)
         return category_ids
 
+    @staticmethod
+    def _invalidate_subcategory_ids(*category_ids):
+        """Drop cached subtree id lists for the given categories"""
+        for category_id in set(category_ids):
+            CacheManager.invalidate_key(
+                "category", "subcategory_ids", category_id=category_id
+            )
+
     @classmethod
     def get_popular_categories(cls, limit: int = 10) -> List[Category]:
         """Get popular categories with product counts."""
@@ -236,6 +265,7 @@ class CategoryService:
 
             # Create the category
             category = Category.objects.create(**data)
+            cls._invalidate_subcategory_ids(*category.ancestor_ids)
 
             # Clear related caches
             CacheManager.invalidate_key("category", "list", include_inactive=False)
@@ -261,6 +291,7 @@ class CategoryService:
             with transaction.atomic():
                 # --- STEP 1: PRE‐VALIDATE PARENTS (unchanged) ---
                 parent_ids = []
+                existing_parents = {}
                 for i, data in enumerate(categories_data):
                     if not isinstance(data, dict):
                         raise ValidationError(
@@ -291,7 +322,15 @@ class CategoryService:
                             f"Category data at index {i} must be a dict"
                         )
                     clean = {k: v for k, v in data.items() if k in valid_fields}
-                    categories_to_create.append(Category(**clean))
+                    category = Category(**clean)
+                    # bulk_create bypasses save(), so set the path here
+                    parent = clean.get("parent")
+                    category.set_path(
+                        existing_parents[getattr(parent, "id", parent)].path
+                        if parent is not None
+                        else ""
+                    )
+                    categories_to_create.append(category)
 
                 # --- STEP 3: GENERATE UNIQUE SLUGS ---
                 if categories_to_create:
@@ -337,6 +376,15 @@ class CategoryService:
 
                 # --- STEP 6: CACHE INVALIDATION ---
                 CacheManager.invalidate_key("category", "list", include_inactive=False)
+                cls.schedule_tree_rebuild()
+                transaction.on_commit(CategoryBreadcrumbIndex.bump_generation)
+                cls._invalidate_subcategory_ids(
+                    *(
+                        ancestor_id
+                        for category in categories_to_create
+                        for ancestor_id in category.ancestor_ids
+                    )
+                )
                 logger.info("Category list cache invalidated")
 
                 return created_categories
@@ -353,6 +401,7 @@ class CategoryService:
         """Update category with validation."""
         with transaction.atomic():
             category = Category.objects.get(id=category_id)
+            old_ancestor_ids = category.ancestor_ids
 
             # Validate parent relationship if changing parent
             if "parent" in data:
@@ -365,6 +414,10 @@ class CategoryService:
 
             # Clear related caches
             CacheManager.invalidate_key("category", "list", include_inactive=False)
+            if old_ancestor_ids != category.ancestor_ids:
+                cls._invalidate_subcategory_ids(
+                    *old_ancestor_ids, *category.ancestor_ids
+                )
 
             return category
 
@@ -379,12 +432,9 @@ class CategoryService:
         if instance and instance.id == parent.id:
             raise ValueError("A category cannot be its own parent.")
 
-        # Check for circular reference
-        current = parent
-        while current and current.parent:
-            if instance and current.parent.id == instance.id:
-                raise ValueError("Circular reference detected in category hierarchy.")
-            current = current.parent
+        # The new parent must not sit inside this category's own subtree
+        if instance and instance.id in parent.ancestor_ids:
+            raise ValueError("Circular reference detected in category hierarchy.")
 
     @classmethod
     def _apply_product_filters(cls, queryset, filters: Dict[str, Any]):
@@ -0,0 +1,15 @@
+from celery import shared_task
+from django.core.cache import cache
+
+from apps.categories.services import CategoryService
+from apps.core.utils.cache_key_manager import CacheKeyManager
+
+
+@shared_task
+def rebuild_category_tree_cache():
+    """Rebuild the pre-serialized category tree blobs after category writes."""
+    # Clear the pending marker first so writes committed during the rebuild
+    # queue another run instead of being lost.
+    cache.delete(CacheKeyManager.make_key("category", "tree_rebuild_pending"))
+    blobs = CategoryService.rebuild_category_tree_cache()
+    return len(blobs)
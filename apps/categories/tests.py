@@ -1,3 +1,159 @@
-from django.test import TestCase
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError
 
-# Create your tests here.
+from apps.categories.models import Category
+from apps.categories.services import CategoryService
+from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
+from apps.core.utils.breadcrumbs import BreadcrumbService
+
+
+@pytest.mark.django_db
+class TestCategoryPaths:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.root = Category.objects.create(name="Electronics", slug="electronics")
+        self.child = Category.objects.create(
+            name="Phones", slug="phones", parent=self.root
+        )
+        self.leaf = Category.objects.create(
+            name="Smartphones", slug="smartphones", parent=self.child
+        )
+        self.other = Category.objects.create(name="Fashion", slug="fashion")
+
+    def test_paths_follow_parents(self):
+        self.leaf.refresh_from_db()
+        assert self.leaf.depth == 2
+        assert self.leaf.ancestor_ids == [self.root.id, self.child.id]
+        assert self.leaf.get_ancestors() == [self.root, self.child]
+        assert set(self.root.get_descendants()) == {self.child, self.leaf}
+
+    def test_move_rewrites_descendant_paths(self):
+        self.child.parent = self.other
+        self.child.save()
+
+        self.leaf.refresh_from_db()
+        assert self.leaf.ancestor_ids == [self.other.id, self.child.id]
+        assert self.leaf.depth == 2
+        assert list(self.root.get_descendants()) == []
+
+    def test_delete_promotes_children_to_roots(self):
+        self.root.delete()
+
+        self.leaf.refresh_from_db()
+        assert self.leaf.ancestor_ids == [self.child.id]
+        assert self.leaf.depth == 1
+
+    def test_subcategory_ids_and_circular_parent(self):
+        ids = CategoryService.get_all_subcategory_ids(str(self.child.id))
+        assert set(ids) == {self.child.id, self.leaf.id}
+
+        with pytest.raises(ValueError):
+            CategoryService._validate_parent_relationship(self.root, self.leaf)
+
+    def test_rebuild_command_repairs_paths(self):
+        Category.objects.update(path="", depth=0)
+
+        call_command("rebuild_category_paths")
+
+        self.leaf.refresh_from_db()
+        assert self.leaf.ancestor_ids == [self.root.id, self.child.id]
+        assert self.leaf.depth == 2
+
+
+@pytest.mark.django_db
+class TestCategoryTreeCache:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.root = Category.objects.create(name="Electronics", slug="electronics")
+        self.child = Category.objects.create(
+            name="Phones", slug="phones", parent=self.root
+        )
+        self.hidden = Category.objects.create(
+            name="Archived", slug="archived", parent=self.root, is_active=False
+        )
+        Category.objects.create(name="Cases", slug="cases", parent=self.hidden)
+        CategoryService.rebuild_category_tree_cache()
+
+    def test_tree_is_built_from_flat_scan(self):
+        tree = CategoryService.get_category_tree(max_depth=3)
+        assert [node["name"] for node in tree] == ["Electronics"]
+        assert [node["name"] for node in tree[0]["subcategories"]] == ["Phones"]
+
+        full = CategoryService.get_category_tree(max_depth=3, include_inactive=True)
+        archived = full[0]["subcategories"][0]
+        assert archived["name"] == "Archived"
+        assert [node["name"] for node in archived["subcategories"]] == ["Cases"]
+
+        shallow = CategoryService.get_category_tree(max_depth=1)
+        assert shallow[0]["subcategories"] == []
+
+    def test_write_rebuilds_tree_in_background(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            self.child.name = "Mobile Phones"
+            self.child.save()
+
+        tree = CategoryService.get_category_tree(max_depth=2)
+        assert tree[0]["subcategories"][0]["name"] == "Mobile Phones"
+
+    def test_failed_write_queues_no_rebuild(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with pytest.raises(IntegrityError):
+                Category.objects.create(name="Duplicate", slug="phones")
+
+        assert callbacks == []
+
+
+@pytest.mark.django_db
+class TestCategoryBreadcrumbIndex:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.root = Category.objects.create(name="Electronics", slug="electronics")
+        self.child = Category.objects.create(
+            name="Phones", slug="phones", parent=self.root
+        )
+        CategoryBreadcrumbIndex.bump_generation()
+
+    def test_breadcrumbs_need_no_queries_once_indexed(
+        self, django_assert_num_queries
+    ):
+        BreadcrumbService.for_category(self.child)
+
+        with django_assert_num_queries(0):
+            crumbs = BreadcrumbService.for_category(self.child)
+
+        assert [crumb["name"] for crumb in crumbs] == [
+            BreadcrumbService.HOME_NAME,
+            "Electronics",
+            "Phones",
+        ]
+
+    def test_rename_bumps_generation(self, django_capture_on_commit_callbacks):
+        BreadcrumbService.for_category(self.child)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.root.name = "Gadgets"
+            self.root.save()
+
+        crumbs = BreadcrumbService.for_category(self.child)
+        assert crumbs[1]["name"] == "Gadgets"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_generation_is_bumped_after_the_delete(monkeypatch):
+    root = Category.objects.create(name="Electronics", slug="electronics")
+    child = Category.objects.create(name="Phones", slug="phones", parent=root)
+    seen = []
+    monkeypatch.setattr(
+        CategoryBreadcrumbIndex,
+        "bump_generation",
+        lambda: seen.append(Category.objects.filter(pk=root.pk).exists()),
+    )
+
+    root.delete()
+
+    assert seen == [False]
+    child.refresh_from_db()
+    assert child.ancestor_ids == []
@@ -0,0 +1,102 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django_redis import get_redis_connection
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryBreadcrumbIndex:
+    """
+    Precomputed ancestor chains for every category.
+
+    The map ``{category_id: [(id, name, slug), ...]}`` (root first, the
+    category itself last) is built from one flat scan and stored in Redis
+    under the current breadcrumb generation. Each process keeps a copy in
+    memory and only re-reads the generation every ``L1_CHECK_INTERVAL``
+    seconds, so breadcrumbs for a whole page need no queries at all.
+    Category saves and deletes bump the generation.
+    """
+
+    MAP_TTL = getattr(settings, "CATEGORY_BREADCRUMB_MAP_TTL", 60 * 60 * 24)
+    L1_CHECK_INTERVAL = getattr(
+        settings, "CATEGORY_BREADCRUMB_L1_CHECK_INTERVAL", 5
+    )
+
+    _local = {"generation": None, "checked_at": 0.0, "chains": None}
+
+    @classmethod
+    def _generation_key(cls):
+        return CacheKeyManager.make_key("category", "breadcrumb_generation")
+
+    @classmethod
+    def get_generation(cls) -> int:
+        redis_conn = get_redis_connection("default")
+        return int(redis_conn.get(cls._generation_key()) or 0)
+
+    @classmethod
+    def bump_generation(cls):
+        """Invalidate the map everywhere; processes pick it up on next check"""
+        redis_conn = get_redis_connection("default")
+        redis_conn.incr(cls._generation_key())
+        cls._local["checked_at"] = 0.0
+
+    @classmethod
+    def get_chain(cls, category_id):
+        """Ancestor chain for a category, or None if it is not indexed"""
+        return cls.get_map().get(str(category_id))
+
+    @classmethod
+    def get_map(cls) -> dict:
+        local = cls._local
+        now = time.monotonic()
+        if (
+            local["chains"] is not None
+            and now - local["checked_at"] < cls.L1_CHECK_INTERVAL
+        ):
+            return local["chains"]
+
+        generation = cls.get_generation()
+        if local["chains"] is None or local["generation"] != generation:
+            cache_key = CacheKeyManager.make_key(
+                "category", "breadcrumb_map", generation=generation
+            )
+            chains = cache.get(cache_key)
+            if chains is None:
+                chains = cls.build()
+                cache.set(cache_key, chains, cls.MAP_TTL)
+            cls._local = local = {
+                "generation": generation,
+                "checked_at": now,
+                "chains": chains,
+            }
+        else:
+            local["checked_at"] = now
+        return local["chains"]
+
+    @staticmethod
+    def build() -> dict:
+        """Build every ancestor chain from a single scan of the categories"""
+        from apps.categories.models import PATH_SEPARATOR, Category
+
+        rows = list(Category.objects.values_list("id", "name", "slug", "path"))
+        crumbs = {
+            category_id.hex: (str(category_id), name, slug)
+            for category_id, name, slug, _ in rows
+        }
+
+        chains = {}
+        for category_id, _, _, path in rows:
+            segments = [segment for segment in path.split(PATH_SEPARATOR) if segment]
+            if not segments:
+                continue
+            chains[str(category_id)] = [
+                crumbs[segment] for segment in segments if segment in crumbs
+            ]
+
+        logger.info(f"Built category breadcrumb index for {len(chains)} categories")
+        return chains
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.partitioning import PartitionManager
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the tables in PARTITIONED_TABLES to monthly partitions, "
+        "create upcoming partitions and expire old ones (PostgreSQL only)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--table",
+            action="append",
+            dest="tables",
+            help="Limit to this table; repeatable (default: all configured)",
+        )
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help=(
+                "Partition tables that are not partitioned yet. Locks each "
+                "table for the duration; run in a maintenance window"
+            ),
+        )
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.PARTITION_PREMAKE_MONTHS,
+            help="Months of partitions to keep ready (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--archive-dir",
+            default=settings.PARTITION_ARCHIVE_DIR,
+            help="Export expired partitions here as gzipped CSV first",
+        )
+        parser.add_argument(
+            "--no-expire",
+            action="store_true",
+            help="Only create partitions, never detach or drop",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Show what would be created and expired",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            managers = (
+                [PartitionManager.for_table(table) for table in options["tables"]]
+                if options["tables"]
+                else PartitionManager.configured()
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        if managers and not managers[0].supported:
+            raise CommandError("Partitioning requires PostgreSQL")
+
+        now = timezone.now()
+        for manager in managers:
+            if not manager.is_partitioned():
+                if not options["convert"]:
+                    self.stdout.write(
+                        f"{manager.table}: not partitioned (use --convert)"
+                    )
+                    continue
+                if options["dry_run"]:
+                    self.stdout.write(f"{manager.table}: would convert")
+                    continue
+                try:
+                    legacy = manager.convert(now=now)
+                except ValueError as e:
+                    raise CommandError(f"{manager.table}: {e}")
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{manager.table}: partitioned, existing rows in {legacy}"
+                    )
+                )
+
+            if options["dry_run"]:
+                existing = manager.partitions()
+                months = manager.months_to_create(existing, now, options["ahead"])
+                cutoff = manager.retention_cutoff(now)
+                expired = (
+                    manager.partitions_before(existing, cutoff)
+                    if cutoff and not options["no_expire"]
+                    else []
+                )
+                self.stdout.write(
+                    f"{manager.table}: would create "
+                    f"{[manager.partition_name(m) for m in months]}, "
+                    f"would {manager.expire_mode} {expired}"
+                )
+                continue
+
+            created = manager.create_ahead(now=now, ahead=options["ahead"])
+            expired = (
+                []
+                if options["no_expire"]
+                else manager.expire(now=now, archive_dir=options["archive_dir"])
+            )
+            self.stdout.write(
+                f"{manager.table}: created {len(created)}, "
+                f"{manager.expire_mode} {len(expired)} "
+                f"({len(manager.partitions())} attached)"
+            )
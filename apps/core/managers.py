@@ -1,7 +1,8 @@
 from django.db import models, transaction
-from django.db.models.signals import post_delete, pre_delete
 from django.utils import timezone
 
+from .signals import bulk_soft_deleted
+
 
 class SoftDeleteQuerySet(models.QuerySet):
     """
@@ -10,19 +11,28 @@ class SoftDeleteQuerySet(models.QuerySet):
 
     def delete(self):
         """
-        Override the default delete method to perform a soft delete on each instance.
+        Soft delete the rows not deleted yet with one UPDATE and announce them
+        with a single ``bulk_soft_deleted`` signal carrying their ids, so
+        receivers can act on the whole batch instead of once per instance.
+        Deleting a single instance still sends pre_delete/post_delete.
         """
-        with transaction.atomic():
-            # Send pre_delete signals for each instance
-            for obj in self:
-                pre_delete.send(sender=obj.__class__, instance=obj)
-
-            result = self.update(deleted_at=timezone.now())
+        deleted_at = timezone.now()
+        with transaction.atomic(using=self.db):
+            ids = list(
+                self.filter(deleted_at__isnull=True)
+                .order_by()
+                .values_list("pk", flat=True)
+            )
+            if not ids:
+                return 0
 
-            # Send post_delete signals for each instance
-            for obj in self:
-                post_delete.send(sender=obj.__class__, instance=obj)
+            result = self.model._base_manager.using(self.db).filter(
+                pk__in=ids
+            ).update(deleted_at=deleted_at)
 
+            bulk_soft_deleted.send(
+                sender=self.model, ids=ids, deleted_at=deleted_at, using=self.db
+            )
             return result
 
 
@@ -1,13 +1,249 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import datetime
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder drops microseconds, which keyset comparisons need"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ApproximateCount:
+    """
+    Cheap totals for keyset pages. Unfiltered PostgreSQL tables use the
+    planner estimate in ``pg_class.reltuples``; everything else is an exact
+    COUNT(*) cached per filter hash for ``PAGINATION_COUNT_CACHE_TTL``.
+    """
+
+    CACHE_TTL = getattr(settings, "PAGINATION_COUNT_CACHE_TTL", 300)
+
+    @classmethod
+    def for_queryset(cls, queryset) -> int:
+        queryset = queryset.order_by()
+
+        if not queryset.query.where:
+            estimate = cls._estimate_table_rows(queryset)
+            if estimate is not None:
+                return estimate
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        filter_hash = hashlib.md5(f"{sql}|{params}".encode()).hexdigest()
+
+        cache_key = CacheKeyManager.make_key(
+            "pagination",
+            "count",
+            model=queryset.model._meta.label_lower,
+            filter_hash=filter_hash,
+        )
+        count = cache.get(cache_key)
+        if count is None:
+            count = queryset.count()
+            cache.set(cache_key, count, cls.CACHE_TTL)
+        return count
+
+    @staticmethod
+    def _estimate_table_rows(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0) until the table has been analyzed
+        if not row or row[0] <= 0:
+            return None
+        return int(row[0])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (sort key, primary key).
+
+    The sort key is the first field of the queryset's ordering and must be a
+    non-nullable column on the model; the primary key breaks ties, so every
+    page is an indexed range scan instead of an OFFSET. Totals come from
+    ``ApproximateCount``.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 20
+
+    def __init__(self, page_size=None):
+        if page_size:
+            self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.sort_field, self.descending = self._get_sort_key(queryset)
+        pk_name = queryset.model._meta.pk.name
+        self.pk_name = pk_name
+
+        cursor = self._decode_cursor(request)
+        reverse = bool(cursor and cursor["r"])
+        # Walking backwards flips both the comparison and the ordering
+        descending = self.descending != reverse
+
+        self.count = ApproximateCount.for_queryset(queryset)
+
+        prefix = "-" if descending else ""
+        page_queryset = queryset.order_by(
+            f"{prefix}{self.sort_field}", f"{prefix}{pk_name}"
+        )
+        if cursor:
+            lookup = "lt" if descending else "gt"
+            page_queryset = page_queryset.filter(
+                Q(**{f"{self.sort_field}__{lookup}": cursor["v"]})
+                | Q(
+                    **{
+                        self.sort_field: cursor["v"],
+                        f"{pk_name}__{lookup}": cursor["id"],
+                    }
+                )
+            )
+
+        results = list(page_queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.page = results
+        self.has_next = has_more if not reverse else True
+        self.has_previous = bool(cursor) and (has_more if reverse else True)
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "links": {
+                    "next": self.get_next_link(),
+                    "previous": self.get_previous_link(),
+                },
+                "count": self.count,
+                "count_is_approximate": True,
+                "page_size": self.page_size,
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link_for(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link_for(self.page[0], reverse=True)
+
+    def _link_for(self, obj, reverse):
+        cursor = {
+            "v": getattr(obj, self.sort_field),
+            "id": getattr(obj, self.pk_name),
+            "r": reverse,
+        }
+        token = base64.urlsafe_b64encode(
+            json.dumps(cursor, cls=CursorJSONEncoder).encode()
+        ).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def _decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(token.encode()))
+            return {"v": cursor["v"], "id": cursor["id"], "r": bool(cursor["r"])}
+        except (TypeError, ValueError, KeyError):
+            raise NotFound("Invalid cursor")
+
+    @staticmethod
+    def _get_sort_key(queryset):
+        ordering = list(queryset.query.order_by) or list(
+            queryset.model._meta.ordering
+        )
+        pk_name = queryset.model._meta.pk.name
+        if not ordering:
+            return pk_name, False
+
+        field_name = ordering[0]
+        if not isinstance(field_name, str):
+            raise ValidationError(
+                {"cursor": "Cursor pagination is not available for this ordering."}
+            )
+        descending = field_name.startswith("-")
+        field_name = field_name.lstrip("-")
+        if field_name in ("pk", pk_name):
+            return pk_name, descending
+
+        try:
+            field = queryset.model._meta.get_field(field_name)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not field.concrete or field.null:
+            raise ValidationError(
+                {
+                    "cursor": "Cursor pagination is not available when ordering "
+                    f"by '{field_name}'."
+                }
+            )
+        return field.attname, descending
+
+
+def wants_cursor_pagination(request) -> bool:
+    """Clients opt in with ?pagination=cursor; follow-up pages carry ?cursor="""
+    if request is None:
+        return False
+    params = request.query_params
+    return (
+        params.get("pagination") == "cursor"
+        or KeysetPagination.cursor_query_param in params
+    )
 
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Keyset mode is opt-in per request; page-number clients are unchanged
+        self.keyset = None
+        if isinstance(queryset, QuerySet) and wants_cursor_pagination(request):
+            self.keyset = KeysetPagination(page_size=self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
         return Response(
             {
                 "links": {
@@ -0,0 +1,421 @@
+import gzip
+import logging
+import os
+import re
+from datetime import datetime, timezone as dt_timezone
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+EXPIRE_MODES = ("detach", "drop")
+
+Bounds = Tuple[Optional[datetime], datetime]
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant (UTC) of the month ``value`` falls in"""
+    if timezone.is_aware(value):
+        value = value.astimezone(dt_timezone.utc)
+    else:
+        value = value.replace(tzinfo=dt_timezone.utc)
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+class PartitionManager:
+    """
+    Monthly range partitions for an append-only table on PostgreSQL.
+
+    Partitions are named after the month they hold, ``<table>_pYYYYMM``.
+    ``convert()`` turns an existing table into a partitioned one and attaches
+    the old table, renamed ``<table>_before_YYYYMM``, as the partition for
+    everything before that month. From then on ``create_ahead()`` keeps the
+    coming months ready and ``expire()`` detaches or drops partitions past
+    the retention window, optionally exporting them to gzipped CSV first, so
+    retention no longer costs a DELETE over the whole table.
+
+    Configuration comes from ``settings.PARTITIONED_TABLES``. On other
+    databases, or before a table is converted, every operation is a no-op.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        column: str,
+        retention_months: Optional[int] = None,
+        expire: str = "drop",
+        using: str = "default",
+    ):
+        if expire not in EXPIRE_MODES:
+            raise ValueError(f"expire must be one of {EXPIRE_MODES}, not {expire!r}")
+        self.table = table
+        self.column = column
+        self.retention_months = retention_months
+        self.expire_mode = expire
+        self.using = using
+
+    @classmethod
+    def for_table(cls, table: str, using: str = "default") -> "PartitionManager":
+        try:
+            config = settings.PARTITIONED_TABLES[table]
+        except KeyError:
+            raise ValueError(f"{table} is not listed in PARTITIONED_TABLES") from None
+        return cls(table, using=using, **config)
+
+    @classmethod
+    def for_model(cls, model, using: str = "default") -> "PartitionManager":
+        return cls.for_table(model._meta.db_table, using=using)
+
+    @classmethod
+    def configured(cls, using: str = "default") -> List["PartitionManager"]:
+        return [
+            cls.for_table(table, using=using) for table in settings.PARTITIONED_TABLES
+        ]
+
+    @property
+    def connection(self):
+        return connections[self.using]
+
+    def _quote(self, name: str) -> str:
+        return self.connection.ops.quote_name(name)
+
+    @staticmethod
+    def _literal(value: datetime) -> str:
+        return f"'{value:%Y-%m-%d %H:%M:%S}+00'"
+
+    # ==========================================
+    # NAMING AND PLANNING
+    # ==========================================
+
+    def partition_name(self, month: datetime) -> str:
+        return f"{self.table}_p{month:%Y%m}"
+
+    def legacy_name(self, boundary: datetime) -> str:
+        return f"{self.table}_before_{boundary:%Y%m}"
+
+    def parse_bounds(self, name: str) -> Optional[Bounds]:
+        """
+        ``(lower, upper)`` of a partition from its name; ``lower`` is None for
+        the converted legacy partition. None for names this manager did not
+        create.
+        """
+        match = re.fullmatch(
+            rf"{re.escape(self.table)}_(p|before_)(\d{{4}})(\d{{2}})", name
+        )
+        if not match:
+            return None
+        month = datetime(int(match[2]), int(match[3]), 1, tzinfo=dt_timezone.utc)
+        if match[1] == "p":
+            return month, add_months(month, 1)
+        return None, month
+
+    def _bounds(self, names: List[str]) -> Dict[str, Bounds]:
+        bounds = {}
+        for name in names:
+            parsed = self.parse_bounds(name)
+            if parsed is not None:
+                bounds[name] = parsed
+        return bounds
+
+    def months_to_create(
+        self, existing: List[str], now: datetime, ahead: int
+    ) -> List[datetime]:
+        """Months from the current one to ``ahead`` later without a partition"""
+        bounds = self._bounds(existing).values()
+        first = month_start(now)
+        missing = []
+        for offset in range(ahead + 1):
+            month = add_months(first, offset)
+            covered = any(
+                (lower is None or lower <= month) and month < upper
+                for lower, upper in bounds
+            )
+            if not covered:
+                missing.append(month)
+        return missing
+
+    def partitions_before(self, existing: List[str], cutoff: datetime) -> List[str]:
+        """Partitions holding only rows older than ``cutoff``, oldest first"""
+        bounds = self._bounds(existing)
+        expired = [name for name, (_, upper) in bounds.items() if upper <= cutoff]
+        return sorted(expired, key=lambda name: bounds[name][1])
+
+    def retention_cutoff(self, now: datetime) -> Optional[datetime]:
+        """Start of the oldest month kept, or None when nothing expires"""
+        if self.retention_months is None:
+            return None
+        return add_months(month_start(now), -self.retention_months)
+
+    # ==========================================
+    # CATALOG
+    # ==========================================
+
+    @property
+    def supported(self) -> bool:
+        return self.connection.vendor == "postgresql"
+
+    def is_partitioned(self) -> bool:
+        if not self.supported:
+            return False
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)",
+                [self.table],
+            )
+            row = cursor.fetchone()
+        return row is not None and row[0] == "p"
+
+    def partitions(self) -> List[str]:
+        """Names of the partitions currently attached"""
+        if not self.supported:
+            return []
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = to_regclass(%s) ORDER BY c.relname",
+                [self.table],
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    # ==========================================
+    # MAINTENANCE
+    # ==========================================
+
+    def create_ahead(
+        self, now: Optional[datetime] = None, ahead: Optional[int] = None
+    ) -> List[str]:
+        """Create the current month's partition and ``ahead`` months after it"""
+        if not self.is_partitioned():
+            return []
+        now = now or timezone.now()
+        if ahead is None:
+            ahead = settings.PARTITION_PREMAKE_MONTHS
+
+        created = []
+        for month in self.months_to_create(self.partitions(), now, ahead):
+            name = self.partition_name(month)
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self._quote(name)} "
+                    f"PARTITION OF {self._quote(self.table)} FOR VALUES "
+                    f"FROM ({self._literal(month)}) "
+                    f"TO ({self._literal(add_months(month, 1))})"
+                )
+            created.append(name)
+            logger.info(f"Created partition {name}")
+        return created
+
+    def expire(
+        self, now: Optional[datetime] = None, archive_dir: Optional[str] = None
+    ) -> List[str]:
+        """Detach or drop the partitions past the retention window"""
+        cutoff = self.retention_cutoff(now or timezone.now())
+        if cutoff is None:
+            return []
+        return self.expire_before(cutoff, archive_dir=archive_dir)
+
+    def expire_before(
+        self, cutoff: datetime, archive_dir: Optional[str] = None
+    ) -> List[str]:
+        """
+        Detach or drop every partition holding only rows older than
+        ``cutoff``. Rows before ``cutoff`` in a partition that straddles it
+        are left for the caller to delete; partition pruning keeps that
+        DELETE to the one partition.
+        """
+        if not self.is_partitioned():
+            return []
+        archive_dir = archive_dir or settings.PARTITION_ARCHIVE_DIR
+
+        expired = self.partitions_before(self.partitions(), cutoff)
+        for name in expired:
+            if archive_dir:
+                self.export(name, archive_dir)
+            with transaction.atomic(using=self.using):
+                with self.connection.cursor() as cursor:
+                    if self.expire_mode == "drop":
+                        cursor.execute(f"DROP TABLE {self._quote(name)}")
+                    else:
+                        cursor.execute(
+                            f"ALTER TABLE {self._quote(self.table)} "
+                            f"DETACH PARTITION {self._quote(name)}"
+                        )
+            logger.info(f"Expired partition {name} ({self.expire_mode})")
+        return expired
+
+    def export(self, name: str, archive_dir: str) -> str:
+        """Write a partition to ``<archive_dir>/<name>.csv.gz``"""
+        os.makedirs(archive_dir, exist_ok=True)
+        path = os.path.join(archive_dir, f"{name}.csv.gz")
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as archive:
+            with self.connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY (SELECT * FROM {self._quote(name)}) "
+                    "TO STDOUT WITH (FORMAT csv, HEADER)",
+                    archive,
+                )
+        logger.info(f"Exported partition {name} to {path}")
+        return path
+
+    # ==========================================
+    # CONVERSION
+    # ==========================================
+
+    def convert(self, now: Optional[datetime] = None) -> str:
+        """
+        Turn the existing table into a partitioned one in a single
+        transaction holding an ACCESS EXCLUSIVE lock.
+
+        The table is renamed and attached as the partition for everything
+        before next month; a new partitioned table takes its name, columns,
+        defaults, checks, foreign keys and indexes. The primary key gains the
+        partition column, as PostgreSQL requires; unique constraints without
+        it cannot be kept and are logged. Returns the legacy partition name.
+        """
+        if not self.supported:
+            raise ValueError("Partitioning requires PostgreSQL")
+        if self.is_partitioned():
+            raise ValueError(f"{self.table} is already partitioned")
+
+        boundary = add_months(month_start(now or timezone.now()), 1)
+        table, legacy = self._quote(self.table), self._quote(self.legacy_name(boundary))
+        column = self._quote(self.column)
+
+        with transaction.atomic(using=self.using), self.connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE confrelid = to_regclass(%s) AND contype = 'f'",
+                [self.table],
+            )
+            referencing = [row[0] for row in cursor.fetchall()]
+            if referencing:
+                raise ValueError(
+                    f"{self.table} is referenced by foreign keys: "
+                    f"{', '.join(referencing)}"
+                )
+
+            # Constraints that carry over: primary key, unique and foreign keys
+            cursor.execute(
+                "SELECT c.conname, c.contype, pg_get_constraintdef(c.oid), "
+                "ARRAY(SELECT a.attname FROM unnest(c.conkey) k(attnum) "
+                "JOIN pg_attribute a ON a.attrelid = c.conrelid "
+                "AND a.attnum = k.attnum) "
+                "FROM pg_constraint c WHERE c.conrelid = to_regclass(%s) "
+                "AND c.contype IN ('p', 'u', 'f') ORDER BY c.contype",
+                [self.table],
+            )
+            constraints = cursor.fetchall()
+            # Indexes not backing a constraint
+            cursor.execute(
+                "SELECT i.relname, pg_get_indexdef(x.indexrelid), x.indisunique, "
+                "ARRAY(SELECT a.attname FROM pg_attribute a "
+                "WHERE a.attrelid = x.indrelid AND a.attnum = ANY(x.indkey)) "
+                "FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid "
+                "WHERE x.indrelid = to_regclass(%s) AND NOT EXISTS ("
+                "SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid "
+                "AND c.conrelid = x.indrelid)",
+                [self.table],
+            )
+            indexes = cursor.fetchall()
+            cursor.execute(
+                "SELECT attname FROM pg_attribute WHERE attrelid = to_regclass(%s) "
+                "AND attnum > 0 AND NOT attisdropped AND attidentity <> ''",
+                [self.table],
+            )
+            identity_columns = [row[0] for row in cursor.fetchall()]
+
+            # Free the table name and the schema-wide index names
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+            for name, kind, _, _ in constraints:
+                if kind == "p":
+                    cursor.execute(
+                        f"ALTER TABLE {legacy} DROP CONSTRAINT {self._quote(name)}"
+                    )
+                elif kind == "u":
+                    cursor.execute(
+                        f"ALTER TABLE {legacy} RENAME CONSTRAINT {self._quote(name)} "
+                        f"TO {self._quote(self._legacy_index_name(name))}"
+                    )
+            for name, *_ in indexes:
+                cursor.execute(
+                    f"ALTER INDEX {self._quote(name)} "
+                    f"RENAME TO {self._quote(self._legacy_index_name(name))}"
+                )
+
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS "
+                "INCLUDING IDENTITY INCLUDING CONSTRAINTS INCLUDING STORAGE "
+                f"INCLUDING COMMENTS) PARTITION BY RANGE ({column})"
+            )
+            for name in identity_columns:
+                # Continue the new identity after the rows already stored
+                cursor.execute(
+                    "SELECT setval(pg_get_serial_sequence(%s, %s), "
+                    f"COALESCE((SELECT max({self._quote(name)}) FROM {legacy}), 0) "
+                    "+ 1, false)",
+                    [self.table, name],
+                )
+                cursor.execute(
+                    f"ALTER TABLE {legacy} ALTER COLUMN {self._quote(name)} "
+                    "DROP IDENTITY"
+                )
+
+            for name, kind, definition, columns in constraints:
+                if kind == "p":
+                    keys = list(columns) + (
+                        [self.column] if self.column not in columns else []
+                    )
+                    definition = "PRIMARY KEY ({})".format(
+                        ", ".join(self._quote(key) for key in keys)
+                    )
+                elif kind == "u" and self.column not in columns:
+                    logger.warning(
+                        f"Dropping unique constraint {name} on {self.table}: "
+                        f"it does not include {self.column}"
+                    )
+                    continue
+                cursor.execute(
+                    f"ALTER TABLE {table} ADD CONSTRAINT {self._quote(name)} "
+                    f"{definition}"
+                )
+            for name, definition, unique, columns in indexes:
+                if unique and self.column not in columns:
+                    logger.warning(
+                        f"Dropping unique index {name} on {self.table}: "
+                        f"it does not include {self.column}"
+                    )
+                    continue
+                # Captured before the rename, so it targets the new table
+                cursor.execute(definition)
+
+            # Prove the bound up front so ATTACH does not scan again
+            bound_check = self._quote(f"{self.table}_bound_check")
+            cursor.execute(
+                f"ALTER TABLE {legacy} ADD CONSTRAINT {bound_check} "
+                f"CHECK ({column} IS NOT NULL AND {column} < "
+                f"{self._literal(boundary)})"
+            )
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+                f"FOR VALUES FROM (MINVALUE) TO ({self._literal(boundary)})"
+            )
+            cursor.execute(f"ALTER TABLE {legacy} DROP CONSTRAINT {bound_check}")
+
+        logger.info(f"Partitioned {self.table}; existing rows in {legacy}")
+        self.create_ahead(now=now)
+        return self.legacy_name(boundary)
+
+    @staticmethod
+    def _legacy_index_name(name: str) -> str:
+        # Identifiers are limited to 63 bytes
+        return f"{name[:56]}_legacy"
@@ -0,0 +1,8 @@
+from django.db.models.signals import ModelSignal
+
+# Sent once by SoftDeleteQuerySet.delete() for the whole batch, in place of
+# pre_delete/post_delete per instance. Receivers get the model as ``sender``
+# and ``ids`` (primary keys that were soft-deleted), ``deleted_at`` and
+# ``using``. Being a ModelSignal, receivers may name the sender lazily
+# ("app_label.Model").
+bulk_soft_deleted = ModelSignal(use_caching=True)
@@ -66,3 +66,23 @@ def test_task(self) -> None:
     # raise KeyError("This is a test error")
 
     print("Hello World from Celery")
+
+
+@shared_task(bind=True, base=BaseTaskWithRetry)
+def maintain_partitions(self, archive_dir=None):
+    """
+    Keep the monthly partitions of every table in PARTITIONED_TABLES ready
+    ahead of time and detach or drop the ones past retention. Tables that
+    are not partitioned (or a non-PostgreSQL database) are skipped.
+    """
+    from apps.core.partitioning import PartitionManager
+
+    results = {}
+    for manager in PartitionManager.configured():
+        if not manager.is_partitioned():
+            continue
+        results[manager.table] = {
+            "created": manager.create_ahead(),
+            "expired": manager.expire(archive_dir=archive_dir),
+        }
+    return results
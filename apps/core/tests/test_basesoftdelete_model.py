@@ -1,7 +1,9 @@
 import pytest
 from django.db import connection, models, transaction
+from django.db.models.signals import post_delete
 
 from apps.core.models import SoftDeleteBaseModel
+from apps.core.signals import bulk_soft_deleted
 
 
 class TestSoftDeleteModel(SoftDeleteBaseModel):
@@ -59,6 +61,29 @@ class TestSoftDeleteBaseModel:
         assert self.model.objects.filter(pk=instance1.pk).exists() is False
         assert self.model.objects.count() == 0
 
+    def test_queryset_soft_delete_sends_one_batched_signal(self) -> None:
+        instances = [self.model.objects.create(name=f"Test{i}") for i in range(3)]
+        instances[0].delete()
+        batches, per_instance = [], []
+
+        def on_bulk(sender, ids, **kwargs):
+            batches.append(sorted(ids))
+
+        def on_delete(sender, instance, **kwargs):
+            per_instance.append(instance.pk)
+
+        bulk_soft_deleted.connect(on_bulk, sender=self.model)
+        post_delete.connect(on_delete, sender=self.model)
+        try:
+            assert self.model.objects.all_with_deleted().delete() == 2
+        finally:
+            bulk_soft_deleted.disconnect(on_bulk, sender=self.model)
+            post_delete.disconnect(on_delete, sender=self.model)
+
+        assert batches == [sorted(instance.pk for instance in instances[1:])]
+        assert per_instance == []
+        assert self.model.objects.deleted().count() == 3
+
     def test_restore(self) -> None:
         instance = self.model.objects.create(name="Test")
         instance.delete()
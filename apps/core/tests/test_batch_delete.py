@@ -0,0 +1,37 @@
+import pytest
+from django.core.cache import cache
+
+from apps.core.utils.batch_delete import BatchDeleter
+from apps.products.models import SearchLog
+
+
+@pytest.mark.django_db
+class TestBatchDeleter:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.logs = sorted(
+            (SearchLog.objects.create(query=f"q{i}") for i in range(5)),
+            key=lambda log: log.pk,
+        )
+        SearchLog.objects.create(query="keep")
+        self.queryset = SearchLog.objects.exclude(query="keep")
+
+    def test_deletes_in_primary_key_chunks(self):
+        deleter = BatchDeleter(self.queryset, "test", batch_size=2, pause_seconds=0)
+        stats = deleter.run()
+
+        assert (stats["deleted"], stats["batches"], stats["complete"]) == (5, 3, True)
+        assert list(SearchLog.objects.values_list("query", flat=True)) == ["keep"]
+        assert cache.get(deleter.checkpoint_key) is None
+
+    def test_resumes_after_checkpoint(self):
+        deleter = BatchDeleter(self.queryset, "test", batch_size=2, pause_seconds=0)
+        cache.set(deleter.checkpoint_key, self.logs[1].pk)
+
+        assert deleter.run()["deleted"] == 3
+        assert set(self.queryset.values_list("pk", flat=True)) == {
+            self.logs[0].pk,
+            self.logs[1].pk,
+        }
+        # A finished run clears the checkpoint, so the next starts over
+        assert deleter.run()["deleted"] == 2
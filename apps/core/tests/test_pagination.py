@@ -0,0 +1,69 @@
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.categories.models import Category
+from apps.core.pagination import StandardResultsSetPagination
+
+factory = APIRequestFactory()
+
+
+def paginate(queryset, **params):
+    request = Request(factory.get("/categories/", params))
+    paginator = StandardResultsSetPagination()
+    page = paginator.paginate_queryset(queryset, request)
+    return page, paginator.get_paginated_response([obj.name for obj in page]).data
+
+
+def cursor_from(link):
+    return parse_qs(urlparse(link).query)["cursor"][0]
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.categories = [
+            Category.objects.create(
+                name=f"Category {i:02d}", slug=f"category-{i:02d}"
+            )
+            for i in range(7)
+        ]
+        self.queryset = Category.objects.order_by("-created_at")
+
+    def test_page_number_clients_unchanged(self):
+        _, data = paginate(self.queryset, page=2, page_size=3)
+        assert data["current_page"] == 2
+        assert data["count"] == 7
+
+    def test_walks_all_pages_forward_and_back(self):
+        seen = []
+        _, data = paginate(self.queryset, pagination="cursor", page_size=3)
+        seen.extend(data["results"])
+        assert data["count_is_approximate"] is True
+        assert data["count"] == 7
+        assert data["links"]["previous"] is None
+
+        while data["links"]["next"]:
+            previous_first = data["results"]
+            _, data = paginate(
+                self.queryset, cursor=cursor_from(data["links"]["next"]), page_size=3
+            )
+            seen.extend(data["results"])
+
+        newest_first = sorted(
+            self.categories, key=lambda category: category.created_at, reverse=True
+        )
+        assert seen == [category.name for category in newest_first]
+
+        _, back = paginate(
+            self.queryset, cursor=cursor_from(data["links"]["previous"]), page_size=3
+        )
+        assert back["results"] == previous_first
+
+    def test_rejects_nullable_sort_key(self):
+        with pytest.raises(ValidationError):
+            paginate(Category.objects.order_by("parent"), pagination="cursor")
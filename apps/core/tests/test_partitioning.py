@@ -0,0 +1,165 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.partitioning import PartitionManager, add_months, month_start
+from apps.products.models import SearchLog
+from apps.products.tasks.search import cleanup_search_logs
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class TestPartitionPlanning:
+    manager = PartitionManager("search_log", "created_at", retention_months=1)
+
+    def test_month_arithmetic(self):
+        assert month_start(utc(2026, 10, 18, 13, 5)) == utc(2026, 10, 1)
+        assert add_months(utc(2026, 11, 1), 3) == utc(2027, 2, 1)
+        assert add_months(utc(2026, 1, 1), -1) == utc(2025, 12, 1)
+
+    def test_creates_uncovered_months_only(self):
+        existing = ["search_log_before_202611", "search_log_p202612", "other_p202701"]
+        months = self.manager.months_to_create(existing, utc(2026, 10, 18), ahead=3)
+        assert [self.manager.partition_name(m) for m in months] == [
+            "search_log_p202611",
+            "search_log_p202701",
+        ]
+
+    def test_expires_partitions_past_retention(self):
+        existing = [
+            "search_log_p202609",
+            "search_log_before_202608",
+            "search_log_p202608",
+            "search_log_p202610",
+        ]
+        cutoff = self.manager.retention_cutoff(utc(2026, 10, 18))
+        assert cutoff == utc(2026, 9, 1)
+        assert self.manager.partitions_before(existing, cutoff) == [
+            "search_log_before_202608",
+            "search_log_p202608",
+        ]
+
+
+@pytest.mark.django_db
+def test_cleanup_falls_back_to_delete_without_partitions():
+    assert PartitionManager.for_model(SearchLog).expire_before(timezone.now()) == []
+    old = SearchLog.objects.create(query="old")
+    SearchLog.objects.filter(pk=old.pk).update(
+        created_at=timezone.now() - timedelta(days=40)
+    )
+    SearchLog.objects.create(query="recent")
+
+    assert cleanup_search_logs.delay(days_to_keep=30).get() == 1
+    assert list(SearchLog.objects.values_list("query", flat=True)) == ["recent"]
+
+
+def index_columns(table):
+    """Column lists of the non-primary-key indexes on ``table``"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT ARRAY(SELECT a.attname FROM unnest(x.indkey) k(attnum) "
+            "JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = k.attnum) "
+            "FROM pg_index x WHERE x.indrelid = to_regclass(%s) "
+            "AND NOT x.indisprimary",
+            [table],
+        )
+        return sorted(tuple(row[0]) for row in cursor.fetchall())
+
+
+def table_exists(name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+        return cursor.fetchone()[0]
+
+
+def partition_of(pk):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text FROM search_log WHERE id = %s",
+            [str(pk)],
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+class TestPartitionManagerOnPostgres:
+    manager = PartitionManager("search_log", "created_at", expire="drop")
+
+    @pytest.fixture(autouse=True)
+    def postgres_only(self):
+        if connection.vendor != "postgresql":
+            pytest.skip("Partitioning requires PostgreSQL")
+
+    def age(self, log, created_at):
+        SearchLog.objects.filter(pk=log.pk).update(created_at=created_at)
+
+    def test_convert_keeps_rows_and_indexes(self):
+        now = timezone.now()
+        this_month = month_start(now)
+        old = SearchLog.objects.create(query="old")
+        self.age(old, add_months(this_month, -5))
+        recent = SearchLog.objects.create(query="recent")
+        indexes = index_columns("search_log")
+
+        legacy = self.manager.convert(now=now)
+
+        assert legacy == self.manager.legacy_name(add_months(this_month, 1))
+        assert self.manager.is_partitioned()
+        assert set(SearchLog.objects.values_list("pk", flat=True)) == {
+            old.pk,
+            recent.pk,
+        }
+        assert partition_of(old.pk) == legacy
+        assert partition_of(recent.pk) == legacy
+        assert index_columns("search_log") == indexes
+        assert index_columns(legacy) == indexes
+
+        # New rows land in the monthly partitions
+        created = SearchLog.objects.create(query="new")
+        self.age(created, add_months(this_month, 1))
+        assert partition_of(created.pk) == self.manager.partition_name(
+            add_months(this_month, 1)
+        )
+
+    def test_create_ahead_adds_future_months(self):
+        now = timezone.now()
+        this_month = month_start(now)
+        legacy = self.manager.convert(now=now)
+        ahead = [add_months(this_month, offset) for offset in range(1, 6)]
+
+        created = self.manager.create_ahead(now=now, ahead=5)
+
+        assert created == [self.manager.partition_name(m) for m in ahead[3:]]
+        assert sorted(self.manager.partitions()) == sorted(
+            [legacy] + [self.manager.partition_name(m) for m in ahead]
+        )
+        assert self.manager.create_ahead(now=now, ahead=5) == []
+
+    def test_expire_detaches_or_drops_old_months(self):
+        past = add_months(month_start(timezone.now()), -3)
+        legacy_row = SearchLog.objects.create(query="legacy")
+        self.age(legacy_row, past)
+        legacy = self.manager.convert(now=past)
+        monthly_row = SearchLog.objects.create(query="monthly")
+        self.age(monthly_row, add_months(past, 1))
+        monthly = self.manager.partition_name(add_months(past, 1))
+        detacher = PartitionManager("search_log", "created_at", expire="detach")
+
+        assert detacher.expire_before(add_months(past, 1)) == [legacy]
+        assert table_exists(legacy)
+        assert legacy not in self.manager.partitions()
+        assert list(SearchLog.objects.values_list("query", flat=True)) == [
+            "monthly"
+        ]
+
+        assert self.manager.expire_before(add_months(past, 2)) == [monthly]
+        assert not table_exists(monthly)
+        assert not SearchLog.objects.exists()
+        assert sorted(self.manager.partitions()) == [
+            self.manager.partition_name(add_months(past, offset))
+            for offset in range(2, 4)
+        ]
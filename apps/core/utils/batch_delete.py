@@ -0,0 +1,156 @@
+import logging
+import time
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connections, transaction
+
+from .cache_key_manager import CacheKeyManager
+
+logger = logging.getLogger("monitoring")
+
+DEFAULTS = {
+    "BATCH_SIZE": 1000,
+    "MIN_BATCH_SIZE": 50,
+    "CHUNK_SECONDS": 0.5,
+    "PAUSE_SECONDS": 0.1,
+    "MAX_SECONDS": 240,
+    "CHECKPOINT_TTL": 60 * 60 * 24 * 7,
+}
+
+# Chunks at the minimum size that may time out on locks before a run stops
+MAX_LOCK_TIMEOUTS = 3
+
+
+def _setting(name: str):
+    return getattr(settings, "BATCH_DELETE_SETTINGS", {}).get(name, DEFAULTS[name])
+
+
+class BatchDeleter:
+    """
+    Deletes the rows of a queryset in primary-key order, one chunk per
+    transaction, so locks are held and WAL is written for one chunk at a time.
+
+    The chunk size adapts to ``chunk_seconds``: it halves after a slow chunk
+    and doubles (up to ``batch_size``) after a fast one. On PostgreSQL the
+    same budget is the chunk's ``lock_timeout``, so a chunk blocked by other
+    writers gives up and is retried smaller instead of queueing. The runner
+    sleeps ``pause_seconds`` between chunks and stops after ``max_seconds``,
+    keeping the last deleted primary key in the cache; the next run under
+    the same ``name`` resumes after it, and a run that finishes clears it.
+
+    Deletes go through ``QuerySet.delete()``, so cascades, signals and
+    soft-delete querysets behave as they would for a single delete.
+
+    Usage:
+        BatchDeleter(SearchLog.objects.filter(created_at__lt=cutoff),
+                     "cleanup_search_logs").run()
+        # → {"deleted": 12000, "batches": 12, "rows_per_second": 8400.0, ...}
+    """
+
+    def __init__(
+        self,
+        queryset,
+        name: str,
+        batch_size: Optional[int] = None,
+        chunk_seconds: Optional[float] = None,
+        pause_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+    ):
+        self.queryset = queryset
+        self.name = name
+        self.batch_size = batch_size or _setting("BATCH_SIZE")
+        self.min_batch_size = min(_setting("MIN_BATCH_SIZE"), self.batch_size)
+        self.chunk_seconds = chunk_seconds or _setting("CHUNK_SECONDS")
+        self.pause_seconds = (
+            _setting("PAUSE_SECONDS") if pause_seconds is None else pause_seconds
+        )
+        self.max_seconds = max_seconds or _setting("MAX_SECONDS")
+        self.checkpoint_key = CacheKeyManager.make_key(
+            "batch_delete", "checkpoint", name=name
+        )
+
+    def _set_lock_timeout(self):
+        connection = connections[self.queryset.db]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SET LOCAL lock_timeout = '{int(self.chunk_seconds * 1000)}ms'"
+                )
+
+    def _delete_chunk(self, ids) -> int:
+        with transaction.atomic(using=self.queryset.db):
+            self._set_lock_timeout()
+            # Re-apply the filter: a row may have changed since it was listed
+            return self.queryset.filter(pk__in=ids).delete()[0]
+
+    def run(self) -> Dict:
+        last_pk = cache.get(self.checkpoint_key)
+        if last_pk is not None:
+            logger.info(f"[BatchDeleter] {self.name}: resuming after {last_pk}")
+
+        batch_size = self.batch_size
+        deleted = batches = lock_timeouts = 0
+        complete = False
+        started = time.monotonic()
+        while time.monotonic() - started < self.max_seconds:
+            pending = self.queryset
+            if last_pk is not None:
+                pending = pending.filter(pk__gt=last_pk)
+            ids = list(pending.order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                complete = True
+                break
+            if batches or lock_timeouts:
+                time.sleep(self.pause_seconds)
+
+            chunk_started = time.monotonic()
+            try:
+                count = self._delete_chunk(ids)
+            except OperationalError as e:
+                # Most likely lock_timeout; retry the same range smaller
+                if batch_size == self.min_batch_size:
+                    lock_timeouts += 1
+                    if lock_timeouts >= MAX_LOCK_TIMEOUTS:
+                        logger.warning(
+                            f"[BatchDeleter] {self.name}: stopping after "
+                            f"{lock_timeouts} failed chunks: {e}"
+                        )
+                        break
+                batch_size = max(self.min_batch_size, batch_size // 2)
+                continue
+            elapsed = time.monotonic() - chunk_started
+
+            deleted += count
+            batches += 1
+            last_pk = ids[-1]
+            cache.set(self.checkpoint_key, last_pk, _setting("CHECKPOINT_TTL"))
+            logger.debug(
+                f"[BatchDeleter] {self.name}: chunk of {len(ids)} in "
+                f"{elapsed * 1000:.0f}ms ({count / max(elapsed, 1e-6):.0f} rows/s)"
+            )
+
+            if elapsed > self.chunk_seconds:
+                batch_size = max(self.min_batch_size, batch_size // 2)
+            elif elapsed < self.chunk_seconds / 2:
+                batch_size = min(self.batch_size, batch_size * 2)
+
+        if complete:
+            cache.delete(self.checkpoint_key)
+
+        seconds = time.monotonic() - started
+        stats = {
+            "name": self.name,
+            "deleted": deleted,
+            "batches": batches,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(deleted / seconds, 1) if seconds else 0.0,
+            "complete": complete,
+        }
+        logger.info(
+            f"[BatchDeleter] {self.name}: deleted {deleted} rows in {batches} "
+            f"chunks, {stats['seconds']}s ({stats['rows_per_second']} rows/s)"
+            + ("" if complete else ", checkpointed")
+        )
+        return stats
@@ -83,24 +83,34 @@ class BreadcrumbService:
     @staticmethod
     def _get_category_breadcrumbs(category, start_order=0):
         """Get breadcrumbs for category hierarchy"""
-        path = BreadcrumbService._get_category_path(category)
-        breadcrumbs = []
-
-        for i, cat in enumerate(path):
-            breadcrumbs.append(
-                BreadcrumbService._create_breadcrumb(
-                    id=str(cat.id),
-                    name=cat.name,
-                    href=f"/explore?category={cat.slug}",
-                    order=start_order + i,
-                )
+        from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
+
+        # Precomputed (id, name, slug) chain; falls back to the model for
+        # categories created since the index was last built
+        chain = CategoryBreadcrumbIndex.get_chain(category.id)
+        if chain is None:
+            chain = [
+                (str(cat.id), cat.name, cat.slug)
+                for cat in BreadcrumbService._get_category_path(category)
+            ]
+
+        return [
+            BreadcrumbService._create_breadcrumb(
+                id=cat_id,
+                name=name,
+                href=f"/explore?category={slug}",
+                order=start_order + i,
             )
-
-        return breadcrumbs
+            for i, (cat_id, name, slug) in enumerate(chain)
+        ]
 
     @staticmethod
     def _get_category_path(category):
         """Get full category path including ancestors"""
+        if getattr(category, "path", ""):
+            # Ancestors come from the materialized path in a single query
+            return category.get_ancestors() + [category]
+
         ancestors = []
         current = getattr(category, "parent", None)
         while current:
@@ -358,7 +368,7 @@ class BreadcrumbService:
             return []
 
         # Get product breadcrumbs first
-        product_breadcrumbs = BreadcrumbService.generate_product_breadcrumbs(
+        product_breadcrumbs = BreadcrumbService.for_product(
             rating.product, include_home
         )
 
@@ -395,7 +405,7 @@ class BreadcrumbService:
             return []
 
         # Get product breadcrumbs first
-        product_breadcrumbs = BreadcrumbService.generate_product_breadcrumbs(
+        product_breadcrumbs = BreadcrumbService.for_product(
             negotiation.product, include_home
         )
 
@@ -1,5 +1,6 @@
 from celery import shared_task
 from django.utils import timezone
+from apps.core.utils.batch_delete import BatchDeleter
 from .models import Dispute, DisputeStatus
 import logging
 
@@ -50,8 +51,7 @@ def cleanup_old_disputes():
         updated_at__lt=cutoff_date,
     )
 
-    count = old_disputes.count()
-    old_disputes.delete()
+    count = BatchDeleter(old_disputes, "cleanup_old_disputes").run()["deleted"]
 
     logger.info(f"Cleaned up {count} old disputes")
 
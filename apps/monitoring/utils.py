@@ -56,3 +56,42 @@ def check_cache_hit_ratio():
     else:
         monitoring_logger.info(f"[Cache] Hit ratio: {ratio:.1f}%")
     return ratio
+
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is +Inf
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+LATENCY_HISTOGRAM_TTL = 60 * 60 * 24 * 7  # 7 days
+
+
+def record_latency(name, endpoint, duration_ms, success=True):
+    """
+    Add one observation to the Redis-backed latency histogram for
+    "{name}:{endpoint}" (cumulative "le_*" buckets plus count/sum/errors, in
+    the same shape Prometheus uses). Metrics must never break the caller, so
+    Redis failures are only logged.
+    """
+    key = f"monitoring:latency:{name}:{endpoint}"
+    try:
+        redis_conn = get_redis_connection("default")
+        pipe = redis_conn.pipeline(transaction=False)
+        for bound in LATENCY_BUCKETS_MS:
+            if duration_ms <= bound:
+                pipe.hincrby(key, f"le_{bound}", 1)
+        pipe.hincrby(key, "le_inf", 1)
+        pipe.hincrby(key, "count", 1)
+        pipe.hincrbyfloat(key, "sum_ms", round(duration_ms, 3))
+        if not success:
+            pipe.hincrby(key, "errors", 1)
+        pipe.expire(key, LATENCY_HISTOGRAM_TTL)
+        pipe.execute()
+    except Exception as e:
+        monitoring_logger.warning(f"[Latency] Failed to record {key}: {e}")
+
+
+def get_latency_histogram(name, endpoint):
+    """Return the recorded histogram for "{name}:{endpoint}" as a dict"""
+    redis_conn = get_redis_connection("default")
+    raw = redis_conn.hgetall(f"monitoring:latency:{name}:{endpoint}")
+    return {
+        (k.decode() if isinstance(k, bytes) else k): float(v) for k, v in raw.items()
+    }
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+TEMPLATES = {
+    "product_price_drop": (
+        "Price drop on a watched product",
+        "{product_title} dropped from {old_price} to {new_price}",
+    ),
+    "product_back_in_stock": (
+        "A watched product is available",
+        "{product_title} is available again",
+    ),
+}
+
+
+def create_watchlist_alert_templates(apps, schema_editor):
+    NotificationTemplate = apps.get_model('notifications', 'NotificationTemplate')
+    for name, (subject, body) in TEMPLATES.items():
+        NotificationTemplate.objects.get_or_create(
+            name=name, defaults={'subject': subject, 'body': body}
+        )
+
+
+def remove_watchlist_alert_templates(apps, schema_editor):
+    NotificationTemplate = apps.get_model('notifications', 'NotificationTemplate')
+    NotificationTemplate.objects.filter(name__in=TEMPLATES).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_add_chat_notification_template'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_watchlist_alert_templates, remove_watchlist_alert_templates
+        ),
+    ]
@@ -1,7 +1,11 @@
-from typing import Dict, Any
+import logging
+from typing import Any, Dict, Iterable, Tuple
+
 from apps.notifications.models import Notification, NotificationTemplate
 from apps.users.models import CustomUser as User
 
+logger = logging.getLogger(__name__)
+
 
 class NotificationService:
     """
@@ -41,6 +45,57 @@ class NotificationService:
             # You might want to log this error
             pass
 
+    @staticmethod
+    def bulk_notify(
+        recipient_ids: Iterable, notification_type: str, context: Dict[str, Any]
+    ) -> int:
+        """
+        Insert the same in-app notification for many recipients at once.
+
+        The template is read and rendered once and the rows are written with
+        a single bulk insert; no per-recipient delivery task is queued.
+        Returns the number of notifications created.
+
+        Args:
+            recipient_ids: IDs of the users who should receive the notification.
+            notification_type: The type of notification (maps to a NotificationTemplate).
+            context: A dictionary of context data for the notification message.
+        """
+        return NotificationService.bulk_notify_each(
+            notification_type,
+            [(recipient_id, context) for recipient_id in recipient_ids],
+        )
+
+    @staticmethod
+    def bulk_notify_each(
+        notification_type: str, entries: Iterable[Tuple[Any, Dict[str, Any]]]
+    ) -> int:
+        """
+        Like ``bulk_notify`` but with a context per recipient.
+
+        Args:
+            notification_type: The type of notification (maps to a NotificationTemplate).
+            entries: (recipient_id, context) pairs.
+        """
+        try:
+            template = NotificationTemplate.objects.get(name=notification_type)
+        except NotificationTemplate.DoesNotExist:
+            logger.warning(f"No notification template named {notification_type}")
+            return 0
+
+        created = Notification.objects.bulk_create(
+            [
+                Notification(
+                    recipient_id=recipient_id,
+                    message=template.body.format(**context),
+                    notification_type=notification_type,
+                    data=context,
+                )
+                for recipient_id, context in entries
+            ]
+        )
+        return len(created)
+
     @staticmethod
     def delete_notification(
         recipient: "User", notification_type: str, context_filter: Dict[str, Any]
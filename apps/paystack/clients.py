@@ -1,9 +1,59 @@
 import logging
+import os
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from django.conf import settings
+from django.core.cache import cache
 from decimal import Decimal
 
+from apps.core.utils.cache_manager import CacheKeyManager
+from apps.monitoring.utils import record_latency
+
 logger = logging.getLogger(__name__)
+performance_logger = logging.getLogger("paystack_performance")
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_paystack_session() -> requests.Session:
+    """
+    Return the process-wide keep-alive session used for Paystack calls.
+
+    The session is created lazily and re-created after a fork (e.g. Celery
+    prefork workers) so child processes never share pooled sockets.
+    Idempotent GETs are retried with bounded exponential backoff on
+    connection errors, 429 and 5xx; POSTs are never retried.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            retry = Retry(
+                total=getattr(settings, "PAYSTACK_GET_MAX_RETRIES", 3),
+                backoff_factor=getattr(settings, "PAYSTACK_RETRY_BACKOFF", 0.3),
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset({"GET"}),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            )
+            pool_size = getattr(settings, "PAYSTACK_POOL_MAXSIZE", 20)
+            adapter = HTTPAdapter(
+                pool_connections=1, pool_maxsize=pool_size, max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session, _session_pid = session, pid
+    return _session
 
 
 class PaystackClient:
@@ -17,31 +67,44 @@ class PaystackClient:
     def __init__(self):
         self.secret_key = getattr(settings, "PAYSTACK_SECRET_KEY", "")
         self.is_mock = self.secret_key.startswith("sk_test_mock")
+        self.base_url = getattr(settings, "PAYSTACK_BASE_URL", self.BASE_URL)
+        self.timeout = (
+            getattr(settings, "PAYSTACK_CONNECT_TIMEOUT", 3.05),
+            getattr(settings, "PAYSTACK_READ_TIMEOUT", 10),
+        )
 
         self.headers = {
             "Authorization": f"Bearer {self.secret_key}",
             "Content-Type": "application/json",
         }
 
-    def _post(self, path: str, data: dict) -> dict:
-        url = f"{self.BASE_URL}{path}"
+    def _request(self, method: str, path: str, endpoint: str, **kwargs) -> dict:
+        url = f"{self.base_url}{path}"
+        start = time.monotonic()
+        success = False
         try:
-            response = requests.post(url, json=data, headers=self.headers, timeout=10)
+            response = get_paystack_session().request(
+                method, url, headers=self.headers, timeout=self.timeout, **kwargs
+            )
             response.raise_for_status()
+            success = True
             return response.json()
         except requests.exceptions.RequestException as e:
-            logger.error(f"Paystack POST request to {path} failed: {str(e)}")
+            logger.error(f"Paystack {method} request to {path} failed: {str(e)}")
             raise
+        finally:
+            duration_ms = (time.monotonic() - start) * 1000
+            record_latency("paystack", endpoint, duration_ms, success=success)
+            performance_logger.info(
+                f"Paystack {method} {endpoint} took {duration_ms:.1f}ms "
+                f"({'ok' if success else 'error'})"
+            )
 
-    def _get(self, path: str, params: dict = None) -> dict:
-        url = f"{self.BASE_URL}{path}"
-        try:
-            response = requests.get(url, params=params, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Paystack GET request to {path} failed: {str(e)}")
-            raise
+    def _post(self, path: str, data: dict, endpoint: str = None) -> dict:
+        return self._request("POST", path, endpoint or path, json=data)
+
+    def _get(self, path: str, params: dict = None, endpoint: str = None) -> dict:
+        return self._request("GET", path, endpoint or path, params=params)
 
     def initialize_transaction(self, email: str, amount_ngn: Decimal, reference: str, callback_url: str) -> dict:
         """
@@ -88,7 +151,9 @@ class PaystackClient:
                 }
             }
 
-        return self._get(f"/transaction/verify/{reference}")
+        return self._get(
+            f"/transaction/verify/{reference}", endpoint="/transaction/verify"
+        )
 
     def resolve_account(self, account_number: str, bank_code: str) -> dict:
         """
@@ -105,8 +170,56 @@ class PaystackClient:
                 }
             }
 
+        cache_key = CacheKeyManager.make_key(
+            "paystack",
+            "resolve_account",
+            bank_code=bank_code,
+            account_number=account_number,
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         params = {"account_number": account_number, "bank_code": bank_code}
-        return self._get("/bank/resolve", params=params)
+        result = self._get("/bank/resolve", params=params)
+        # Only successful resolutions are stable enough to cache
+        if result.get("status"):
+            cache.set(
+                cache_key,
+                result,
+                getattr(settings, "PAYSTACK_RESOLVE_CACHE_TTL", 60 * 60 * 24),
+            )
+        return result
+
+    def list_banks(self, country: str = "nigeria") -> dict:
+        """
+        List banks supported for transfers in a country (cached).
+        """
+        if self.is_mock:
+            logger.info(f"[Mock Paystack] Listing banks for {country}")
+            return {
+                "status": True,
+                "message": "Banks retrieved",
+                "data": [
+                    {"name": "Access Bank", "code": "044", "country": country},
+                    {"name": "Guaranty Trust Bank", "code": "058", "country": country},
+                    {"name": "Zenith Bank", "code": "057", "country": country},
+                ],
+            }
+
+        cache_key = CacheKeyManager.make_key("paystack", "banks", country=country)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._get("/bank", params={"country": country})
+        if result.get("status"):
+            cache.set(
+                cache_key,
+                result,
+                getattr(settings, "PAYSTACK_BANKS_CACHE_TTL", 60 * 60 * 12),
+            )
+        return result
 
     def create_subaccount(self, business_name: str, settlement_bank: str, account_number: str, percentage_charge: float) -> dict:
         """
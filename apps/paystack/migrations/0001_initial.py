@@ -0,0 +1,38 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:39
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaystackWebhookEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_key', models.CharField(help_text='Dedupe key built from the event type and Paystack id/reference', max_length=150, unique=True)),
+                ('event_type', models.CharField(max_length=50)),
+                ('reference', models.CharField(blank=True, db_index=True, max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('processed', 'Processed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Paystack Webhook Event',
+                'verbose_name_plural': 'Paystack Webhook Events',
+                'db_table': 'paystack_webhook_events',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='paystack_we_status_6e030f_idx')],
+            },
+        ),
+    ]
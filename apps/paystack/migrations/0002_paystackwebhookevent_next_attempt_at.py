@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-19 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('paystack', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paystackwebhookevent',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, help_text='A failed event is not claimed again before this time', null=True),
+        ),
+    ]
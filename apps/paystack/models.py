@@ -0,0 +1,63 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from apps.core.models import BaseModel
+
+
+class PaystackWebhookEvent(BaseModel):
+    """
+    Inbox row for a verified Paystack webhook delivery.
+
+    The webhook view only inserts and acknowledges; events are processed
+    asynchronously by ``process_paystack_webhook_events``. The unique
+    ``event_key`` makes Paystack's retried deliveries no-ops.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_PROCESSING = "processing"
+    STATUS_PROCESSED = "processed"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, _("Pending")),
+        (STATUS_PROCESSING, _("Processing")),
+        (STATUS_PROCESSED, _("Processed")),
+        (STATUS_FAILED, _("Failed")),
+    ]
+
+    event_key = models.CharField(
+        max_length=150,
+        unique=True,
+        help_text=_("Dedupe key built from the event type and Paystack id/reference"),
+    )
+    event_type = models.CharField(max_length=50)
+    reference = models.CharField(max_length=100, blank=True, db_index=True)
+    payload = models.JSONField(default=dict)
+
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text=_("A failed event is not claimed again before this time"),
+    )
+    last_error = models.TextField(blank=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = "paystack_webhook_events"
+        verbose_name = _("Paystack Webhook Event")
+        verbose_name_plural = _("Paystack Webhook Events")
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.reference} ({self.status})"
+
+    @staticmethod
+    def build_event_key(event_type: str, data: dict) -> str:
+        identifier = data.get("id") or data.get("reference") or ""
+        return f"{event_type}:{identifier}"
@@ -0,0 +1,190 @@
+import logging
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.paystack.models import PaystackWebhookEvent
+from apps.transactions.models import EscrowTransaction, SellerBalanceLedger
+from apps.transactions.services.escrow_services import EscrowTransactionService
+from apps.transactions.services.ledger_service import SellerBalanceService
+
+logger = logging.getLogger(__name__)
+
+
+class PaystackWebhookService:
+    """
+    Records Paystack webhook deliveries in the inbox table and processes
+    them in batches outside the request cycle.
+    """
+
+    BATCH_SIZE = 100
+    MAX_ATTEMPTS = 5
+    # A failed event waits RETRY_BACKOFF, then twice as long after each
+    # further failure, before it can be claimed again.
+    RETRY_BACKOFF = timedelta(minutes=1)
+    # Events left in "processing" longer than this are assumed orphaned
+    # by a crashed worker and become claimable again.
+    STALE_PROCESSING_AFTER = timedelta(minutes=10)
+
+    @classmethod
+    def record_event(cls, event_data: dict):
+        """
+        Insert a webhook event into the inbox.
+        Returns (event, created); created is False for duplicate deliveries.
+        """
+        event_type = event_data.get("event", "")
+        data = event_data.get("data") or {}
+        return PaystackWebhookEvent.objects.get_or_create(
+            event_key=PaystackWebhookEvent.build_event_key(event_type, data),
+            defaults={
+                "event_type": event_type,
+                "reference": data.get("reference") or "",
+                "payload": event_data,
+            },
+        )
+
+    @classmethod
+    def claim_batch(cls, batch_size=None):
+        """Atomically move a batch of pending events to "processing"."""
+        batch_size = batch_size or cls.BATCH_SIZE
+        now = timezone.now()
+        stale_before = now - cls.STALE_PROCESSING_AFTER
+
+        with transaction.atomic():
+            ids = list(
+                PaystackWebhookEvent.objects.select_for_update(skip_locked=True)
+                .filter(
+                    Q(
+                        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now),
+                        status=PaystackWebhookEvent.STATUS_PENDING,
+                    )
+                    | Q(
+                        status=PaystackWebhookEvent.STATUS_PROCESSING,
+                        updated_at__lt=stale_before,
+                    )
+                )
+                .order_by("created_at")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            PaystackWebhookEvent.objects.filter(id__in=ids).update(
+                status=PaystackWebhookEvent.STATUS_PROCESSING,
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+        return ids
+
+    @classmethod
+    def process_pending(cls, batch_size=None) -> dict:
+        """Process one batch of inbox events, returning outcome counts."""
+        ids = cls.claim_batch(batch_size)
+        results = {"processed": 0, "retrying": 0, "failed": 0}
+
+        for event in PaystackWebhookEvent.objects.filter(id__in=ids).order_by(
+            "created_at"
+        ):
+            try:
+                with transaction.atomic():
+                    cls.dispatch(event)
+                event.status = PaystackWebhookEvent.STATUS_PROCESSED
+                event.processed_at = timezone.now()
+                event.last_error = ""
+                results["processed"] += 1
+            except Exception as e:
+                logger.error(
+                    f"Error processing Paystack webhook event {event.event_key}: {str(e)}"
+                )
+                event.last_error = str(e)
+                if event.attempts >= cls.MAX_ATTEMPTS:
+                    event.status = PaystackWebhookEvent.STATUS_FAILED
+                    results["failed"] += 1
+                else:
+                    event.status = PaystackWebhookEvent.STATUS_PENDING
+                    event.next_attempt_at = timezone.now() + cls.RETRY_BACKOFF * (
+                        2 ** (event.attempts - 1)
+                    )
+                    results["retrying"] += 1
+            event.save(
+                update_fields=[
+                    "status",
+                    "processed_at",
+                    "next_attempt_at",
+                    "last_error",
+                    "updated_at",
+                ]
+            )
+
+        return results
+
+    @classmethod
+    def dispatch(cls, event: PaystackWebhookEvent):
+        data = event.payload.get("data") or {}
+        logger.info(f"Processing Paystack Webhook event: {event.event_type}")
+
+        if event.event_type == "charge.success":
+            cls._handle_charge_success(event.reference)
+        elif event.event_type == "transfer.success":
+            cls._handle_transfer_success(event.reference, data)
+        elif event.event_type == "transfer.failed":
+            cls._handle_transfer_failed(event.reference, data)
+
+    @staticmethod
+    def _handle_charge_success(reference: str):
+        """
+        Processes successful escrow payments.
+        Updates transaction status and locks the funds.
+        """
+        try:
+            escrow_transaction = EscrowTransaction.objects.get(tracking_id=reference)
+            if escrow_transaction.status == EscrowTransaction.STATUS_INITIATED:
+                # Transition status using system actor (user=None)
+                EscrowTransactionService._update_escrow_transaction_status(
+                    escrow_transaction=escrow_transaction,
+                    new_status=EscrowTransaction.STATUS_PAYMENT_RECEIVED,
+                    user=None,
+                    notes="Payment confirmed successfully via Paystack webhook.",
+                )
+                logger.info(f"Escrow transaction {escrow_transaction.id} transitioned to payment_received")
+        except EscrowTransaction.DoesNotExist:
+            logger.error(f"EscrowTransaction not found for payment reference: {reference}")
+
+    @staticmethod
+    def _handle_transfer_success(reference: str, data: dict):
+        """
+        Processes successful payout transfers to sellers.
+        """
+        logger.info(f"Payout transfer successful for reference: {reference}")
+        # Custom logging or settlement recording logic can be added here.
+
+    @staticmethod
+    def _handle_transfer_failed(reference: str, data: dict):
+        """
+        Processes failed payout transfers. Reverts the debit in the ledger.
+        """
+        logger.error(f"Payout transfer failed for reference: {reference}")
+        # In a failure scenario, we record a credit entry to correct the balance.
+        # Find the original ledger debit via its indexed reference column
+        debits = SellerBalanceLedger.objects.select_related("seller").filter(
+            entry_type=SellerBalanceLedger.ENTRY_PAYOUT_DEBIT
+        )
+        try:
+            try:
+                original_debit = debits.get(reference=reference)
+            except SellerBalanceLedger.DoesNotExist:
+                # Debits recorded before the reference column only carry the
+                # reference in their free-text description
+                original_debit = debits.get(
+                    reference="", description__contains=reference
+                )
+            SellerBalanceService.record_entry(
+                seller=original_debit.seller,
+                amount=abs(original_debit.amount),
+                entry_type=SellerBalanceLedger.ENTRY_ADJUSTMENT,
+                transaction_obj=original_debit.transaction,
+                description=f"Reversal of failed payout transfer reference {reference}",
+                reference=reference,
+            )
+            logger.info(f"Reverted failed payout debit for seller {original_debit.seller.id}")
+        except SellerBalanceLedger.DoesNotExist:
+            logger.error(f"Original payout debit ledger entry not found for failed transfer reference: {reference}")
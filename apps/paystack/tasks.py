@@ -0,0 +1,32 @@
+import logging
+
+from celery import shared_task
+
+from apps.paystack.services import PaystackWebhookService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def process_paystack_webhook_events(batch_size=None):
+    """
+    Drain the Paystack webhook inbox in batches.
+
+    Triggered by the webhook view after each new event and periodically by
+    Celery Beat as a safety net for retries and missed triggers.
+    """
+    totals = {"processed": 0, "retrying": 0, "failed": 0}
+    batch_size = batch_size or PaystackWebhookService.BATCH_SIZE
+
+    while True:
+        results = PaystackWebhookService.process_pending(batch_size)
+        for key, count in results.items():
+            totals[key] += count
+        # Stop once a batch comes back short. Failed events are not claimable
+        # until their next_attempt_at, so this loop cannot spin on them
+        if sum(results.values()) < batch_size:
+            break
+
+    if any(totals.values()):
+        logger.info(f"Processed Paystack webhook inbox: {totals}")
+    return totals
@@ -1,15 +1,26 @@
 import json
+import threading
 from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
 import pytest
+import requests
 from unittest.mock import patch
 from django.urls import reverse
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from apps.categories.models import Category
 from apps.products.models import Product, ProductCondition
-from apps.transactions.models import EscrowTransaction, FundHold
+from apps.core.utils.cache_manager import CacheManager
+from apps.paystack.clients import PaystackClient
+from apps.paystack.models import PaystackWebhookEvent
+from apps.paystack.services import PaystackWebhookService
+from apps.paystack.tasks import process_paystack_webhook_events
+from apps.transactions.models import EscrowTransaction, FundHold, SellerBalanceLedger
+from apps.transactions.services.ledger_service import SellerBalanceService
 from apps.users.models import SellerPaymentProfile
 
 User = get_user_model()
@@ -88,7 +99,7 @@ class TestPaystackEndpoints:
         assert profile.bank_name == "Access Bank"
         assert profile.paystack_recipient_code.startswith("RCP_mock_rec_")
 
-    def test_webhook_charge_success(self):
+    def test_webhook_charge_success(self, django_capture_on_commit_callbacks):
         url = reverse("paystack:webhook")
         payload = {
             "event": "charge.success",
@@ -100,12 +111,13 @@ class TestPaystackEndpoints:
         }
         
         # Webhook views are csrf_exempt. We call it without authentication.
-        response = self.client.post(
-            url,
-            data=json.dumps(payload),
-            content_type="application/json",
-            HTTP_X_PAYSTACK_SIGNATURE="mock-sig"
-        )
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(
+                url,
+                data=json.dumps(payload),
+                content_type="application/json",
+                HTTP_X_PAYSTACK_SIGNATURE="mock-sig"
+            )
         
         assert response.status_code == status.HTTP_200_OK
         
@@ -115,3 +127,184 @@ class TestPaystackEndpoints:
         
         # Verify escrow hold was placed
         assert FundHold.objects.filter(transaction=self.transaction, status=FundHold.STATUS_ACTIVE).exists()
+
+    def test_webhook_duplicate_delivery_is_processed_once(
+        self, django_capture_on_commit_callbacks
+    ):
+        url = reverse("paystack:webhook")
+        payload = {
+            "event": "charge.success",
+            "data": {"id": 4242, "reference": "MOCK-REF-999", "status": "success"},
+        }
+
+        for _ in range(2):
+            with django_capture_on_commit_callbacks(execute=True):
+                response = self.client.post(
+                    url,
+                    data=json.dumps(payload),
+                    content_type="application/json",
+                    HTTP_X_PAYSTACK_SIGNATURE="mock-sig"
+                )
+            assert response.status_code == status.HTTP_200_OK
+
+        event = PaystackWebhookEvent.objects.get()
+        assert event.event_key == "charge.success:4242"
+        assert event.status == PaystackWebhookEvent.STATUS_PROCESSED
+        assert event.attempts == 1
+        assert FundHold.objects.filter(transaction=self.transaction).count() == 1
+
+    def test_webhook_transfer_failed_reverses_payout_by_reference(
+        self, django_capture_on_commit_callbacks
+    ):
+        SellerBalanceService.record_entry(
+            seller=self.seller,
+            amount=Decimal("-150.00"),
+            entry_type=SellerBalanceLedger.ENTRY_PAYOUT_DEBIT,
+            description="Payout for PAYOUT-REF-1",
+            reference="PAYOUT-REF-1",
+        )
+        payload = {
+            "event": "transfer.failed",
+            "data": {"id": 77, "reference": "PAYOUT-REF-1"},
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(
+                reverse("paystack:webhook"),
+                data=json.dumps(payload),
+                content_type="application/json",
+                HTTP_X_PAYSTACK_SIGNATURE="mock-sig"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        reversal = SellerBalanceLedger.objects.get(
+            entry_type=SellerBalanceLedger.ENTRY_ADJUSTMENT, reference="PAYOUT-REF-1"
+        )
+        assert reversal.amount == Decimal("150.00")
+        assert SellerBalanceService.get_running_balance(self.seller.id) == Decimal("0.00")
+
+    def test_webhook_transfer_failed_finds_debits_without_reference(
+        self, django_capture_on_commit_callbacks
+    ):
+        # Recorded before payout debits stored their reference
+        SellerBalanceService.record_entry(
+            seller=self.seller,
+            amount=Decimal("-80.00"),
+            entry_type=SellerBalanceLedger.ENTRY_PAYOUT_DEBIT,
+            description="Payout for LEGACY-REF-2",
+        )
+        payload = {
+            "event": "transfer.failed",
+            "data": {"id": 78, "reference": "LEGACY-REF-2"},
+        }
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = self.client.post(
+                reverse("paystack:webhook"),
+                data=json.dumps(payload),
+                content_type="application/json",
+                HTTP_X_PAYSTACK_SIGNATURE="mock-sig"
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        reversal = SellerBalanceLedger.objects.get(
+            entry_type=SellerBalanceLedger.ENTRY_ADJUSTMENT, reference="LEGACY-REF-2"
+        )
+        assert reversal.amount == Decimal("80.00")
+
+    def test_failed_event_backs_off_instead_of_spinning(self, monkeypatch):
+        PaystackWebhookEvent.objects.create(
+            event_key="charge.success:1", event_type="charge.success"
+        )
+
+        def fail(event):
+            raise ValueError("gateway down")
+
+        monkeypatch.setattr(PaystackWebhookService, "dispatch", fail)
+        # Every batch comes back full, so the task keeps claiming
+        totals = process_paystack_webhook_events(batch_size=1)
+
+        assert totals == {"processed": 0, "retrying": 1, "failed": 0}
+        event = PaystackWebhookEvent.objects.get()
+        assert event.status == PaystackWebhookEvent.STATUS_PENDING
+        assert event.attempts == 1
+        assert event.next_attempt_at > timezone.now()
+        assert PaystackWebhookService.claim_batch() == []
+
+
+class PaystackStubHandler(BaseHTTPRequestHandler):
+    """Serves scripted responses per path and records every request."""
+
+    def _respond(self):
+        path = urlparse(self.path).path
+        self.server.requests.append((self.command, path))
+        queue = self.server.responses.get(path, [])
+        status_code, body = queue.pop(0) if len(queue) > 1 else queue[0]
+        payload = json.dumps(body).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def paystack_stub(settings):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PaystackStubHandler)
+    server.requests = []
+    server.responses = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    settings.PAYSTACK_SECRET_KEY = "sk_test_stub_key"
+    settings.PAYSTACK_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+    settings.PAYSTACK_RETRY_BACKOFF = 0
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.django_db
+class TestPaystackClientAgainstStub:
+
+    def test_resolve_account_is_cached(self, paystack_stub):
+        paystack_stub.responses["/bank/resolve"] = [
+            (200, {"status": True, "data": {"account_name": "STUB ACCOUNT"}})
+        ]
+        CacheManager.invalidate_key(
+            "paystack", "resolve_account", bank_code="044", account_number="0000000001"
+        )
+        client = PaystackClient()
+
+        first = client.resolve_account("0000000001", "044")
+        second = client.resolve_account("0000000001", "044")
+
+        assert first == second
+        assert first["data"]["account_name"] == "STUB ACCOUNT"
+        assert paystack_stub.requests == [("GET", "/bank/resolve")]
+
+    def test_get_retries_transient_errors(self, paystack_stub):
+        paystack_stub.responses["/transaction/verify/REF-1"] = [
+            (503, {"status": False}),
+            (200, {"status": True, "data": {"status": "success"}}),
+        ]
+
+        result = PaystackClient().verify_payment("REF-1")
+
+        assert result["data"]["status"] == "success"
+        assert len(paystack_stub.requests) == 2
+
+    def test_post_is_not_retried(self, paystack_stub):
+        paystack_stub.responses["/transfer"] = [(503, {"status": False})]
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            PaystackClient().initiate_transfer(Decimal("10.00"), "RCP_1", "REF-2")
+
+        assert paystack_stub.requests == [("POST", "/transfer")]
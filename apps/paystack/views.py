@@ -2,7 +2,6 @@ import hmac
 import hashlib
 import json
 import logging
-from decimal import Decimal
 from django.conf import settings
 from django.db import transaction
 from django.http import HttpResponse
@@ -12,9 +11,9 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
 from apps.paystack.clients import PaystackClient
-from apps.transactions.models import EscrowTransaction, SellerBalanceLedger
-from apps.transactions.services.escrow_services import EscrowTransactionService
-from apps.transactions.services.ledger_service import SellerBalanceService
+from apps.paystack.services import PaystackWebhookService
+from apps.paystack.tasks import process_paystack_webhook_events
+from apps.transactions.models import EscrowTransaction
 from apps.users.models import SellerPaymentProfile
 
 logger = logging.getLogger(__name__)
@@ -225,76 +224,24 @@ class PaystackWebhookView(APIView):
 
         try:
             event_data = json.loads(payload)
-            event_type = event_data.get("event")
-            data = event_data.get("data", {})
-            logger.info(f"Received Paystack Webhook event: {event_type}")
-
-            if event_type == "charge.success":
-                reference = data.get("reference")
-                self._handle_charge_success(reference)
-
-            elif event_type == "transfer.success":
-                reference = data.get("reference")
-                self._handle_transfer_success(reference, data)
-
-            elif event_type == "transfer.failed":
-                reference = data.get("reference")
-                self._handle_transfer_failed(reference, data)
-
-            return HttpResponse(status=200)
+        except ValueError:
+            logger.warning("Paystack webhook payload is not valid JSON")
+            return HttpResponse(status=400)
 
+        # Insert into the inbox and ack; processing happens in the worker.
+        # Retried deliveries hit the unique event_key and are ignored.
+        try:
+            event, created = PaystackWebhookService.record_event(event_data)
         except Exception as e:
-            logger.error(f"Error handling Paystack webhook: {str(e)}")
+            logger.error(f"Error recording Paystack webhook: {str(e)}")
             return HttpResponse(status=500)
 
-    @transaction.atomic
-    def _handle_charge_success(self, reference: str):
-        """
-        Processes successful escrow payments.
-        Updates transaction status and locks the funds.
-        """
-        try:
-            escrow_transaction = EscrowTransaction.objects.get(tracking_id=reference)
-            if escrow_transaction.status == EscrowTransaction.STATUS_INITIATED:
-                # Transition status using system actor (user=None)
-                EscrowTransactionService._update_escrow_transaction_status(
-                    escrow_transaction=escrow_transaction,
-                    new_status=EscrowTransaction.STATUS_PAYMENT_RECEIVED,
-                    user=None,
-                    notes="Payment confirmed successfully via Paystack webhook.",
-                )
-                logger.info(f"Escrow transaction {escrow_transaction.id} transitioned to payment_received")
-        except EscrowTransaction.DoesNotExist:
-            logger.error(f"EscrowTransaction not found for payment reference: {reference}")
-
-    @transaction.atomic
-    def _handle_transfer_success(self, reference: str, data: dict):
-        """
-        Processes successful payout transfers to sellers.
-        """
-        logger.info(f"Payout transfer successful for reference: {reference}")
-        # Custom logging or settlement recording logic can be added here.
+        logger.info(
+            f"Received Paystack Webhook event: {event.event_type} "
+            f"({'queued' if created else 'duplicate'})"
+        )
+        if created:
+            # The worker must not run before the inbox row is visible
+            transaction.on_commit(process_paystack_webhook_events.delay)
 
-    @transaction.atomic
-    def _handle_transfer_failed(self, reference: str, data: dict):
-        """
-        Processes failed payout transfers. Reverts the debit in the ledger.
-        """
-        logger.error(f"Payout transfer failed for reference: {reference}")
-        # In a failure scenario, we record a credit entry to correct the balance.
-        # Find the original ledger debit
-        try:
-            original_debit = SellerBalanceLedger.objects.get(
-                entry_type=SellerBalanceLedger.ENTRY_PAYOUT_DEBIT,
-                description__contains=reference
-            )
-            SellerBalanceService.record_entry(
-                seller=original_debit.seller,
-                amount=abs(original_debit.amount),
-                entry_type=SellerBalanceLedger.ENTRY_ADJUSTMENT,
-                transaction_obj=original_debit.transaction,
-                description=f"Reversal of failed payout transfer reference {reference}",
-            )
-            logger.info(f"Reverted failed payout debit for seller {original_debit.seller.id}")
-        except SellerBalanceLedger.DoesNotExist:
-            logger.error(f"Original payout debit ledger entry not found for failed transfer reference: {reference}")
+        return HttpResponse(status=200)
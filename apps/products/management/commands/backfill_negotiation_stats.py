@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.products.services.negotiation_stats_service import NegotiationStatsService
+
+
+class Command(BaseCommand):
+    help = "Rebuild per-product and per-user negotiation stats from negotiations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows fetched/inserted per batch (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding negotiation stats...")
+
+        rows = NegotiationStatsService.rebuild(batch_size=options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} negotiation stats rows"))
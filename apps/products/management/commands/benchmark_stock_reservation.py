@@ -0,0 +1,119 @@
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.products.models import ProductVariant
+
+
+def reserve_conditional(variant_id, quantity):
+    """One conditional UPDATE ... RETURNING"""
+    return ProductVariant.objects.reserve(variant_id, quantity) is not None
+
+
+def reserve_locked(variant_id, quantity):
+    """The previous SELECT ... FOR UPDATE read-modify-write, for comparison"""
+    with transaction.atomic():
+        variant = ProductVariant.objects.select_for_update().get(pk=variant_id)
+        if variant.available_quantity < quantity:
+            return False
+        variant.in_escrow_inventory += quantity
+        variant.save(update_fields=["in_escrow_inventory"])
+        return True
+
+
+STRATEGIES = {"conditional": reserve_conditional, "locked": reserve_locked}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run N parallel buyers reserving stock on one variant and report "
+        "throughput, latency and oversell"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("variant", help="Variant id to reserve against")
+        parser.add_argument(
+            "--buyers",
+            type=int,
+            default=50,
+            help="Concurrent buyers, one thread and connection each (default: 50)",
+        )
+        parser.add_argument(
+            "--quantity",
+            type=int,
+            default=1,
+            help="Units each buyer reserves (default: 1)",
+        )
+        parser.add_argument(
+            "--strategy",
+            choices=sorted(STRATEGIES),
+            default="conditional",
+            help="Reservation implementation to exercise (default: conditional)",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the reservations instead of releasing them afterwards",
+        )
+
+    def handle(self, *args, **options):
+        variant_id = options["variant"]
+        buyers, quantity = options["buyers"], options["quantity"]
+        reserve = STRATEGIES[options["strategy"]]
+
+        before = ProductVariant.objects.filter(pk=variant_id).first()
+        if before is None:
+            raise CommandError(f"Variant {variant_id} not found")
+
+        barrier = threading.Barrier(buyers)
+
+        def buyer(_):
+            try:
+                barrier.wait()
+                start = time.perf_counter()
+                reserved = reserve(variant_id, quantity)
+                return reserved, time.perf_counter() - start
+            finally:
+                connection.close()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=buyers) as pool:
+            results = list(pool.map(buyer, range(buyers)))
+        elapsed = time.perf_counter() - started
+
+        reserved = sum(1 for ok, _ in results if ok)
+        latencies = sorted(latency * 1000 for _, latency in results)
+        after = ProductVariant.objects.get(pk=variant_id)
+        expected = min(buyers, before.available_quantity // quantity)
+
+        self.stdout.write(
+            f"{options['strategy']}: {buyers} buyers x {quantity} unit(s), "
+            f"{before.available_quantity} unreserved at start"
+        )
+        self.stdout.write(
+            f"  reserved {reserved}, rejected {buyers - reserved} "
+            f"in {elapsed:.3f}s ({buyers / elapsed:.0f} attempts/s)"
+        )
+        self.stdout.write(
+            f"  latency ms: p50 {statistics.median(latencies):.1f}, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}, "
+            f"max {latencies[-1]:.1f}"
+        )
+
+        oversold = after.in_escrow_inventory > after.total_inventory
+        if oversold or reserved != expected:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"  expected {expected} reservations, escrow now "
+                    f"{after.in_escrow_inventory}/{after.total_inventory}"
+                )
+            )
+        else:
+            self.stdout.write(self.style.SUCCESS("  no oversell"))
+
+        if reserved and not options["keep"]:
+            ProductVariant.objects.release(variant_id, reserved * quantity)
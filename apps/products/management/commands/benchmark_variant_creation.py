@@ -0,0 +1,109 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.products.models import (
+    Product,
+    ProductVariant,
+    ProductVariantOption,
+    ProductVariantType,
+)
+from apps.products.services.variant_service import ProductVariantService
+
+
+class Rollback(Exception):
+    pass
+
+
+def create_bulk(product, combos):
+    """One bulk_create_variants call"""
+    return ProductVariantService.bulk_create_variants(product.id, combos)
+
+
+def create_per_row(product, combos):
+    """The previous shape: create() and options.set() per combination"""
+    options = ProductVariantOption.objects.in_bulk(
+        {oid for combo in combos for oid in combo["option_combinations"]}
+    )
+    for combo in combos:
+        variant = ProductVariant.objects.create(
+            product=product, sku=combo["sku"], price=combo["price"]
+        )
+        variant.options.set([options[oid] for oid in combo["option_combinations"]])
+
+
+STRATEGIES = {"bulk": create_bulk, "per-row": create_per_row}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a size x color x storage grid of throwaway options for a "
+        "product, create every combination and report time and query count. "
+        "Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("product", help="Product id to attach the variants to")
+        parser.add_argument(
+            "--per-type",
+            type=int,
+            default=10,
+            help="Options per variant type; combinations = per-type^3 (default: 10)",
+        )
+        parser.add_argument(
+            "--strategy",
+            choices=sorted(STRATEGIES),
+            default="bulk",
+            help="Creation implementation to exercise (default: bulk)",
+        )
+
+    def handle(self, *args, **options):
+        product = Product.objects.filter(pk=options["product"]).first()
+        if product is None:
+            raise CommandError(f"Product {options['product']} not found")
+
+        per_type = options["per_type"]
+        create = STRATEGIES[options["strategy"]]
+        run = uuid.uuid4().hex[:8]
+
+        try:
+            with transaction.atomic():
+                grid = {}
+                for name in ("size", "color", "storage"):
+                    variant_type = ProductVariantType.objects.create(
+                        name=f"bench-{name}-{run}", slug=f"bench-{name}-{run}"
+                    )
+                    grid[variant_type.id] = [
+                        option.id
+                        for option in ProductVariantOption.objects.bulk_create(
+                            ProductVariantOption(
+                                variant_type=variant_type,
+                                value=f"{name}-{i}",
+                                slug=f"{name}-{i}",
+                            )
+                            for i in range(per_type)
+                        )
+                    ]
+                combos = ProductVariantService.generate_all_combinations(
+                    product.id,
+                    grid,
+                    base_sku=f"BENCH-{run}",
+                    base_price=product.price,
+                )
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    create(product, combos)
+                    elapsed = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(
+            f"{options['strategy']}: {len(combos)} combinations in {elapsed:.3f}s "
+            f"({len(combos) / elapsed:.0f} variants/s), "
+            f"{len(queries.captured_queries)} queries"
+        )
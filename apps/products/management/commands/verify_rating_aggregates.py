@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+
+from apps.products.models import Product
+from apps.products.services.rating_aggregate_service import RatingAggregateService
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare delta-maintained product rating aggregates with full "
+        "recomputes from the ratings table"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--product",
+            action="append",
+            dest="products",
+            help="Only verify this product id (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Products compared per batch (default: 1000)",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rewrite drifted aggregates from the full recompute",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Product.objects.order_by("id")
+        if options["products"]:
+            queryset = queryset.filter(id__in=options["products"])
+
+        checked = drifted = 0
+        batch = []
+        for product_id in queryset.values_list("id", flat=True).iterator(
+            chunk_size=batch_size
+        ):
+            batch.append(product_id)
+            if len(batch) >= batch_size:
+                drifted += self._verify(batch, options["fix"])
+                checked += len(batch)
+                batch = []
+        if batch:
+            drifted += self._verify(batch, options["fix"])
+            checked += len(batch)
+
+        summary = f"Checked {checked} products, {drifted} with drifted aggregates"
+        if drifted and not options["fix"]:
+            self.stdout.write(self.style.WARNING(f"{summary} (run with --fix)"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+
+    def _verify(self, product_ids, fix):
+        drift = RatingAggregateService.find_drift(product_ids)
+        for product_id, fields in drift.items():
+            details = ", ".join(
+                f"{field}: {stored} != {expected}"
+                for field, (stored, expected) in fields.items()
+            )
+            self.stdout.write(f"Product {product_id}: {details}")
+
+        if fix and drift:
+            RatingAggregateService.recompute(list(drift))
+        return len(drift)
@@ -0,0 +1,49 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:04
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    ProductImage = apps.get_model("products", "ProductImage")
+    ProductWatchlistItem = apps.get_model("products", "ProductWatchlistItem")
+
+    def count_of(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(product=OuterRef("pk"))
+                .order_by()
+                .values("product")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+
+    Product.objects.update(
+        cached_watchers_count=count_of(ProductWatchlistItem),
+        cached_images_count=count_of(ProductImage),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_pricenegotiation_transaction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='cached_images_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='cached_watchers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
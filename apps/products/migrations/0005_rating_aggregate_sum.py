@@ -0,0 +1,41 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:10
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_rating_sum(apps, schema_editor):
+    ProductRating = apps.get_model("products", "ProductRating")
+    ProductRatingAggregate = apps.get_model("products", "ProductRatingAggregate")
+
+    ProductRatingAggregate.objects.update(
+        rating_sum=Coalesce(
+            Subquery(
+                ProductRating.objects.filter(
+                    product=OuterRef("product"), is_approved=True
+                )
+                .order_by()
+                .values("product")
+                .annotate(total=Sum("rating"))
+                .values("total")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_engagement_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productratingaggregate',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_sum, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:20
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_rating_aggregate_sum'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WatchlistSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_items', models.PositiveIntegerField(default=0)),
+                ('category_counts', models.JSONField(blank=True, default=dict)),
+                ('recent_product_ids', models.JSONField(blank=True, default=list)),
+                ('oldest_added_at', models.DateTimeField(blank=True, null=True)),
+                ('newest_added_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='watchlist_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'product_watchlist_summary',
+            },
+        ),
+    ]
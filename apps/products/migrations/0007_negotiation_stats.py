@@ -0,0 +1,67 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:38
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_watchlist_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductNegotiationStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_negotiations', models.PositiveIntegerField(default=0)),
+                ('open_negotiations', models.IntegerField(default=0)),
+                ('accepted_negotiations', models.IntegerField(default=0)),
+                ('rejected_negotiations', models.IntegerField(default=0)),
+                ('offers_count', models.PositiveIntegerField(default=0)),
+                ('offered_price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('final_price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('final_price_count', models.IntegerField(default=0)),
+                ('discount_percent_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('response_count', models.PositiveIntegerField(default=0)),
+                ('response_seconds_sum', models.BigIntegerField(default=0)),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='negotiation_stats', to='products.product')),
+            ],
+            options={
+                'verbose_name_plural': 'Product negotiation stats',
+                'db_table': 'product_negotiation_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserNegotiationStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('total_negotiations', models.PositiveIntegerField(default=0)),
+                ('open_negotiations', models.IntegerField(default=0)),
+                ('accepted_negotiations', models.IntegerField(default=0)),
+                ('rejected_negotiations', models.IntegerField(default=0)),
+                ('offers_count', models.PositiveIntegerField(default=0)),
+                ('offered_price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('final_price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('final_price_count', models.IntegerField(default=0)),
+                ('discount_percent_sum', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('response_count', models.PositiveIntegerField(default=0)),
+                ('response_seconds_sum', models.BigIntegerField(default=0)),
+                ('role', models.CharField(choices=[('buyer', 'Buyer'), ('seller', 'Seller')], max_length=10)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='negotiation_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'User negotiation stats',
+                'db_table': 'user_negotiation_stats',
+                'constraints': [models.UniqueConstraint(fields=('user', 'role'), name='unique_user_negotiation_stats')],
+            },
+        ),
+    ]
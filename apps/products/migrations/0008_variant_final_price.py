@@ -0,0 +1,59 @@
+# Generated by Django 5.1.15 on 2026-10-18 22:56
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def backfill_final_price(apps, schema_editor):
+    Product = apps.get_model("products", "Product")
+    ProductVariant = apps.get_model("products", "ProductVariant")
+    ProductVariantOption = apps.get_model("products", "ProductVariantOption")
+
+    adjustments = (
+        ProductVariantOption.objects.filter(
+            variants=OuterRef("pk"), variant_type__affects_price=True
+        )
+        .order_by()
+        .values("variants")
+        .annotate(total=Sum("price_adjustment"))
+        .values("total")
+    )
+    ProductVariant.objects.update(
+        final_price=Case(
+            When(
+                price__isnull=True,
+                then=Subquery(
+                    Product.objects.filter(pk=OuterRef("product_id")).values("price")
+                ),
+            ),
+            default=F("price") + Coalesce(Subquery(adjustments), Value(Decimal("0"))),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_negotiation_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='final_price',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, help_text='Price including option adjustments, kept by VariantPriceService', max_digits=10, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['is_active', 'final_price'], name='product_var_is_acti_6eac6c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productvariant',
+            index=models.Index(fields=['product', 'final_price'], name='product_var_product_bb3859_idx'),
+        ),
+        migrations.RunPython(backfill_final_price, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:03
+
+import hashlib
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def backfill_option_signature(apps, schema_editor):
+    """
+    Sign every variant from its options. Pre-existing duplicate combinations
+    keep an empty signature on all but the first variant so the unique
+    constraint can be added; they stay reachable by id.
+    """
+    ProductVariant = apps.get_model("products", "ProductVariant")
+
+    option_ids = defaultdict(list)
+    links = ProductVariant.options.through.objects.values_list(
+        "productvariant_id", "productvariantoption_id"
+    )
+    for variant_id, option_id in links.iterator(chunk_size=2000):
+        option_ids[variant_id].append(str(option_id))
+
+    seen = set()
+    signed = []
+    variants = ProductVariant.objects.order_by("created_at", "id").values_list(
+        "id", "product_id"
+    )
+    for variant_id, product_id in variants.iterator(chunk_size=2000):
+        if not option_ids[variant_id]:
+            continue
+        canonical = ",".join(sorted(set(option_ids[variant_id])))
+        signature = hashlib.sha256(canonical.encode()).hexdigest()
+        if (product_id, signature) in seen:
+            continue
+        seen.add((product_id, signature))
+        signed.append(ProductVariant(id=variant_id, option_signature=signature))
+    ProductVariant.objects.bulk_update(signed, ["option_signature"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_variant_final_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productvariant',
+            name='option_signature',
+            field=models.CharField(blank=True, default='', editable=False, help_text='Hash of the sorted option ids, empty for variants without options', max_length=64),
+        ),
+        migrations.RunPython(backfill_option_signature, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='productvariant',
+            constraint=models.UniqueConstraint(condition=models.Q(('option_signature', ''), _negated=True), fields=('product', 'option_signature'), name='unique_variant_option_signature'),
+        ),
+    ]
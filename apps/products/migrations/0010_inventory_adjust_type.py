@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 23:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_variant_option_signature'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='inventorytransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('ADD', 'Add to Total'), ('ADJUST', 'Adjust Total'), ('ACTIVATE', 'Move to Available'), ('ESCROW', 'Place in Escrow'), ('COMPLETE', 'Complete Transaction'), ('CANCEL', 'Cancel Escrow')], max_length=20),
+        ),
+    ]
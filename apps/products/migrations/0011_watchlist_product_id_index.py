@@ -0,0 +1,19 @@
+# Generated by Django 5.1.15 on 2026-10-19 00:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_inventory_adjust_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='productwatchlistitem',
+            index=models.Index(fields=['product', 'id'], name='product_wat_product_e0a940_idx'),
+        ),
+    ]
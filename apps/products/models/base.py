@@ -86,6 +86,11 @@ class Product(BaseModel):
     negotiation_deadline = models.DateTimeField(null=True, blank=True)
     max_negotiation_rounds = models.PositiveIntegerField(default=5)
 
+    # Denormalized engagement counters, kept in step with watchlist/image
+    # writes by ProductCounterService and reconciled periodically
+    cached_watchers_count = models.PositiveIntegerField(default=0)
+    cached_images_count = models.PositiveIntegerField(default=0)
+
     class Meta:
         db_table = "product"
         ordering = ["-created_at"]
@@ -6,6 +6,7 @@ from apps.core.models import BaseModel
 class InventoryTransaction(BaseModel):
     TRANSACTION_TYPES = (
         ("ADD", "Add to Total"),
+        ("ADJUST", "Adjust Total"),
         ("ACTIVATE", "Move to Available"),
         ("ESCROW", "Place in Escrow"),
         ("COMPLETE", "Complete Transaction"),
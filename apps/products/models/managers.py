@@ -1,5 +1,10 @@
-from django.db import models
-from django.db.models import Count, Q, Prefetch
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from django.db import connections, models, transaction
+from django.db.models import Count, F, Q, Prefetch
+from django.db.models.functions import Greatest
+from django.db.models.sql import UpdateQuery
 from django.core.cache import cache
 from apps.core.utils.cache_key_manager import CacheKeyManager
 
@@ -118,3 +123,300 @@ class BrandCacheManager:
 
         except Brand.DoesNotExist:
             pass
+
+
+# Stock columns returned by every ProductVariantQuerySet stock movement
+STOCK_FIELDS = ("total_inventory", "available_inventory", "in_escrow_inventory")
+STOCK_RETURNING = ("id", "product_id") + STOCK_FIELDS
+
+
+class ProductVariantQuerySet(models.QuerySet):
+    """
+    Stock movements as single conditional UPDATE statements.
+
+    The availability check and the change happen in one statement, so a
+    movement needs no prior ``SELECT ... FOR UPDATE`` and holds the row lock
+    only as long as the statement (or the caller's transaction). Each
+    movement returns the variant's new stock values, or None when the
+    condition did not hold.
+
+    Exact option-combination lookups go through ``option_signature``, a hash
+    of the variant's sorted option ids that is unique per product.
+    """
+
+    def update_returning(self, **kwargs) -> List[Dict]:
+        """
+        ``update()`` returning the id, product id and new stock values of the
+        changed rows, whose caches are also dropped after commit.
+        """
+        self._for_write = True
+        connection = connections[self.db]
+        if connection.vendor not in ("postgresql", "sqlite"):
+            # No UPDATE ... RETURNING: lock, update, then read back
+            with transaction.atomic(using=self.db):
+                ids = list(self.select_for_update().values_list("pk", flat=True))
+                self.model._default_manager.filter(pk__in=ids).update(**kwargs)
+                rows = list(
+                    self.model._default_manager.filter(pk__in=ids).values(
+                        *STOCK_RETURNING
+                    )
+                )
+                self._publish_stock(rows)
+                return rows
+
+        query = self.query.chain(UpdateQuery)
+        query.add_update_values(kwargs)
+        query.annotations = {}
+        sql, params = query.get_compiler(self.db).as_sql()
+        columns = ", ".join(connection.ops.quote_name(c) for c in STOCK_RETURNING)
+        with transaction.mark_for_rollback_on_error(using=self.db):
+            with connection.cursor() as cursor:
+                cursor.execute(f"{sql} RETURNING {columns}", params)
+                rows = [self._stock_row(row) for row in cursor.fetchall()]
+        self._publish_stock(rows)
+        return rows
+
+    def _stock_row(self, row) -> Dict:
+        """A raw ``STOCK_RETURNING`` row with ids converted to Python values"""
+        to_pk = self.model._meta.pk.to_python
+        to_product_pk = self.model._meta.get_field("product").target_field.to_python
+        return dict(
+            zip(STOCK_RETURNING, (to_pk(row[0]), to_product_pk(row[1])) + row[2:])
+        )
+
+    @staticmethod
+    def _publish_stock(rows: List[Dict]):
+        """
+        After commit, drop the moved variants from the variant matrix stock
+        overlay and their products' detail and variant caches. Movements are
+        UPDATEs, so the ProductVariant post_save receivers never see them.
+        """
+        from apps.products.services.variant_matrix_service import (
+            VariantMatrixService,
+        )
+        from apps.products.services.variant_service import ProductVariantService
+
+        VariantMatrixService.invalidate_stock(rows)
+        for product_id in {row["product_id"] for row in rows}:
+            ProductVariantService._clear_product_caches(product_id, lists=False)
+
+    def _move_stock(self, variant_id, condition: Q, **changes) -> Optional[Dict]:
+        rows = self.filter(condition, pk=variant_id).update_returning(**changes)
+        return rows[0] if rows else None
+
+    def reserve(
+        self, variant_id, quantity: int, consume_available: bool = False
+    ) -> Optional[Dict]:
+        """
+        Move ``quantity`` into escrow if that much is unreserved. With
+        ``consume_available`` the inspected-and-ready count drops as well.
+        """
+        changes = {"in_escrow_inventory": F("in_escrow_inventory") + quantity}
+        if consume_available:
+            changes["available_inventory"] = F("available_inventory") - quantity
+        return self._move_stock(
+            variant_id,
+            Q(total_inventory__gte=F("in_escrow_inventory") + quantity),
+            **changes,
+        )
+
+    def release(
+        self, variant_id, quantity: int, restore_available: bool = False
+    ) -> Optional[Dict]:
+        """Return ``quantity`` from escrow, never going below zero"""
+        changes = {
+            "in_escrow_inventory": Greatest(F("in_escrow_inventory") - quantity, 0)
+        }
+        if restore_available:
+            changes["available_inventory"] = F("available_inventory") + quantity
+        stock = self._move_stock(variant_id, Q(), **changes)
+        if stock is not None:
+            self._alert_back_in_stock(stock, quantity)
+        return stock
+
+    def _alert_back_in_stock(self, stock: Dict, quantity: int):
+        """Alert watchers when a release makes a sold-out variant available"""
+        from apps.products.services.watchlist_alert_service import (
+            WatchlistAlertService,
+        )
+
+        # A release only ever adds availability; the escrow held what it returns
+        was_escrowed = stock["in_escrow_inventory"] + quantity
+        if stock["total_inventory"] - was_escrowed > 0:
+            return
+        if stock["total_inventory"] - stock["in_escrow_inventory"] <= 0:
+            return
+
+        variant = (
+            self.model._default_manager.select_related("product")
+            .filter(pk=stock["id"])
+            .first()
+        )
+        if variant is None:
+            return
+        before = {
+            "price": variant.price,
+            "is_active": variant.is_active,
+            "total_inventory": stock["total_inventory"],
+            "in_escrow_inventory": was_escrowed,
+        }
+        WatchlistAlertService.schedule(
+            variant.product_id, WatchlistAlertService.variant_changes(before, variant)
+        )
+
+    def reduce(self, variant_id, quantity: int) -> Optional[Dict]:
+        """Ship ``quantity``: take it off the total and out of escrow"""
+        return self._move_stock(
+            variant_id,
+            Q(total_inventory__gte=quantity),
+            total_inventory=F("total_inventory") - quantity,
+            in_escrow_inventory=Greatest(F("in_escrow_inventory") - quantity, 0),
+        )
+
+    def reserve_many(
+        self, quantities: Dict, consume_available: bool = False
+    ) -> Tuple[Dict, List]:
+        """
+        Reserve a whole cart, all or nothing: ``quantities`` maps variant id to
+        units. Returns ``(stock by variant id, ids that were short)``; when
+        any variant is short or inactive nothing is reserved.
+
+        On PostgreSQL and SQLite the check and change for every line is one
+        ``UPDATE ... FROM (VALUES ...)``; PostgreSQL first locks the rows in id
+        order so overlapping carts cannot deadlock.
+        """
+        to_pk = self.model._meta.pk.to_python
+        quantities = {to_pk(key): quantity for key, quantity in quantities.items()}
+        ids = sorted(quantities, key=str)
+        if not ids:
+            return {}, []
+
+        with transaction.atomic(using=self.db):
+            if connections[self.db].vendor in ("postgresql", "sqlite"):
+                rows = self._reserve_many_sql(ids, quantities, consume_available)
+            else:
+                rows = self._reserve_many_each(ids, quantities, consume_available)
+            stock = {row["id"]: row for row in rows}
+            short = [variant_id for variant_id in ids if variant_id not in stock]
+            if short:
+                # Also discards the overlay writes queued in this block
+                transaction.set_rollback(True, using=self.db)
+                return {}, short
+            if connections[self.db].vendor in ("postgresql", "sqlite"):
+                self._publish_stock(rows)
+        return stock, []
+
+    def _reserve_many_sql(self, ids, quantities, consume_available) -> List[Dict]:
+        connection = connections[self.db]
+        postgres = connection.vendor == "postgresql"
+        pk_field = self.model._meta.pk
+        table = connection.ops.quote_name(self.model._meta.db_table)
+
+        row_sql = "(%s::uuid, %s::integer)" if postgres else "(%s, %s)"
+        params = []
+        for variant_id in ids:
+            params += [
+                pk_field.get_db_prep_value(variant_id, connection),
+                quantities[variant_id],
+            ]
+        ctes = [f"cart(id, qty) AS (VALUES {', '.join([row_sql] * len(ids))})"]
+        sources = ["cart"]
+        conditions = [
+            f"{table}.id = cart.id",
+            f"{table}.is_active",
+            f"{table}.total_inventory - {table}.in_escrow_inventory >= cart.qty",
+        ]
+        if postgres:
+            # Lock every cart row in id order before any is changed
+            ctes.append(
+                f"locked AS (SELECT v.id FROM {table} v JOIN cart ON cart.id = v.id "
+                "ORDER BY v.id FOR UPDATE OF v)"
+            )
+            sources.append("locked")
+            conditions.append(f"locked.id = {table}.id")
+
+        assignments = ["in_escrow_inventory = in_escrow_inventory + cart.qty"]
+        if consume_available:
+            assignments.append("available_inventory = available_inventory - cart.qty")
+        returning = ", ".join(f"{table}.{field}" for field in STOCK_RETURNING)
+        sql = (
+            f"WITH {', '.join(ctes)} "
+            f"UPDATE {table} SET {', '.join(assignments)} "
+            f"FROM {', '.join(sources)} "
+            f"WHERE {' AND '.join(conditions)} "
+            f"RETURNING {returning}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [self._stock_row(row) for row in rows]
+
+    def _reserve_many_each(self, ids, quantities, consume_available) -> List[Dict]:
+        """Fallback: lock in id order, then one conditional UPDATE per line"""
+        list(self.select_for_update().filter(pk__in=ids).order_by("pk").values("pk"))
+        rows = []
+        for variant_id in ids:
+            stock = self.filter(is_active=True).reserve(
+                variant_id, quantities[variant_id], consume_available
+            )
+            if stock is not None:
+                rows.append(stock)
+        return rows
+
+    def by_options(self, product_id, option_ids):
+        """Variants of ``product_id`` with exactly ``option_ids``"""
+        signature = self.model.make_option_signature(option_ids)
+        if not signature:
+            return self.none()
+        return self.filter(product_id=product_id, option_signature=signature)
+
+    def refresh_option_signatures(self, defer_conflicts: bool = False) -> List:
+        """
+        Recompute ``option_signature`` for these variants from their options
+        and return the ids left unsigned.
+
+        With ``defer_conflicts`` a variant whose new signature is already held
+        by a sibling is left unsigned instead of violating
+        ``unique_variant_option_signature``. ``options.set()`` removes before
+        it adds, so its intermediate combination may briefly match a sibling.
+        """
+        current = dict(self.values_list("pk", "option_signature"))
+        option_ids = defaultdict(list)
+        links = self.model.options.through.objects.filter(
+            productvariant_id__in=list(current)
+        ).values_list("productvariant_id", "productvariantoption_id")
+        for variant_id, option_id in links:
+            option_ids[variant_id].append(option_id)
+
+        changed = {}
+        for variant_id, signature in current.items():
+            new_signature = self.model.make_option_signature(option_ids[variant_id])
+            if new_signature != signature:
+                changed[variant_id] = new_signature
+
+        deferred = []
+        if defer_conflicts and changed:
+            product_ids = dict(
+                self.filter(pk__in=list(changed)).values_list("pk", "product_id")
+            )
+            taken = set(
+                self.model.objects.filter(
+                    product_id__in=set(product_ids.values()),
+                    option_signature__in=set(changed.values()) - {""},
+                )
+                .exclude(pk__in=list(changed))
+                .values_list("product_id", "option_signature")
+            )
+            for variant_id, signature in changed.items():
+                if (product_ids[variant_id], signature) in taken:
+                    changed[variant_id] = ""
+                    deferred.append(variant_id)
+
+        changed = [
+            self.model(pk=variant_id, option_signature=signature)
+            for variant_id, signature in changed.items()
+            if signature != current[variant_id]
+        ]
+        if changed:
+            self.model.objects.bulk_update(changed, ["option_signature"])
+        return deferred
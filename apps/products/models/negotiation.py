@@ -86,3 +86,73 @@ class NegotiationHistory(BaseModel):
 
     def __str__(self):
         return f"{self.action} by {self.user} on {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+
+
+class NegotiationStatsBase(BaseModel):
+    """
+    Negotiation counters maintained by NegotiationStatsService, so analytics
+    are a single-row read. Status counts and price sums follow each
+    negotiation's current state; offers and responses count history events.
+    """
+
+    total_negotiations = models.PositiveIntegerField(default=0)
+    open_negotiations = models.IntegerField(default=0)
+    accepted_negotiations = models.IntegerField(default=0)
+    rejected_negotiations = models.IntegerField(default=0)
+
+    offers_count = models.PositiveIntegerField(default=0)
+    offered_price_sum = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0
+    )
+    final_price_sum = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    final_price_count = models.IntegerField(default=0)
+    discount_percent_sum = models.DecimalField(
+        max_digits=14, decimal_places=2, default=0
+    )
+
+    response_count = models.PositiveIntegerField(default=0)
+    response_seconds_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class ProductNegotiationStats(NegotiationStatsBase):
+    product = models.OneToOneField(
+        "products.Product",
+        on_delete=models.CASCADE,
+        related_name="negotiation_stats",
+    )
+
+    class Meta:
+        db_table = "product_negotiation_stats"
+        verbose_name_plural = "Product negotiation stats"
+
+    def __str__(self):
+        return f"{self.product_id}: {self.total_negotiations} negotiations"
+
+
+class UserNegotiationStats(NegotiationStatsBase):
+    ROLE_CHOICES = (
+        ("buyer", "Buyer"),
+        ("seller", "Seller"),
+    )
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="negotiation_stats",
+    )
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+
+    class Meta:
+        db_table = "user_negotiation_stats"
+        verbose_name_plural = "User negotiation stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "role"], name="unique_user_negotiation_stats"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} as {self.role}: {self.total_negotiations}"
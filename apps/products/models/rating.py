@@ -85,6 +85,8 @@ class ProductRatingAggregate(BaseModel):
     )
     total_count = models.PositiveIntegerField(default=0, db_index=True)
     verified_count = models.PositiveIntegerField(default=0)
+    # Sum of approved star values; average_rating = rating_sum / total_count
+    rating_sum = models.PositiveIntegerField(default=0)
 
     # Rating breakdown
     stars_5_count = models.PositiveIntegerField(default=0)
@@ -1,6 +1,9 @@
+import hashlib
+
 from django.db import models
 from django.core.exceptions import ValidationError
 from apps.core.models import BaseModel
+from .managers import ProductVariantQuerySet
 
 
 class ProductVariantType(BaseModel):
@@ -110,6 +113,21 @@ class ProductVariant(BaseModel):
 
     # Pricing and inventory
     price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    final_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Price including option adjustments, kept by VariantPriceService",
+    )
+    option_signature = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        editable=False,
+        help_text="Hash of the sorted option ids, empty for variants without options",
+    )
     cost_price = models.DecimalField(
         max_digits=10,
         decimal_places=2,
@@ -152,6 +170,8 @@ class ProductVariant(BaseModel):
     )
     expected_restock_date = models.DateField(null=True, blank=True)
 
+    objects = ProductVariantQuerySet.as_manager()
+
     class Meta:
         db_table = "product_variant"
         indexes = [
@@ -159,6 +179,15 @@ class ProductVariant(BaseModel):
             models.Index(fields=["sku"]),
             models.Index(fields=["total_inventory"]),
             models.Index(fields=["is_active", "total_inventory"]),
+            models.Index(fields=["is_active", "final_price"]),
+            models.Index(fields=["product", "final_price"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["product", "option_signature"],
+                condition=~models.Q(option_signature=""),
+                name="unique_variant_option_signature",
+            )
         ]
 
     def __str__(self):
@@ -188,41 +217,64 @@ class ProductVariant(BaseModel):
         """Check if variant is low on stock"""
         return self.available_quantity <= self.low_stock_threshold
 
-    @property
-    def final_price(self):
-        """Calculate final price including option adjustments"""
+    @staticmethod
+    def make_option_signature(option_ids) -> str:
+        """Canonical signature of an option combination, independent of order"""
+        if not option_ids:
+            return ""
+        canonical = ",".join(sorted({str(option_id) for option_id in option_ids}))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def compute_final_price(self, options=None):
+        """
+        Calculate final price including option adjustments. Callers that
+        already hold the variant's options (bulk creation) pass them to skip
+        the aggregate query.
+        """
         if self.price is None:
-            return self.product.price if hasattr(self, "product") else None
-
-        base_price = self.price
-        option_adjustments = sum(
-            option.price_adjustment
-            for option in self.options.all()
-            if option.variant_type.affects_price
-        )
-        return base_price + option_adjustments
+            return self.product.price if self.product_id else None
+        if options is not None:
+            return self.price + sum(
+                option.price_adjustment or 0
+                for option in options
+                if option.variant_type.affects_price
+            )
+        if self._state.adding:
+            return self.price
+
+        adjustment = self.options.filter(variant_type__affects_price=True).aggregate(
+            total=models.Sum("price_adjustment")
+        )["total"]
+        return self.price + (adjustment or 0)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "price" in update_fields:
+            self.final_price = self.compute_final_price()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "final_price"}
+        super().save(*args, **kwargs)
+
+    def _set_stock(self, stock):
+        """Copy stock values returned by a ProductVariantQuerySet movement"""
+        if stock is None:
+            return False
+        for field, value in stock.items():
+            if field != "id":
+                setattr(self, field, value)
+        return True
 
     def reserve_stock(self, quantity):
         """Reserve stock for pending orders"""
-        if self.available_quantity >= quantity:
-            self.in_escrow_inventory += quantity
-            self.save(update_fields=["in_escrow_inventory"])
-            return True
-        return False
+        return self._set_stock(ProductVariant.objects.reserve(self.pk, quantity))
 
     def release_stock(self, quantity):
         """Release reserved stock"""
-        self.in_escrow_inventory = max(0, self.in_escrow_inventory - quantity)
-        self.save(update_fields=["in_escrow_inventory"])
+        self._set_stock(ProductVariant.objects.release(self.pk, quantity))
 
     def reduce_stock(self, quantity):
         """Reduce actual stock quantity"""
-        if self.total_inventory >= quantity:
-            self.total_inventory -= quantity
-            self.in_escrow_inventory = max(0, self.in_escrow_inventory - quantity)
-            self.save(update_fields=["total_inventory", "in_escrow_inventory"])
-            return True
-        return False
+        return self._set_stock(ProductVariant.objects.reduce(self.pk, quantity))
 
 
 class ProductVariantImage(BaseModel):
@@ -18,8 +18,37 @@ class ProductWatchlistItem(BaseModel):
         indexes = [
             models.Index(fields=["user", "product"]),
             models.Index(fields=["product", "added_at"]),
+            # Keyset walk of a product's watchers in notify_product_watchers
+            models.Index(fields=["product", "id"]),
             models.Index(fields=["added_at"]),
         ]
 
     def __str__(self):
         return f"{self.user.first_name} watching {self.product.title}"
+
+
+class WatchlistSummary(BaseModel):
+    """
+    Per-user watchlist totals maintained incrementally by
+    WatchlistSummaryService, so stats are a single-row read.
+    ``category_counts`` maps category id to the number of watched products
+    in it; ``recent_product_ids`` holds the most recently added product ids,
+    newest first.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="watchlist_summary",
+    )
+    total_items = models.PositiveIntegerField(default=0)
+    category_counts = models.JSONField(default=dict, blank=True)
+    recent_product_ids = models.JSONField(default=list, blank=True)
+    oldest_added_at = models.DateTimeField(null=True, blank=True)
+    newest_added_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "product_watchlist_summary"
+
+    def __str__(self):
+        return f"{self.user_id}: {self.total_items} watched"
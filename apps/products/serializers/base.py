@@ -565,10 +565,10 @@ class ProductStatsSerializer(TimestampedModelSerializer):
         ]
 
     def get_watching_count(self, obj) -> int:
-        return obj.watchers.count()
+        return obj.cached_watchers_count
 
     def get_images_count(self, obj) -> int:
-        return obj.images.count()
+        return obj.cached_images_count
 
     def get_has_discount(self, obj) -> bool:
         return bool(obj.original_price and obj.price < obj.original_price)
@@ -255,6 +255,10 @@ class NegotiationStatsSerializer(serializers.Serializer):
     success_rate = serializers.FloatField(
         max_value=5.0, min_value=0.0  # Use float for float fields
     )
+    offers_count = serializers.IntegerField()
+    acceptance_rate = serializers.FloatField()
+    average_discount = serializers.FloatField()
+    average_response_seconds = serializers.FloatField()
 
     # Additional calculated fields
     formatted_avg_offered_price = serializers.SerializerMethodField()
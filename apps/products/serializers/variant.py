@@ -241,19 +241,12 @@ class ProductVariantSerializer(TimestampedModelSerializer):
         """Optimize single instance representation"""
         ret = super().to_representation(instance)
 
-        # Calculate final_price only if price exists
-        if instance.price is not None:
-            price_adjustments = sum(
-                opt.price_adjustment
-                for opt in instance.options.all()
-                if opt.variant_type.affects_price
-            )
-            ret["final_price"] = float(instance.final_price + price_adjustments)
+        # final_price is a stored column that already includes the
+        # option adjustments
+        if instance.final_price is not None:
+            ret["final_price"] = float(instance.final_price)
 
         # Calculate availability
-        logger.info(
-            f"Calculating final price for variant {instance.id}: {instance.price}"
-        )
         ret["available_quantity"] = (
             instance.available_quantity - instance.total_inventory
         )
@@ -506,13 +499,13 @@ class ProductVariantStockUpdateSerializer(serializers.Serializer):
                         f"Stock update {i}: '{field}' is required"
                     )
 
-            # Validate variant_id is integer
+            # Validate variant_id is a variant primary key
             try:
-                variant_id = int(update["variant_id"])
+                variant_id = ProductVariant._meta.pk.to_python(update["variant_id"])
                 variant_ids.append(variant_id)
-            except (ValueError, TypeError):
+            except ValidationError:
                 raise serializers.ValidationError(
-                    f"Stock update {i}: 'variant_id' must be an integer"
+                    f"Stock update {i}: 'variant_id' must be a valid variant id"
                 )
 
             # Validate quantity is positive integer
@@ -563,13 +556,9 @@ class ProductVariantMatrixSerializer(serializers.Serializer):
         variant_types = instance.get("variant_types", [])
         variants = instance.get("variants", {})
 
-        # Serialize variant types
-        variant_type_serializer = ProductVariantTypeSerializer(
-            variant_types, many=True, context=self.context
-        )
-
+        # VariantMatrixService already builds variant types as plain dicts
         return {
-            "variant_types": variant_type_serializer.data,
+            "variant_types": variant_types,
             "variants": variants,
             "matrix_info": {
                 "total_variants": len(variants),
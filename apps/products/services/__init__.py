@@ -20,3 +20,11 @@ from .variant_service import *  # noqa: F401, F403
 from .watchlist_service import *  # noqa: F401, F403
 from .search import *  # noqa: F401, F403
 
+from .counter_service import *  # noqa: F401, F403
+from .rating_aggregate_service import *  # noqa: F401, F403
+from .watchlist_membership_service import *  # noqa: F401, F403
+from .watchlist_summary_service import *  # noqa: F401, F403
+from .watchlist_alert_service import *  # noqa: F401, F403
+from .negotiation_stats_service import *  # noqa: F401, F403
+from .variant_price_service import *  # noqa: F401, F403
+from .variant_matrix_service import *  # noqa: F401, F403
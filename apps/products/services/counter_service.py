@@ -0,0 +1,123 @@
+import logging
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.products.models import Product, ProductImage, ProductWatchlistItem
+
+logger = logging.getLogger(__name__)
+
+# Column reads that replace per-row Count/Avg annotations in list and detail
+# querysets. Ratings come from ProductRatingAggregate (a one-to-one join).
+ENGAGEMENT_ANNOTATIONS = {
+    "avg_rating_db": F("rating_aggregate__average_rating"),
+    "ratings_count_db": Coalesce(F("rating_aggregate__total_count"), 0),
+    "verified_ratings_count": Coalesce(F("rating_aggregate__verified_count"), 0),
+    "watchers_count": F("cached_watchers_count"),
+}
+
+RATING_DISTRIBUTION_ANNOTATIONS = {
+    f"{name}_star_count": Coalesce(F(f"rating_aggregate__stars_{stars}_count"), 0)
+    for stars, name in ((5, "five"), (4, "four"), (3, "three"), (2, "two"), (1, "one"))
+}
+
+
+class ProductCounterService:
+    """
+    Maintains the denormalized ``cached_watchers_count`` and
+    ``cached_images_count`` columns on Product.
+
+    Single-row writes are counted by the signals in
+    ``apps.products.signals.counters`` inside the writing transaction; bulk
+    inserts (which skip signals) call ``adjust_many`` directly. The
+    ``reconcile_product_counters`` task repairs any drift.
+    """
+
+    # counter column -> (related model, FK field pointing at Product)
+    COUNTERS = {
+        "cached_watchers_count": (ProductWatchlistItem, "product"),
+        "cached_images_count": (ProductImage, "product"),
+    }
+
+    @classmethod
+    def adjust(cls, product_id, field: str, delta: int):
+        """Atomically add ``delta`` to one product's counter, never below zero"""
+        cls.adjust_many({product_id: delta}, field)
+
+    @classmethod
+    def adjust_many(cls, deltas: Dict, field: str):
+        """Apply per-product deltas, one UPDATE per distinct delta value"""
+        if field not in cls.COUNTERS:
+            raise ValueError(f"Unknown product counter: {field}")
+
+        by_delta = {}
+        for product_id, delta in deltas.items():
+            if delta:
+                by_delta.setdefault(delta, []).append(product_id)
+
+        for delta, product_ids in by_delta.items():
+            Product.objects.filter(id__in=product_ids).update(
+                **{field: Greatest(F(field) + delta, Value(0))}
+            )
+
+    @classmethod
+    def reconcile(
+        cls, product_ids: Optional[Iterable] = None, batch_size: int = 1000
+    ) -> int:
+        """
+        Recompute counters from the source tables and fix rows that drifted.
+        Returns the number of products corrected.
+        """
+        queryset = Product.objects.all()
+        if product_ids is not None:
+            queryset = queryset.filter(id__in=list(product_ids))
+
+        annotations = {}
+        mismatch = None
+        for field, (model, fk) in cls.COUNTERS.items():
+            actual = f"actual_{field}"
+            annotations[actual] = Coalesce(
+                Subquery(
+                    model.objects.filter(**{fk: OuterRef("pk")})
+                    .order_by()
+                    .values(fk)
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                0,
+            )
+            condition = ~Q(**{field: F(actual)})
+            mismatch = condition if mismatch is None else mismatch | condition
+
+        drifted = (
+            queryset.annotate(**annotations)
+            .filter(mismatch)
+            .values("id", *annotations.keys())
+        )
+
+        fixed = 0
+        batch = []
+        for row in drifted.iterator(chunk_size=batch_size):
+            batch.append(
+                Product(
+                    id=row["id"],
+                    **{field: row[f"actual_{field}"] for field in cls.COUNTERS},
+                )
+            )
+            if len(batch) >= batch_size:
+                fixed += cls._save_batch(batch)
+                batch = []
+        if batch:
+            fixed += cls._save_batch(batch)
+
+        if fixed:
+            logger.warning(f"Reconciled engagement counters for {fixed} products")
+        return fixed
+
+    @classmethod
+    def _save_batch(cls, products):
+        with transaction.atomic():
+            Product.objects.bulk_update(products, list(cls.COUNTERS))
+        return len(products)
@@ -1,4 +1,5 @@
 import logging
+from collections import defaultdict
 from decimal import Decimal
 from typing import List, Dict, Tuple
 from django.db import transaction
@@ -138,7 +139,8 @@ class InventoryService:
         notes: str = "",
     ):
         """
-        Reserve stock on a specific variant, then create an escrow transaction.
+        Create an escrow transaction for a variant and reserve its stock with a
+        single conditional UPDATE in the same transaction.
         Uses the variant's final_price (which includes option adjustments) unless
         a negotiated_price is provided.
         """
@@ -155,7 +157,8 @@ class InventoryService:
         if not seller:
             raise ValidationError(f"No seller found for variant {variant.sku}")
 
-        # 1) Inventory check on the variant level
+        # 1) Inventory check on the variant level (a cheap early exit; the
+        # reservation below re-checks atomically)
         if not variant.is_active:
             raise ValidationError(f"Variant {variant.sku} is not active")
 
@@ -166,7 +169,7 @@ class InventoryService:
             )
 
         # 2) Calculate the unit price
-        # Use the variant's final_price property which includes option adjustments
+        # The variant's stored final_price already includes option adjustments
         base_unit_price = variant.final_price
 
         if base_unit_price is None:
@@ -187,38 +190,11 @@ class InventoryService:
         # 4) Compute total amount
         total_amount = unit_price * quantity
 
-        # 5) Record previous values BEFORE making any changes
-        prev_total = variant.total_inventory
-        prev_available = variant.available_inventory
-        prev_in_escrow = variant.in_escrow_inventory
-
-        # 6) Reserve the stock using the variant's method (this adds to in_escrow_inventory)
-        if not variant.reserve_stock(quantity):
-            raise ValidationError(f"Failed to reserve stock for variant {variant.sku}")
-
-        # 7) Complete the inventory movement by reducing available_inventory
-        variant.available_inventory -= quantity  # Remove from available
-        variant.save(update_fields=["available_inventory"])
-
-        try:
-            # 8) Record the inventory movement with correct field names
-            InventoryTransaction.objects.create(
-                product=variant.product,
-                variant=variant,
-                transaction_type="ESCROW",
-                quantity=quantity,
-                previous_total=prev_total,
-                previous_available=prev_available,
-                previous_in_escrow=prev_in_escrow,
-                new_total=variant.total_inventory,
-                new_available=variant.available_inventory,
-                new_in_escrow=variant.in_escrow_inventory,
-                created_by=user,
-                notes=f"Reserved for escrow: {notes}",
-            )
-
-            # 7) Create the escrow transaction
-            escrow_tx = EscrowTransaction.objects.create(
+        # 5) Create the escrow rows, then reserve the stock with one conditional
+        # UPDATE as the last write to the variant, so a hot variant's row lock
+        # is held for as little of the transaction as possible
+        with transaction.atomic():
+            escrow_tx = EscrowTransaction(
                 product=variant.product,
                 variant=variant,
                 buyer=buyer,
@@ -233,8 +209,10 @@ class InventoryService:
                 tracking_id=generate_tracking_id(variant, buyer, seller),
                 notes=notes,
             )
+            # Stock is reserved below; the post_save signal must not do it again
+            escrow_tx._stock_reserved = True
+            escrow_tx.save()
 
-            # 8) History record
             TransactionHistory.objects.create(
                 transaction=escrow_tx,
                 new_status="initiated",
@@ -245,20 +223,40 @@ class InventoryService:
                 ),
                 created_by=user,
             )
-            logger.info(
-                f"Escrow transaction created: {escrow_tx.id} for {quantity}× {variant.sku}"
-            )
 
-            return variant, escrow_tx, total_amount
+            # 6) Check and reserve in one statement; rolls the escrow back if
+            # another buyer took the stock first
+            stock = ProductVariant.objects.reserve(
+                variant.pk, quantity, consume_available=True
+            )
+            if stock is None:
+                raise ValidationError(
+                    f"Insufficient stock for variant {variant.sku}. "
+                    f"Requested: {quantity}"
+                )
+            variant._set_stock(stock)
 
-        except Exception as e:
-            # If any database operation fails, release the reserved stock
-            # This will be called even if the outer transaction rolls back
-            variant.release_stock(quantity)
-            logger.error(
-                f"Failed to create escrow transaction for {variant.sku}: {str(e)}"
+            # 7) Record the inventory movement
+            InventoryTransaction.objects.create(
+                product=variant.product,
+                variant=variant,
+                transaction_type="ESCROW",
+                quantity=quantity,
+                previous_total=stock["total_inventory"],
+                previous_available=stock["available_inventory"] + quantity,
+                previous_in_escrow=stock["in_escrow_inventory"] - quantity,
+                new_total=stock["total_inventory"],
+                new_available=stock["available_inventory"],
+                new_in_escrow=stock["in_escrow_inventory"],
+                created_by=user,
+                notes=f"Reserved for escrow: {notes}",
             )
-            raise e
+
+        logger.info(
+            f"Escrow transaction created: {escrow_tx.id} for {quantity}× {variant.sku}"
+        )
+
+        return variant, escrow_tx, total_amount
 
     @staticmethod
     @transaction.atomic
@@ -277,77 +275,89 @@ class InventoryService:
         """
         Handle multiple variant purchases in a single escrow transaction.
 
+        All or nothing: variants are loaded and priced from their stored
+        final_price in one query, then the whole cart is checked and reserved by a
+        single ``ProductVariant.objects.reserve_many`` statement, and the
+        inventory movements are written with one bulk insert. The reservation
+        drops the detail and variant caches of every product in the cart
+        after commit, once per product.
+
         Args:
             variant_orders: List of dicts with 'variant', 'quantity', and optional 'negotiated_price'
 
         Returns:
-            Tuple of (successful_orders, total_amount)
+            Tuple of (successful_orders, total_amount); each order carries its
+            'escrow_transaction'
         """
+        variants = ProductVariant.objects.select_related("product").in_bulk(
+            [order["variant"].pk for order in variant_orders]
+        )
+
         successful_orders = []
         total_amount = Decimal("0.00")
         failed_orders = []
+        quantities = defaultdict(int)
 
         # First pass: validate all variants and calculate total
         for order in variant_orders:
-            variant = order["variant"]
+            variant = variants.get(order["variant"].pk)
             quantity = order["quantity"]
             negotiated_price = order.get("negotiated_price")
 
-            try:
-                # Check availability
-                if not variant.is_active:
-                    failed_orders.append(
-                        {
-                            "variant": variant,
-                            "error": f"Variant {variant.sku} is not active",
-                        }
-                    )
-                    continue
-
-                if variant.available_quantity < quantity:
-                    failed_orders.append(
-                        {
-                            "variant": variant,
-                            "error": f"Insufficient stock for {variant.sku}",
-                        }
-                    )
-                    continue
-
-                # Calculate price
-                base_price = variant.final_price
-                if base_price is None:
-                    failed_orders.append(
-                        {"variant": variant, "error": f"No price set for {variant.sku}"}
-                    )
-                    continue
-
-                unit_price = (
-                    negotiated_price if negotiated_price is not None else base_price
+            if variant is None:
+                failed_orders.append(
+                    {"variant": order["variant"], "error": "Variant no longer exists"}
                 )
+                continue
 
-                if negotiated_price and negotiated_price > base_price:
-                    failed_orders.append(
-                        {
-                            "variant": variant,
-                            "error": f"Negotiated price exceeds list price for {variant.sku}",
-                        }
-                    )
-                    continue
-
-                order_total = unit_price * quantity
-                total_amount += order_total
+            if not variant.is_active:
+                failed_orders.append(
+                    {
+                        "variant": variant,
+                        "error": f"Variant {variant.sku} is not active",
+                    }
+                )
+                continue
 
-                successful_orders.append(
+            # Cheap early exit; reserve_many re-checks atomically
+            if variant.available_quantity < quantities[variant.pk] + quantity:
+                failed_orders.append(
                     {
                         "variant": variant,
-                        "quantity": quantity,
-                        "unit_price": unit_price,
-                        "order_total": order_total,
+                        "error": f"Insufficient stock for {variant.sku}",
                     }
                 )
+                continue
 
-            except Exception as e:
-                failed_orders.append({"variant": variant, "error": str(e)})
+            base_price = variant.final_price
+            if base_price is None:
+                failed_orders.append(
+                    {"variant": variant, "error": f"No price set for {variant.sku}"}
+                )
+                continue
+
+            if negotiated_price and negotiated_price > base_price:
+                failed_orders.append(
+                    {
+                        "variant": variant,
+                        "error": f"Negotiated price exceeds list price for {variant.sku}",
+                    }
+                )
+                continue
+
+            unit_price = negotiated_price if negotiated_price is not None else base_price
+            order_total = unit_price * quantity
+            total_amount += order_total
+            quantities[variant.pk] += quantity
+
+            successful_orders.append(
+                {
+                    "variant": variant,
+                    "quantity": quantity,
+                    "unit_price": unit_price,
+                    "order_total": order_total,
+                }
+            )
 
         # If any orders failed, raise an error with details
         if failed_orders:
@@ -358,58 +368,79 @@ class InventoryService:
                 f"Some variants could not be processed: {error_details}"
             )
 
-        # Second pass: reserve stock and create transactions
-        escrow_transactions = []
-        reserved_variants = []  # Keep track for rollback if needed
-
-        try:
-            for order in successful_orders:
-                variant = order["variant"]
-                quantity = order["quantity"]
-
-                # Reserve stock
-                if not variant.reserve_stock(quantity):
-                    raise ValidationError(f"Failed to reserve stock for {variant.sku}")
-
-                reserved_variants.append({"variant": variant, "quantity": quantity})
-
-                # Create escrow transaction for this variant
-                escrow_tx = EscrowTransaction.objects.create(
-                    product=variant.product,
-                    variant=variant,
-                    buyer=buyer,
-                    seller=seller or variant.product.seller,
-                    quantity=quantity,
-                    currency=currency,
-                    status="initiated",
-                    inspection_period_days=inspection_period_days,
-                    unit_price=order["unit_price"],
-                    total_amount=order["order_total"],
-                    shipping_address=shipping_address,
-                    tracking_id=generate_tracking_id(variant, buyer, seller),
-                    notes=f"Multi-variant order: {notes}",
-                )
-
-                escrow_transactions.append(escrow_tx)
-
-                # Create history record
-                TransactionHistory.objects.create(
-                    transaction=escrow_tx,
+        # Second pass: create the escrow transactions
+        for order in successful_orders:
+            variant = order["variant"]
+            order_seller = seller or variant.product.seller
+            escrow_tx = EscrowTransaction(
+                product=variant.product,
+                variant=variant,
+                buyer=buyer,
+                seller=order_seller,
+                quantity=order["quantity"],
+                currency=currency,
+                status="initiated",
+                inspection_period_days=inspection_period_days,
+                price=order["unit_price"],
+                total_amount=order["order_total"],
+                shipping_address=shipping_address,
+                tracking_id=generate_tracking_id(variant, buyer, order_seller),
+                notes=f"Multi-variant order: {notes}",
+            )
+            # Stock is reserved below for the whole cart
+            escrow_tx._stock_reserved = True
+            escrow_tx.save()
+            order["escrow_transaction"] = escrow_tx
+
+        TransactionHistory.objects.bulk_create(
+            [
+                TransactionHistory(
+                    transaction=order["escrow_transaction"],
                     new_status="initiated",
                     notes=(
-                        f"Multi-variant escrow: {quantity}× {variant.sku} "
-                        f"at {order['unit_price']} each"
+                        f"Multi-variant escrow: {order['quantity']}× "
+                        f"{order['variant'].sku} at {order['unit_price']} each"
                     ),
                     created_by=user,
                 )
+                for order in successful_orders
+            ]
+        )
 
-            return successful_orders, total_amount
+        # Third pass: reserve the whole cart in one statement, rows locked in id
+        # order; any short line rolls the escrow transactions back
+        stock, short = ProductVariant.objects.reserve_many(
+            quantities, consume_available=True
+        )
+        if short:
+            skus = ", ".join(variants[variant_id].sku for variant_id in short)
+            raise ValidationError(f"Insufficient stock for: {skus}")
+
+        InventoryTransaction.objects.bulk_create(
+            [
+                InventoryTransaction(
+                    product=variants[variant_id].product,
+                    variant=variants[variant_id],
+                    transaction_type="ESCROW",
+                    quantity=quantity,
+                    previous_total=stock[variant_id]["total_inventory"],
+                    previous_available=stock[variant_id]["available_inventory"]
+                    + quantity,
+                    previous_in_escrow=stock[variant_id]["in_escrow_inventory"]
+                    - quantity,
+                    new_total=stock[variant_id]["total_inventory"],
+                    new_available=stock[variant_id]["available_inventory"],
+                    new_in_escrow=stock[variant_id]["in_escrow_inventory"],
+                    created_by=user,
+                    notes=f"Reserved for multi-variant escrow: {notes}",
+                )
+                for variant_id, quantity in quantities.items()
+            ]
+        )
+        for variant_id, values in stock.items():
+            variants[variant_id]._set_stock(values)
 
-        except Exception as e:
-            # Rollback: release all reserved stock
-            for reserved in reserved_variants:
-                reserved["variant"].release_stock(reserved["quantity"])
-            raise e
+        return successful_orders, total_amount
 
     @staticmethod
     @transaction.atomic
@@ -1,7 +1,10 @@
 import logging
+import time
+from datetime import timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
-from django.db import transaction, models
+from django.core.cache import cache
+from django.db import connection, transaction, models
 from django.utils import timezone
 from django.conf import settings
 
@@ -13,6 +16,7 @@ from apps.products.models import (
 )
 from apps.products.models import Product
 from apps.products.models import ProductVariant
+from apps.products.services.negotiation_stats_service import NegotiationStatsService
 from apps.users.models import CustomUser as User
 
 logger = logging.getLogger("negotiation_performance")
@@ -149,7 +153,9 @@ class NegotiationService:
             }
         try:
             with transaction.atomic():
+                before = None
                 if existing_negotiation:
+                    before = NegotiationStatsService.snapshot(existing_negotiation)
                     # Update existing negotiation
                     existing_negotiation.offered_price = offered_price
                     existing_negotiation.status = "pending"
@@ -180,6 +186,9 @@ class NegotiationService:
                     price=offered_price,
                     notes=notes or f"Buyer offered ${offered_price} for the product",
                 )
+                NegotiationStatsService.record_change(
+                    before, NegotiationStatsService.snapshot(negotiation), offers=1
+                )
 
                 # Invalidate cache
                 CacheManager.invalidate(
@@ -246,6 +255,8 @@ class NegotiationService:
             with transaction.atomic():
                 previous_offer = negotiation.offered_price
                 user_role = "seller" if is_seller else "buyer"
+                before = NegotiationStatsService.snapshot(negotiation)
+                last_activity = negotiation.updated_at
 
                 if response_type == "accept":
                     negotiation.status = "accepted"
@@ -309,6 +320,15 @@ class NegotiationService:
                         f"Counter offer of ${counter_price} submitted successfully"
                     )
 
+                NegotiationStatsService.record_change(
+                    before,
+                    NegotiationStatsService.snapshot(negotiation),
+                    offers=1 if response_type == "counter" else 0,
+                    response_seconds=NegotiationStatsService.response_seconds(
+                        last_activity
+                    ),
+                )
+
                 # Invalidate cache
                 CacheManager.invalidate("negotiation", id=negotiation.id)
                 CacheManager.invalidate("product", id=negotiation.product.id)
@@ -374,65 +394,26 @@ class NegotiationAnalyticsService:
     @staticmethod
     def get_negotiation_stats(product: Product) -> Dict[str, any]:
         """Get negotiation statistics for a product"""
-        cache_key = CacheKeyManager.make_key(
-            "negotiation", "stats", product_id=product.id
-        )
-
-        try:
-            from django.core.cache import cache
-
-            cached_stats = cache.get(cache_key)
-            if cached_stats:
-                return cached_stats
-        except Exception:
-            pass
-
         start_time = timezone.now()
 
-        negotiations = PriceNegotiation.objects.filter(product=product)
-
-        stats = {
-            "total_negotiations": negotiations.count(),
-            "accepted_negotiations": negotiations.filter(status="accepted").count(),
-            "rejected_negotiations": negotiations.filter(status="rejected").count(),
-            "pending_negotiations": negotiations.filter(
-                status__in=["pending", "countered"]
-            ).count(),
-            "average_offered_price": 0,
-            "average_final_price": 0,
-            "success_rate": 0,
-        }
-
-        if stats["total_negotiations"] > 0:
-            # Calculate averages
-            offered_prices = [float(n.offered_price) for n in negotiations]
-            stats["average_offered_price"] = sum(offered_prices) / len(offered_prices)
-
-            accepted_negotiations = negotiations.filter(
-                status="accepted", final_price__isnull=False
-            )
-            if accepted_negotiations.exists():
-                final_prices = [float(n.final_price) for n in accepted_negotiations]
-                stats["average_final_price"] = sum(final_prices) / len(final_prices)
-
-            # Calculate success rate
-            stats["success_rate"] = (
-                stats["accepted_negotiations"] / stats["total_negotiations"]
-            ) * 100
-
-        # Cache for 1 hour
-        try:
-            from django.core.cache import cache
-
-            cache.set(cache_key, stats, 3600)
-        except Exception:
-            pass
+        stats = NegotiationStatsService.as_dict(
+            NegotiationStatsService.get_product_stats(product.id)
+        )
 
         duration = (timezone.now() - start_time).total_seconds() * 1000
-        logger.info(f"Negotiation stats calculated in {duration:.2f}ms")
+        logger.info(f"Negotiation stats read in {duration:.2f}ms")
 
         return stats
 
+    @staticmethod
+    def get_user_negotiation_stats(user: User) -> Dict[str, Dict[str, any]]:
+        """Get a user's negotiation statistics as buyer and as seller"""
+        rows = NegotiationStatsService.get_user_stats(user.id)
+        return {
+            f"as_{role}": NegotiationStatsService.as_dict(row)
+            for role, row in rows.items()
+        }
+
     @staticmethod
     def get_user_negotiation_history(
         user: User, limit: int = 20
@@ -545,3 +526,137 @@ class NegotiationNotificationService:
         NotificationService.send_notification(
             negotiation.seller, "negotiation_expired", context
         )
+
+    @staticmethod
+    def notify_negotiations_expired(rows: List[Dict], titles: Dict) -> int:
+        """Notify both parties of a batch of expired negotiations at once."""
+        entries = []
+        for row in rows:
+            context = {
+                "negotiation_id": str(row["id"]),
+                "product_name": titles.get(row["product_id"], ""),
+            }
+            entries.append((row["buyer_id"], context))
+            entries.append((row["seller_id"], context))
+        return NotificationService.bulk_notify_each("negotiation_expired", entries)
+
+
+class NegotiationExpiryService:
+    """
+    Set-based expiry of stale negotiations.
+
+    Each batch is one transaction: a single ``UPDATE ... RETURNING`` claims up
+    to ``batch_size`` stale rows, skipping any a live response has locked,
+    then the batch gets one history insert, one notification insert and,
+    after commit, one cache ``delete_many``.
+    """
+
+    EXPIRABLE_STATUSES = ("pending", "countered")
+    EXPIRED_STATUS = "rejected"
+    RETURNING = ("id", "product_id", "buyer_id", "seller_id")
+
+    @classmethod
+    def expire_stale(
+        cls, expiry_hours: int, batch_size: int = 500, max_batches: int = None
+    ) -> Dict:
+        """Expire negotiations idle for ``expiry_hours`` and return metrics"""
+        threshold = timezone.now() - timedelta(hours=expiry_hours)
+        notes = f"Negotiation expired after {expiry_hours} hours of inactivity"
+        expired = batches = 0
+        start = time.monotonic()
+
+        while max_batches is None or batches < max_batches:
+            with transaction.atomic():
+                rows = cls._claim_batch(threshold, batch_size)
+                if rows:
+                    cls._record_batch(rows, notes)
+            if not rows:
+                break
+            cls._invalidate_caches(rows)
+            expired += len(rows)
+            batches += 1
+            if len(rows) < batch_size:
+                break
+
+        duration = time.monotonic() - start
+        return {
+            "expired": expired,
+            "batches": batches,
+            "duration": duration,
+            "rows_per_second": expired / duration if duration else 0.0,
+        }
+
+    @classmethod
+    def _claim_batch(cls, threshold, batch_size: int) -> List[Dict]:
+        """Flip one batch of stale negotiations to expired; return their keys"""
+        now = timezone.now()
+        if connection.vendor == "postgresql":
+            table = PriceNegotiation._meta.db_table
+            columns = ", ".join(cls.RETURNING)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    UPDATE {table} SET status = %s, updated_at = %s
+                    WHERE id IN (
+                        SELECT id FROM {table}
+                        WHERE status = ANY(%s) AND updated_at < %s
+                        ORDER BY updated_at
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING {columns}
+                    """,
+                    [
+                        cls.EXPIRED_STATUS,
+                        now,
+                        list(cls.EXPIRABLE_STATUSES),
+                        threshold,
+                        batch_size,
+                    ],
+                )
+                return [dict(zip(cls.RETURNING, row)) for row in cursor.fetchall()]
+
+        rows = list(
+            PriceNegotiation.objects.select_for_update()
+            .filter(status__in=cls.EXPIRABLE_STATUSES, updated_at__lt=threshold)
+            .order_by("updated_at")
+            .values(*cls.RETURNING)[:batch_size]
+        )
+        PriceNegotiation.objects.filter(id__in=[row["id"] for row in rows]).update(
+            status=cls.EXPIRED_STATUS, updated_at=now
+        )
+        return rows
+
+    @staticmethod
+    def _record_batch(rows: List[Dict], notes: str):
+        NegotiationHistory.objects.bulk_create(
+            [
+                NegotiationHistory(
+                    negotiation_id=row["id"],
+                    action="price_rejected",
+                    user_id=row["seller_id"],  # System action
+                    notes=notes,
+                )
+                for row in rows
+            ]
+        )
+        titles = dict(
+            Product.objects.filter(
+                id__in={row["product_id"] for row in rows}
+            ).values_list("id", "title")
+        )
+        NegotiationNotificationService.notify_negotiations_expired(rows, titles)
+        NegotiationStatsService.record_expired(rows)
+
+    @staticmethod
+    def _invalidate_caches(rows: List[Dict]):
+        keys = set()
+        for row in rows:
+            keys.add(CacheKeyManager.make_key("negotiation", "detail", id=row["id"]))
+            for user_id in (row["buyer_id"], row["seller_id"]):
+                keys.add(
+                    CacheKeyManager.make_key(
+                        "negotiation", "active_count", user_id=user_id
+                    )
+                )
+        cache.delete_many(list(keys))
@@ -0,0 +1,292 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.products.models import (
+    NegotiationHistory,
+    PriceNegotiation,
+    ProductNegotiationStats,
+    UserNegotiationStats,
+)
+
+logger = logging.getLogger("negotiation_performance")
+
+# PriceNegotiation fields that determine a negotiation's stats contribution
+STATS_SOURCE_FIELDS = (
+    "product_id",
+    "buyer_id",
+    "seller_id",
+    "status",
+    "original_price",
+    "offered_price",
+    "final_price",
+)
+OPEN_STATUSES = ("pending", "countered")
+OFFER_ACTIONS = ("price_offered", "price_countered")
+ROLES = ("buyer", "seller")
+
+
+class NegotiationStatsService:
+    """
+    Maintains ProductNegotiationStats / UserNegotiationStats rows.
+
+    Every negotiation contributes to its product's row and to the buyer and
+    seller rows of its two parties. When a negotiation changes, its old
+    contribution is subtracted and the new one added with ``F()`` updates;
+    offers and responses are added as events. A missing row is rebuilt from
+    the negotiation tables on first write or read, and
+    ``backfill_negotiation_stats`` rebuilds everything.
+
+    A response is an accept, counter or priced reject; expiry and
+    cancellation record unpriced rejects and only move the status counts.
+    """
+
+    @staticmethod
+    def snapshot(negotiation: PriceNegotiation) -> Dict:
+        """Extract the stats-relevant values of a negotiation instance"""
+        return {field: getattr(negotiation, field) for field in STATS_SOURCE_FIELDS}
+
+    @staticmethod
+    def _contribution(values: Optional[Dict], sign: int) -> Dict:
+        if not values:
+            return {}
+
+        status = values["status"]
+        final_price = values["final_price"]
+        priced = status == "accepted" and final_price is not None
+        contribution = {
+            "total_negotiations": sign,
+            "open_negotiations": sign if status in OPEN_STATUSES else 0,
+            "accepted_negotiations": sign if status == "accepted" else 0,
+            "rejected_negotiations": sign if status == "rejected" else 0,
+            "offered_price_sum": sign * Decimal(str(values["offered_price"] or 0)),
+            "final_price_sum": sign * Decimal(str(final_price)) if priced else 0,
+            "final_price_count": sign if priced else 0,
+            "discount_percent_sum": 0,
+        }
+        if priced and values["original_price"]:
+            original = Decimal(str(values["original_price"]))
+            discount = (original - Decimal(str(final_price))) / original * 100
+            contribution["discount_percent_sum"] = sign * discount.quantize(
+                Decimal("0.01")
+            )
+        return contribution
+
+    @staticmethod
+    def _targets(values: Dict) -> List:
+        """(model, lookup) of every stats row a negotiation contributes to"""
+        return [
+            (ProductNegotiationStats, {"product_id": values["product_id"]}),
+            (UserNegotiationStats, {"user_id": values["buyer_id"], "role": "buyer"}),
+            (UserNegotiationStats, {"user_id": values["seller_id"], "role": "seller"}),
+        ]
+
+    @classmethod
+    def _apply(cls, model, lookup: Dict, deltas: Dict):
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updates = {field: F(field) + delta for field, delta in deltas.items()}
+        if not model.objects.filter(**lookup).update(**updates):
+            # The change is already in this transaction, so a rebuild counts it
+            cls._rebuild_rows(model, [lookup])
+
+    @classmethod
+    @transaction.atomic
+    def record_change(
+        cls,
+        before: Optional[Dict],
+        after: Dict,
+        offers: int = 0,
+        response_seconds: Optional[int] = None,
+    ):
+        """
+        Move a negotiation's contribution from ``before`` to ``after`` and
+        add ``offers`` new offers and, if given, one response.
+        """
+        deltas = defaultdict(int)
+        for values, sign in ((before, -1), (after, 1)):
+            for field, delta in cls._contribution(values, sign).items():
+                deltas[field] += delta
+        deltas["offers_count"] += offers
+        if response_seconds is not None:
+            deltas["response_count"] += 1
+            deltas["response_seconds_sum"] += max(int(response_seconds), 0)
+
+        for model, lookup in cls._targets(after):
+            cls._apply(model, lookup, deltas)
+
+    @classmethod
+    @transaction.atomic
+    def record_expired(cls, rows: Iterable[Dict]):
+        """Move a batch of expired negotiations from open to rejected"""
+        counts = defaultdict(int)
+        for row in rows:
+            for model, lookup in cls._targets(row):
+                counts[(model, tuple(sorted(lookup.items())))] += 1
+
+        for (model, lookup), count in counts.items():
+            cls._apply(
+                model,
+                dict(lookup),
+                {"open_negotiations": -count, "rejected_negotiations": count},
+            )
+
+    @staticmethod
+    def response_seconds(last_activity) -> Optional[int]:
+        """Seconds since the negotiation's previous action"""
+        if last_activity is None:
+            return None
+        return int((timezone.now() - last_activity).total_seconds())
+
+    @classmethod
+    def get_product_stats(cls, product_id) -> ProductNegotiationStats:
+        lookup = {"product_id": product_id}
+        stats = ProductNegotiationStats.objects.filter(**lookup).first()
+        return stats or cls._rebuild_rows(ProductNegotiationStats, [lookup])[0]
+
+    @classmethod
+    def get_user_stats(cls, user_id) -> Dict[str, UserNegotiationStats]:
+        """The user's stats rows keyed by role"""
+        queryset = UserNegotiationStats.objects.filter(user_id=user_id)
+        rows = {row.role: row for row in queryset}
+        missing = [{"user_id": user_id, "role": role} for role in ROLES]
+        missing = [lookup for lookup in missing if lookup["role"] not in rows]
+        if missing:
+            for row in cls._rebuild_rows(UserNegotiationStats, missing):
+                rows[row.role] = row
+        return rows
+
+    @staticmethod
+    def as_dict(stats) -> Dict[str, float]:
+        """Analytics payload for a stats row"""
+        total = stats.total_negotiations
+        decided = stats.accepted_negotiations + stats.rejected_negotiations
+
+        def average(value, count):
+            return float(value) / count if count else 0
+
+        return {
+            "total_negotiations": total,
+            "accepted_negotiations": stats.accepted_negotiations,
+            "rejected_negotiations": stats.rejected_negotiations,
+            "pending_negotiations": stats.open_negotiations,
+            "offers_count": stats.offers_count,
+            "average_offered_price": average(stats.offered_price_sum, total),
+            "average_final_price": average(
+                stats.final_price_sum, stats.final_price_count
+            ),
+            "average_discount": average(
+                stats.discount_percent_sum, stats.final_price_count
+            ),
+            "success_rate": average(stats.accepted_negotiations * 100, total),
+            "acceptance_rate": average(stats.accepted_negotiations * 100, decided),
+            "average_response_seconds": average(
+                stats.response_seconds_sum, stats.response_count
+            ),
+        }
+
+    @classmethod
+    def _rebuild_rows(cls, model, lookups: List[Dict]) -> List:
+        """Recompute and store the rows for ``lookups`` of one model"""
+        if model is ProductNegotiationStats:
+            negotiations = PriceNegotiation.objects.filter(
+                product_id__in=[lookup["product_id"] for lookup in lookups]
+            )
+        else:
+            user_ids = [lookup["user_id"] for lookup in lookups]
+            negotiations = PriceNegotiation.objects.filter(
+                buyer_id__in=user_ids
+            ) | PriceNegotiation.objects.filter(seller_id__in=user_ids)
+
+        wanted = {tuple(sorted(lookup.items())) for lookup in lookups}
+        totals = cls._compute(
+            negotiations, lambda key: key[0] is model and key[1] in wanted
+        )
+        rows = [
+            model(**dict(lookup), **totals.get((model, lookup), {}))
+            for lookup in wanted
+        ]
+        for lookup in wanted:
+            model.objects.filter(**dict(lookup)).delete()
+        return model.objects.bulk_create(rows, ignore_conflicts=True)
+
+    @classmethod
+    def _compute(cls, negotiations, include, batch_size: int = 1000) -> Dict:
+        """
+        Totals per (model, lookup) for ``negotiations``, limited to the keys
+        ``include`` accepts.
+        """
+        totals = defaultdict(lambda: defaultdict(int))
+        targets_by_negotiation = {}
+
+        for values in negotiations.values("id", *STATS_SOURCE_FIELDS).iterator(
+            chunk_size=batch_size
+        ):
+            keys = [
+                (model, tuple(sorted(lookup.items())))
+                for model, lookup in cls._targets(values)
+            ]
+            keys = [key for key in keys if include(key)]
+            targets_by_negotiation[values["id"]] = keys
+            for field, delta in cls._contribution(values, 1).items():
+                for key in keys:
+                    totals[key][field] += delta
+
+        history = (
+            NegotiationHistory.objects.filter(negotiation__in=negotiations)
+            .order_by("negotiation_id", "timestamp")
+            .values("negotiation_id", "action", "price", "timestamp")
+        )
+        previous = None
+        for entry in history.iterator(chunk_size=batch_size):
+            keys = targets_by_negotiation.get(entry["negotiation_id"], [])
+            same_negotiation = (
+                previous is not None
+                and previous["negotiation_id"] == entry["negotiation_id"]
+            )
+            is_response = entry["action"] in ("price_accepted", "price_countered") or (
+                entry["action"] == "price_rejected" and entry["price"] is not None
+            )
+            for key in keys:
+                if entry["action"] in OFFER_ACTIONS:
+                    totals[key]["offers_count"] += 1
+                if is_response and same_negotiation:
+                    elapsed = entry["timestamp"] - previous["timestamp"]
+                    totals[key]["response_count"] += 1
+                    totals[key]["response_seconds_sum"] += max(
+                        int(elapsed.total_seconds()), 0
+                    )
+            previous = entry
+
+        return {key: dict(fields) for key, fields in totals.items()}
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, batch_size: int = 1000) -> int:
+        """
+        Recompute every stats row from the negotiation tables. Returns the
+        number of rows written.
+        """
+        totals = cls._compute(
+            PriceNegotiation.objects.all(), lambda key: True, batch_size
+        )
+        ProductNegotiationStats.objects.all().delete()
+        UserNegotiationStats.objects.all().delete()
+        for model in (ProductNegotiationStats, UserNegotiationStats):
+            model.objects.bulk_create(
+                [
+                    model(**dict(lookup), **fields)
+                    for (row_model, lookup), fields in totals.items()
+                    if row_model is model
+                ],
+                batch_size=batch_size,
+            )
+
+        logger.info(f"Rebuilt {len(totals)} negotiation stats rows")
+        return len(totals)
@@ -1,5 +1,5 @@
 import logging
-from django.db.models import Prefetch, Avg, Count, Q, Exists, OuterRef, Value
+from django.db.models import Prefetch, Q, Exists, OuterRef, Value
 from apps.products.models import Product
 from apps.products.models import ProductMeta
 from apps.products.models import ProductRating
@@ -13,6 +13,10 @@ from apps.products.models import (
 )
 from apps.products.models import ProductWatchlistItem
 from apps.transactions.models import EscrowTransaction
+from apps.products.services.counter_service import (
+    ENGAGEMENT_ANNOTATIONS,
+    RATING_DISTRIBUTION_ANNOTATIONS,
+)
 from django.contrib.auth import get_user_model
 
 from django.core.cache import cache
@@ -188,15 +192,8 @@ class ProductDetailService:
 
         # Your existing annotations
         annotations = {
-            "avg_rating_db": Avg(
-                "ratings__rating", filter=Q(ratings__is_approved=True)
-            ),
-            "ratings_count_db": Count("ratings", filter=Q(ratings__is_approved=True)),
-            "verified_ratings_count": Count(
-                "ratings",
-                filter=Q(ratings__is_approved=True, ratings__is_verified_purchase=True),
-            ),
-            "watchers_count": Count("watchers", distinct=True),
+            **ENGAGEMENT_ANNOTATIONS,
+            **RATING_DISTRIBUTION_ANNOTATIONS,
         }
 
         if request.user.is_authenticated:
@@ -220,11 +217,6 @@ class ProductDetailService:
             .exclude(id=product.id)
             .select_related("brand", "category", "seller")
             .prefetch_related("images", "rating_aggregate")
-            .annotate(
-                avg_rating_db=Avg(
-                    "ratings__rating", filter=Q(ratings__is_approved=True)
-                ),
-                ratings_count_db=Count("ratings", filter=Q(ratings__is_approved=True)),
-            )
+            .annotate(**ENGAGEMENT_ANNOTATIONS)
             .order_by("-created_at")[:10]
         )
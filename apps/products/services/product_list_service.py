@@ -1,4 +1,4 @@
-from django.db.models import Avg, Count, Q, F, Prefetch
+from django.db.models import Avg, Q, F, Prefetch
 
 # from django.contrib.auth import get_user_model
 from django.core.cache import cache
@@ -13,6 +13,7 @@ from apps.core.utils.cache_manager import CacheManager
 # from apps.products.models import Breadcrumb
 
 from apps.products.utils.cache_service import ProductCacheVersionManager
+from apps.products.services.counter_service import ENGAGEMENT_ANNOTATIONS
 from apps.products.models import ProductImage
 from apps.products.models import ProductRating
 
@@ -74,6 +75,8 @@ class ProductListService:
             "page_size": request.GET.get("page_size", ""),
             "search": request.GET.get("search", ""),
             "ordering": request.GET.get("ordering", ""),
+            "pagination": request.GET.get("pagination", ""),
+            "cursor": request.GET.get("cursor", ""),
         }
 
         filter_params = [
@@ -141,6 +144,7 @@ class ProductListService:
             "seller",
             "seller__profile",
             "meta",
+            "rating_aggregate",
         )
 
         # Optimized prefetches with custom to_attr names
@@ -174,13 +178,8 @@ class ProductListService:
             ratings_prefetch,
             "variants",  # Add if needed
         ).annotate(
-            avg_rating_db=Avg("ratings__rating", filter=Q(ratings__is_approved=True)),
-            ratings_count_db=Count("ratings", filter=Q(ratings__is_approved=True)),
-            verified_ratings_count=Count(
-                "ratings",
-                filter=Q(ratings__is_approved=True, ratings__is_verified_purchase=True),
-            ),
-            watchers_count=Count("watchers", distinct=True),
+            # Precomputed columns: no aggregate joins fanning out the rows
+            **ENGAGEMENT_ANNOTATIONS,
             total_views=F("meta__views_count"),
         )
 
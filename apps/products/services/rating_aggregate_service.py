@@ -0,0 +1,288 @@
+import logging
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, FloatField, Max, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, NullIf
+from django_redis import get_redis_connection
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.models import Product, ProductRating, ProductRatingAggregate
+
+logger = logging.getLogger(__name__)
+
+STAR_FIELDS = {stars: f"stars_{stars}_count" for stars in range(1, 6)}
+
+# Fields owned by the aggregate maintenance (compared by the verifier)
+AGGREGATE_FIELDS = (
+    "average_rating",
+    "total_count",
+    "rating_sum",
+    "verified_count",
+    *STAR_FIELDS.values(),
+    "has_reviews",
+    "last_rating_date",
+)
+
+
+class RatingAggregateService:
+    """
+    Keeps ProductRatingAggregate rows in step with approved ratings.
+
+    Rating writes apply O(1) deltas (count, sum, star bucket, verified) to
+    the aggregate row inside the writing transaction. Changes a delta cannot
+    express cheaply (moderation, deletes, a review losing its text) put the
+    product id in a Redis dirty set instead, and a periodic task rebuilds
+    those rows in bulk. ``verify_rating_aggregates`` diffs stored rows
+    against full recomputes.
+    """
+
+    DIRTY_BATCH_SIZE = 500
+
+    @staticmethod
+    def snapshot(rating: Optional[ProductRating]) -> Optional[Dict]:
+        """Extract the aggregate-relevant values of a rating, or None"""
+        if rating is None:
+            return None
+        return {
+            "rating": rating.rating,
+            "is_verified_purchase": rating.is_verified_purchase,
+            "is_approved": rating.is_approved,
+            "has_review": bool(rating.review),
+            "created_at": rating.created_at,
+        }
+
+    @staticmethod
+    def _contribution(values: Optional[Dict]) -> Dict[str, int]:
+        if not values or not values["is_approved"]:
+            return {}
+        contribution = {
+            "total_count": 1,
+            "rating_sum": values["rating"],
+            STAR_FIELDS[values["rating"]]: 1,
+        }
+        if values["is_verified_purchase"]:
+            contribution["verified_count"] = 1
+        return contribution
+
+    @classmethod
+    def apply_change(cls, product_id, before: Optional[Dict], after: Optional[Dict]):
+        """
+        Move one rating's contribution from ``before`` to ``after`` (either
+        may be None). Must run in the transaction that wrote the rating.
+        """
+        if before == after:
+            return
+
+        deltas = {}
+        for field, value in cls._contribution(after).items():
+            deltas[field] = deltas.get(field, 0) + value
+        for field, value in cls._contribution(before).items():
+            deltas[field] = deltas.get(field, 0) - value
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+
+        was_counted = bool(before and before["is_approved"])
+        is_counted = bool(after and after["is_approved"])
+        # Losing a rating or a review may change last_rating_date/has_reviews,
+        # which deltas cannot undo; let the dirty-set worker recompute.
+        if was_counted and (
+            not is_counted or (before["has_review"] and not after["has_review"])
+        ):
+            cls.mark_dirty([product_id])
+
+        if not deltas and not is_counted:
+            return
+
+        aggregate, created = ProductRatingAggregate.objects.get_or_create(
+            product_id=product_id
+        )
+        if created:
+            # A fresh row has no history to add to; the rating is already
+            # written in this transaction, so a full recompute is exact.
+            cls.recompute([product_id])
+            return
+
+        updates = {
+            field: Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+        }
+        new_count = Greatest(F("total_count") + deltas.get("total_count", 0), 0)
+        new_sum = F("rating_sum") + deltas.get("rating_sum", 0)
+        updates["average_rating"] = Coalesce(
+            Cast(new_sum, FloatField()) / NullIf(new_count, 0), Value(0.0)
+        )
+        if is_counted:
+            created_at = after["created_at"]
+            updates["last_rating_date"] = Greatest(
+                Coalesce(F("last_rating_date"), Value(created_at)), Value(created_at)
+            )
+            if after["has_review"]:
+                updates["has_reviews"] = Value(True)
+
+        ProductRatingAggregate.objects.filter(pk=aggregate.pk).update(**updates)
+
+    # ────────────────────────────────────────────────────
+    # Dirty set
+    # ────────────────────────────────────────────────────
+
+    @staticmethod
+    def _dirty_key():
+        return CacheKeyManager.make_key("product_rating", "dirty_aggregates")
+
+    @classmethod
+    def mark_dirty(cls, product_ids: Iterable):
+        """Queue products for a full recompute once the transaction commits"""
+        product_ids = [str(pid) for pid in product_ids]
+        if not product_ids:
+            return
+
+        def add():
+            get_redis_connection("default").sadd(cls._dirty_key(), *product_ids)
+
+        transaction.on_commit(add)
+
+    @classmethod
+    def process_dirty(cls, batch_size: Optional[int] = None) -> int:
+        """Recompute one batch of dirty products; returns how many were done"""
+        redis_conn = get_redis_connection("default")
+        raw_ids = redis_conn.spop(
+            cls._dirty_key(), batch_size or cls.DIRTY_BATCH_SIZE
+        )
+        product_ids = [
+            pid.decode() if isinstance(pid, bytes) else pid for pid in raw_ids or []
+        ]
+        if not product_ids:
+            return 0
+
+        try:
+            cls.recompute(product_ids)
+        except Exception:
+            # Put the batch back so the next run retries it
+            redis_conn.sadd(cls._dirty_key(), *product_ids)
+            raise
+        return len(product_ids)
+
+    # ────────────────────────────────────────────────────
+    # Full recompute / verification
+    # ────────────────────────────────────────────────────
+
+    @staticmethod
+    def compute(product_ids: Iterable) -> Dict:
+        """Aggregate values computed from the ratings table, keyed by product id"""
+        product_ids = list(product_ids)
+        rows = (
+            ProductRating.objects.filter(product_id__in=product_ids, is_approved=True)
+            .values("product_id")
+            .annotate(
+                total_count=Count("id"),
+                rating_sum=Sum("rating"),
+                verified_count=Count("id", filter=Q(is_verified_purchase=True)),
+                review_count=Count(
+                    "id", filter=Q(review__isnull=False) & ~Q(review="")
+                ),
+                last_rating_date=Max("created_at"),
+                **{
+                    field: Count("id", filter=Q(rating=stars))
+                    for stars, field in STAR_FIELDS.items()
+                },
+            )
+            .order_by()
+        )
+
+        results = {}
+        for row in rows:
+            total = row["total_count"]
+            average = (Decimal(row["rating_sum"]) / total).quantize(
+                Decimal("0.01"), rounding=ROUND_HALF_UP
+            )
+            results[row["product_id"]] = {
+                "average_rating": average,
+                "total_count": total,
+                "rating_sum": row["rating_sum"],
+                "verified_count": row["verified_count"],
+                **{field: row[field] for field in STAR_FIELDS.values()},
+                "has_reviews": row["review_count"] > 0,
+                "last_rating_date": row["last_rating_date"],
+            }
+        return results
+
+    @staticmethod
+    def _empty_values() -> Dict:
+        values = {field: 0 for field in AGGREGATE_FIELDS}
+        values.update(
+            average_rating=Decimal("0.00"), has_reviews=False, last_rating_date=None
+        )
+        return values
+
+    @classmethod
+    @transaction.atomic
+    def recompute(cls, product_ids: Iterable) -> int:
+        """
+        Rebuild the aggregate rows for ``product_ids`` from the ratings table.
+        Rows are locked first so concurrent deltas land after the rebuild.
+        """
+        product_ids = list(product_ids)
+        existing = {
+            aggregate.product_id: aggregate
+            for aggregate in ProductRatingAggregate.objects.select_for_update().filter(
+                product_id__in=product_ids
+            )
+        }
+        computed = cls.compute(product_ids)
+
+        to_update, to_create = [], []
+        for product_id in Product.objects.filter(id__in=product_ids).values_list(
+            "id", flat=True
+        ):
+            values = computed.get(product_id) or cls._empty_values()
+            aggregate = existing.get(product_id)
+            if aggregate is None:
+                to_create.append(
+                    ProductRatingAggregate(product_id=product_id, **values)
+                )
+                continue
+            for field, value in values.items():
+                setattr(aggregate, field, value)
+            to_update.append(aggregate)
+
+        ProductRatingAggregate.objects.bulk_update(to_update, AGGREGATE_FIELDS)
+        ProductRatingAggregate.objects.bulk_create(to_create, ignore_conflicts=True)
+        return len(to_update) + len(to_create)
+
+    @classmethod
+    def find_drift(cls, product_ids: Iterable) -> Dict:
+        """
+        Compare stored aggregates with full recomputes.
+        Returns ``{product_id: {field: (stored, expected)}}`` for rows that differ.
+        """
+        product_ids = list(product_ids)
+        computed = cls.compute(product_ids)
+        stored = {
+            row["product_id"]: row
+            for row in ProductRatingAggregate.objects.filter(
+                product_id__in=product_ids
+            ).values("product_id", *AGGREGATE_FIELDS)
+        }
+
+        drift = {}
+        for product_id in product_ids:
+            expected = computed.get(product_id)
+            current = stored.get(product_id)
+            if current is None:
+                # A missing row is only wrong if there are ratings to count
+                if expected:
+                    drift[product_id] = {
+                        field: (None, value) for field, value in expected.items()
+                    }
+                continue
+
+            expected = expected or cls._empty_values()
+            diff = {
+                field: (current[field], expected[field])
+                for field in AGGREGATE_FIELDS
+                if current[field] != expected[field]
+            }
+            if diff:
+                drift[product_id] = diff
+        return drift
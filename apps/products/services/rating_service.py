@@ -19,6 +19,7 @@ from apps.products.models import (
     RatingHelpfulness,
 )
 from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.services.rating_aggregate_service import RatingAggregateService
 
 CACHE_TTL = getattr(settings, "RATINGS_CACHE_TTL", 300)
 
@@ -89,7 +90,7 @@ class ProductRatingService:
     ) -> ProductRating:
         """
         Add a new rating or update an existing rating (same user + same product).
-        Once saved, enqueue an asynchronous aggregate‐recalculation task and clear caches.
+        The aggregate row is adjusted by delta in the same transaction.
         """
         # Get purchase date for verification
         from apps.transactions.models import EscrowTransaction
@@ -106,6 +107,12 @@ class ProductRatingService:
             purchase_transaction.created_at if purchase_transaction else None
         )
 
+        before = RatingAggregateService.snapshot(
+            ProductRating.objects.select_for_update()
+            .filter(product_id=product_id, user_id=user_id)
+            .first()
+        )
+
         # Create or update the ProductRating row
         rating_obj, created = ProductRating.objects.update_or_create(
             product_id=product_id,
@@ -120,8 +127,9 @@ class ProductRatingService:
             },
         )
 
-        # Trigger aggregate update
-        ProductRatingService.trigger_rating_aggregate_update(product_id=product_id)
+        RatingAggregateService.apply_change(
+            product_id, before, RatingAggregateService.snapshot(rating_obj)
+        )
 
         # Clear caches
         ProductRatingService._clear_product_caches(product_id)
@@ -137,16 +145,16 @@ class ProductRatingService:
         title: str = "",
     ) -> ProductRating:
         """Update an existing rating"""
-        rating_obj = ProductRating.objects.get(id=rating_id)
+        rating_obj = ProductRating.objects.select_for_update().get(id=rating_id)
+        before = RatingAggregateService.snapshot(rating_obj)
         rating_obj.rating = rating
         rating_obj.review = review
         rating_obj.title = title
         rating_obj.updated_at = timezone.now()
         rating_obj.save()
 
-        # Trigger aggregate update
-        ProductRatingService.trigger_rating_aggregate_update(
-            product_id=rating_obj.product_id
+        RatingAggregateService.apply_change(
+            rating_obj.product_id, before, RatingAggregateService.snapshot(rating_obj)
         )
 
         # Clear caches
@@ -157,6 +165,11 @@ class ProductRatingService:
     @staticmethod
     def _clear_product_caches(product_id: int):
         """Clear all caches related to a product's ratings"""
+        cache.delete(
+            CacheKeyManager.make_key(
+                "product_rating", "aggregate", product_id=product_id
+            )
+        )
         redis_conn = get_redis_connection("default")
         # django-redis strips KEY_PREFIX for you
         # cache.delete("safetrade:product_base:list:main")
@@ -171,63 +184,8 @@ class ProductRatingService:
 
     @staticmethod
     def _update_rating_aggregates(product_id: int):
-        """
-        Recompute and upsert the ProductRatingAggregate row for `product_id`.
-        This is called by the Celery task itself (not by the view).
-        """
-        ratings = ProductRating.objects.filter(product_id=product_id, is_approved=True)
-
-        if not ratings.exists():
-            # If no approved ratings yet, set defaults
-            ProductRatingAggregate.objects.update_or_create(
-                product_id=product_id,
-                defaults={
-                    "average_rating": 0,
-                    "total_count": 0,
-                    "verified_count": 0,
-                    "stars_5_count": 0,
-                    "stars_4_count": 0,
-                    "stars_3_count": 0,
-                    "stars_2_count": 0,
-                    "stars_1_count": 0,
-                    "has_reviews": False,
-                    "last_rating_date": None,
-                },
-            )
-            return
-
-        # Aggregate all the statistics in one query
-        stats = ratings.aggregate(
-            avg_rating=Avg("rating"),
-            total_count=Count("id"),
-            verified_count=Count("id", filter=Q(is_verified_purchase=True)),
-            stars_5=Count("id", filter=Q(rating=5)),
-            stars_4=Count("id", filter=Q(rating=4)),
-            stars_3=Count("id", filter=Q(rating=3)),
-            stars_2=Count("id", filter=Q(rating=2)),
-            stars_1=Count("id", filter=Q(rating=1)),
-        )
-
-        last_rating = ratings.order_by("-created_at").first()
-        has_reviews = (
-            ratings.exclude(review__isnull=True).exclude(review__exact="").exists()
-        )
-
-        ProductRatingAggregate.objects.update_or_create(
-            product_id=product_id,
-            defaults={
-                "average_rating": round(stats["avg_rating"] or 0, 2),
-                "total_count": stats["total_count"],
-                "verified_count": stats["verified_count"],
-                "stars_5_count": stats["stars_5"],
-                "stars_4_count": stats["stars_4"],
-                "stars_3_count": stats["stars_3"],
-                "stars_2_count": stats["stars_2"],
-                "stars_1_count": stats["stars_1"],
-                "has_reviews": has_reviews,
-                "last_rating_date": last_rating.created_at if last_rating else None,
-            },
-        )
+        """Recompute and upsert the ProductRatingAggregate row for `product_id`."""
+        RatingAggregateService.recompute([product_id])
 
     @staticmethod
     def get_cache_key(**kwargs) -> str:
@@ -443,16 +401,18 @@ class ProductRatingService:
             return False
 
     @staticmethod
+    @transaction.atomic
     def moderate_rating(rating_id: int, approve: bool, moderator_user_id: int) -> bool:
         """Approve or reject a flagged rating"""
         try:
             rating = ProductRating.objects.get(id=rating_id)
+            status_changed = rating.is_approved != approve
             rating.is_approved = approve
             rating.is_flagged = False if approve else rating.is_flagged
             rating.save(update_fields=["is_approved", "is_flagged"])
 
-            # If status changed, update aggregates
-            if rating.is_approved != approve:
+            # Moderation goes through the dirty set rather than a delta
+            if status_changed:
                 ProductRatingService.trigger_rating_aggregate_update(rating.product_id)
                 ProductRatingService._clear_product_caches(rating.product_id)
 
@@ -461,40 +421,19 @@ class ProductRatingService:
             return False
 
     # ────────────────────────────────────────────────────
-    # CELERY TASK-ENQUEUE "TRIGGERS" (lazy imports to avoid circular import)
+    # AGGREGATE RECOMPUTE "TRIGGERS" (dirty set drained by a periodic task)
     # ────────────────────────────────────────────────────
 
     @staticmethod
-    def trigger_rating_aggregate_update(product_id: int, delay_seconds: int = 0):
+    def trigger_rating_aggregate_update(product_id: int):
         """
-        Enqueue (or schedule) the debounced Celery task to recalc aggregates for one product.
-        If delay_seconds > 0, schedule it in the future; otherwise queue immediately.
+        Queue a full recompute of one product's aggregates. The product id is
+        added to the dirty set on commit and picked up by
+        `recompute_dirty_rating_aggregates`.
         """
-        from apps.products.tasks.rating import debounced_rating_aggregate_update
-
-        if delay_seconds > 0:
-            return debounced_rating_aggregate_update.apply_async(
-                args=[product_id], countdown=delay_seconds
-            )
-        else:
-            return debounced_rating_aggregate_update.delay(product_id)
+        RatingAggregateService.mark_dirty([product_id])
 
     @staticmethod
     def trigger_bulk_rating_aggregate_update(product_ids: list):
-        """
-        Enqueue a bulk‐update Celery task that will queue individual updates internally.
-        """
-        from apps.products.tasks.rating import bulk_update_rating_aggregates_task
-
-        return bulk_update_rating_aggregates_task.delay(product_ids)
-
-    @staticmethod
-    def schedule_rating_aggregate_update(product_id: int, eta_datetime=None):
-        """
-        Schedule a debounced update at an exact datetime (`eta_datetime` must be a timezone‐aware datetime).
-        """
-        from apps.products.tasks.rating import debounced_rating_aggregate_update
-
-        return debounced_rating_aggregate_update.apply_async(
-            args=[product_id], eta=eta_datetime
-        )
+        """Queue full recomputes for several products via the dirty set."""
+        RatingAggregateService.mark_dirty(product_ids)
@@ -0,0 +1,370 @@
+import logging
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import WatchError
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.models import Product, ProductVariant, ProductVariantOption
+from apps.products.models.managers import STOCK_FIELDS
+
+logger = logging.getLogger("variant_performance")
+
+MATRIX_TTL = getattr(settings, "VARIANT_MATRIX_TTL", 60 * 60 * 24)
+STOCK_OVERLAY_TTL = getattr(settings, "VARIANT_STOCK_OVERLAY_TTL", 60 * 60)
+
+VARIANT_FIELDS = (
+    "id",
+    "sku",
+    "price",
+    "final_price",
+    "cost_price",
+    "low_stock_threshold",
+    "weight",
+    "dimensions_length",
+    "dimensions_width",
+    "dimensions_height",
+    "is_digital",
+    "is_backorderable",
+    "expected_restock_date",
+    "product__requires_shipping",
+)
+OPTION_FIELDS = (
+    "productvariant_id",
+    "productvariantoption_id",
+    "productvariantoption__value",
+    "productvariantoption__display_value",
+    "productvariantoption__slug",
+    "productvariantoption__sort_order",
+    "productvariantoption__price_adjustment",
+    "productvariantoption__color_code",
+    "productvariantoption__image",
+    "productvariantoption__variant_type_id",
+    "productvariantoption__variant_type__name",
+    "productvariantoption__variant_type__slug",
+    "productvariantoption__variant_type__sort_order",
+    "productvariantoption__variant_type__is_active",
+    "productvariantoption__variant_type__is_required",
+    "productvariantoption__variant_type__display_type",
+    "productvariantoption__variant_type__affects_price",
+    "productvariantoption__variant_type__affects_inventory",
+)
+
+
+def _str_or_none(value):
+    return str(value) if value is not None else None
+
+
+class VariantMatrixService:
+    """
+    Serves a product's variant matrix from two cached parts:
+
+    - a static part (variant types, options, SKUs, prices) built from two
+      ``values()`` queries and dropped after commit when the product's
+      variants, their options or prices change;
+    - a stock overlay, a Redis hash of ``variant id -> "total:in_escrow"``
+      whose field is dropped after commit by every stock movement.
+
+    A stock change only drops its hash field, so the next read reloads that
+    one variant's stock and the rest of the matrix is served without a
+    database query. Fields are dropped rather than rewritten because
+    transactions may commit in a different order than they wrote; the
+    reload always sees the latest committed value. Each drop also bumps the
+    field's version, and a reload is only written back if the version it
+    read before querying is unchanged, so a read that raced a commit cannot
+    cache the stock from before it. Overlay fields also expire with the hash.
+    """
+
+    @staticmethod
+    def _matrix_key(product_id) -> str:
+        product_id = Product._meta.pk.to_python(product_id)
+        return CacheKeyManager.make_key(
+            "product_variant", "matrix", product_id=product_id
+        )
+
+    @staticmethod
+    def _stock_key(product_id) -> str:
+        product_id = Product._meta.pk.to_python(product_id)
+        return CacheKeyManager.make_key(
+            "product_variant", "stock", product_id=product_id
+        )
+
+    @staticmethod
+    def _stock_version_key(product_id) -> str:
+        product_id = Product._meta.pk.to_python(product_id)
+        return CacheKeyManager.make_key(
+            "product_variant", "stock_version", product_id=product_id
+        )
+
+    # ==========================================
+    # STATIC PART
+    # ==========================================
+
+    @classmethod
+    def build_static(cls, product_id) -> Dict:
+        """Options stored once, variants referencing them by id"""
+        variants = {
+            row["id"]: row
+            for row in ProductVariant.objects.filter(
+                product_id=product_id, is_active=True
+            ).values(*VARIANT_FIELDS)
+        }
+        links = ProductVariant.options.through.objects.filter(
+            productvariant_id__in=list(variants)
+        ).values(*OPTION_FIELDS)
+
+        image_storage = ProductVariantOption._meta.get_field("image").storage
+        options, types, option_ids = {}, {}, {}
+        for link in links:
+            row = {
+                key.replace("productvariantoption__", ""): value
+                for key, value in link.items()
+            }
+            option_id = str(row["productvariantoption_id"])
+            option_ids.setdefault(row["productvariant_id"], []).append(option_id)
+            if option_id in options:
+                continue
+
+            type_id = str(row["variant_type_id"])
+            options[option_id] = {
+                "id": option_id,
+                "type_id": type_id,
+                "type": row["variant_type__name"],
+                "type_slug": row["variant_type__slug"],
+                "value": row["value"],
+                "display_value": row["display_value"] or row["value"],
+                "slug": row["slug"],
+                "sort_order": row["sort_order"],
+                "price_adjustment": str(row["price_adjustment"]),
+                "color_code": row["color_code"],
+                "image": image_storage.url(row["image"]) if row["image"] else None,
+            }
+            if row["variant_type__is_active"]:
+                types.setdefault(
+                    type_id,
+                    {
+                        "id": type_id,
+                        "name": row["variant_type__name"],
+                        "slug": row["variant_type__slug"],
+                        "sort_order": row["variant_type__sort_order"],
+                        "is_active": True,
+                        "is_required": row["variant_type__is_required"],
+                        "display_type": row["variant_type__display_type"],
+                        "affects_price": row["variant_type__affects_price"],
+                        "affects_inventory": row["variant_type__affects_inventory"],
+                        "option_ids": [],
+                    },
+                )["option_ids"].append(option_id)
+
+        matrix = {}
+        for variant_id, variant in variants.items():
+            ids = sorted(
+                option_ids.get(variant_id, []),
+                key=lambda option_id: options[option_id]["type_id"],
+            )
+            matrix_key = "|".join(
+                sorted(
+                    f"{options[oid]['type_slug']}:{options[oid]['slug']}"
+                    for oid in ids
+                )
+            )
+            dimensions = {
+                "length": _str_or_none(variant["dimensions_length"]),
+                "width": _str_or_none(variant["dimensions_width"]),
+                "height": _str_or_none(variant["dimensions_height"]),
+            }
+            matrix[matrix_key] = {
+                "id": str(variant_id),
+                "sku": variant["sku"],
+                "price": _str_or_none(variant["price"]),
+                "final_price": _str_or_none(variant["final_price"]),
+                "cost_price": _str_or_none(variant["cost_price"]),
+                "low_stock_threshold": variant["low_stock_threshold"],
+                "weight": _str_or_none(variant["weight"]),
+                "dimensions": dimensions if any(dimensions.values()) else None,
+                "is_digital": variant["is_digital"],
+                "requires_shipping": variant["product__requires_shipping"],
+                "is_backorderable": variant["is_backorderable"],
+                "expected_restock_date": (
+                    variant["expected_restock_date"].isoformat()
+                    if variant["expected_restock_date"]
+                    else None
+                ),
+                "option_ids": ids,
+            }
+
+        variant_types = sorted(types.values(), key=lambda t: t["sort_order"])
+        for variant_type in variant_types:
+            variant_type["option_ids"].sort(
+                key=lambda option_id: options[option_id]["sort_order"]
+            )
+        return {"variant_types": variant_types, "options": options, "variants": matrix}
+
+    @classmethod
+    def get_static(cls, product_id) -> Dict:
+        cache_key = cls._matrix_key(product_id)
+        static = cache.get(cache_key)
+        if static is None:
+            static = cls.build_static(product_id)
+            cache.set(cache_key, static, MATRIX_TTL)
+        return static
+
+    @classmethod
+    def invalidate(cls, product_ids: Iterable):
+        """Drop the static part for ``product_ids`` once the change commits"""
+        keys = [cls._matrix_key(product_id) for product_id in set(product_ids)]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    @classmethod
+    def invalidate_for_variants(cls, variants):
+        """Drop the static part for the products of a variant queryset"""
+        cls.invalidate(variants.values_list("product_id", flat=True).distinct())
+
+    # ==========================================
+    # STOCK OVERLAY
+    # ==========================================
+
+    @staticmethod
+    def _encode(stock: Dict) -> str:
+        return f"{stock['total_inventory']}:{stock['in_escrow_inventory']}"
+
+    @classmethod
+    def invalidate_stock(cls, rows: List[Dict]):
+        """
+        Drop the overlay fields of changed variants (rows with ``id`` and
+        ``product_id``, as the ProductVariantQuerySet movements return them)
+        and bump their versions after commit, so the next read reloads them
+        from the database and reloads already in flight are not written back.
+        """
+        by_product = {}
+        for row in rows:
+            by_product.setdefault(row["product_id"], set()).add(str(row["id"]))
+        if not by_product:
+            return
+
+        def drop():
+            try:
+                pipe = get_redis_connection("default").pipeline()
+                for product_id, variant_ids in by_product.items():
+                    version_key = cls._stock_version_key(product_id)
+                    pipe.hdel(cls._stock_key(product_id), *variant_ids)
+                    for variant_id in variant_ids:
+                        pipe.hincrby(version_key, variant_id, 1)
+                    pipe.expire(version_key, STOCK_OVERLAY_TTL)
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Failed to invalidate variant stock overlay: {e}")
+
+        transaction.on_commit(drop)
+
+    @classmethod
+    def get_stock(cls, product_id, variant_ids: List[str]) -> Dict[str, Dict]:
+        """Stock per variant id from the overlay, loading missing fields"""
+        key = cls._stock_key(product_id)
+        redis_conn = get_redis_connection("default")
+        raw = {
+            (k.decode() if isinstance(k, bytes) else k): (
+                v.decode() if isinstance(v, bytes) else v
+            )
+            for k, v in redis_conn.hgetall(key).items()
+        }
+
+        missing = [variant_id for variant_id in variant_ids if variant_id not in raw]
+        if missing:
+            # Versions are read before the database so a commit after it shows
+            versions = dict(
+                zip(
+                    missing,
+                    redis_conn.hmget(cls._stock_version_key(product_id), missing),
+                )
+            )
+            loaded = {
+                str(row["id"]): cls._encode(row)
+                for row in ProductVariant.objects.filter(id__in=missing).values(
+                    "id", *STOCK_FIELDS
+                )
+            }
+            if loaded:
+                cls._store_stock(product_id, versions, loaded)
+            raw.update(loaded)
+
+        stock = {}
+        for variant_id, value in raw.items():
+            total, in_escrow = (int(part) for part in value.split(":"))
+            stock[variant_id] = {
+                "total_inventory": total,
+                "reserved_quantity": in_escrow,
+                "available_quantity": max(0, total - in_escrow),
+            }
+        return stock
+
+    @classmethod
+    def _store_stock(cls, product_id, versions: Dict, loaded: Dict[str, str]):
+        """
+        Write reloaded overlay fields whose version still matches ``versions``,
+        read before the database query. Fields invalidated meanwhile are left
+        for the next read to reload.
+        """
+        key = cls._stock_key(product_id)
+        version_key = cls._stock_version_key(product_id)
+        with get_redis_connection("default").pipeline() as pipe:
+            try:
+                pipe.watch(version_key)
+                current = pipe.hmget(version_key, list(loaded))
+                fresh = {
+                    variant_id: value
+                    for (variant_id, value), version in zip(loaded.items(), current)
+                    if version == versions.get(variant_id)
+                }
+                if not fresh:
+                    return
+                pipe.multi()
+                pipe.hset(key, mapping=fresh)
+                pipe.expire(key, STOCK_OVERLAY_TTL)
+                pipe.execute()
+            except WatchError:
+                logger.debug(f"Stock overlay for {product_id} changed during reload")
+
+    # ==========================================
+    # COMBINED MATRIX
+    # ==========================================
+
+    @classmethod
+    def get_matrix(cls, product_id) -> Dict:
+        """Variant types and variants keyed by "type:option|..." with stock"""
+        static = cls.get_static(product_id)
+        options = static["options"]
+        stock = cls.get_stock(
+            product_id, [variant["id"] for variant in static["variants"].values()]
+        )
+
+        variants = {}
+        for matrix_key, variant in static["variants"].items():
+            levels = stock.get(
+                variant["id"],
+                {"total_inventory": 0, "reserved_quantity": 0, "available_quantity": 0},
+            )
+            entry = {k: v for k, v in variant.items() if k != "option_ids"}
+            entry.update(levels)
+            entry["is_in_stock"] = (
+                levels["available_quantity"] > 0 or variant["is_backorderable"]
+            )
+            entry["is_low_stock"] = (
+                levels["available_quantity"] <= variant["low_stock_threshold"]
+            )
+            entry["options"] = [options[oid] for oid in variant["option_ids"]]
+            variants[matrix_key] = entry
+
+        variant_types = [
+            {
+                **{k: v for k, v in variant_type.items() if k != "option_ids"},
+                "options": [options[oid] for oid in variant_type["option_ids"]],
+                "option_count": len(variant_type["option_ids"]),
+            }
+            for variant_type in static["variant_types"]
+        ]
+        return {"variant_types": variant_types, "variants": variants}
@@ -0,0 +1,89 @@
+import logging
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from apps.products.models import Product, ProductVariant, ProductVariantOption
+from apps.products.services.variant_matrix_service import VariantMatrixService
+
+logger = logging.getLogger("variant_performance")
+
+
+class VariantPriceService:
+    """
+    Maintains the persisted ``ProductVariant.final_price``: the variant price
+    plus the adjustments of its price-affecting options, or the product price
+    when the variant has no price of its own.
+
+    Saving a variant computes it in Python; option membership changes and
+    changes to an option's ``price_adjustment``, a type's ``affects_price`` or
+    a product's price recompute every affected variant with one UPDATE.
+    """
+
+    @staticmethod
+    def final_price_expression():
+        adjustments = (
+            ProductVariantOption.objects.filter(
+                variants=OuterRef("pk"), variant_type__affects_price=True
+            )
+            .order_by()
+            .values("variants")
+            .annotate(total=Sum("price_adjustment"))
+            .values("total")
+        )
+        product_price = Product.objects.filter(pk=OuterRef("product_id")).values(
+            "price"
+        )
+        return Case(
+            When(price__isnull=True, then=Subquery(product_price)),
+            default=F("price") + Coalesce(Subquery(adjustments), Value(Decimal("0"))),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+
+    @classmethod
+    def recompute(cls, variants=None) -> int:
+        """Recompute ``final_price`` for a variant queryset (default: all)"""
+        queryset = ProductVariant.objects.all() if variants is None else variants
+        updated = queryset.update(final_price=cls.final_price_expression())
+        if updated:
+            VariantMatrixService.invalidate_for_variants(queryset)
+        logger.info(f"Recomputed final price for {updated} variants")
+        return updated
+
+    @classmethod
+    def for_variants(cls, variant_ids: Iterable) -> int:
+        return cls.recompute(ProductVariant.objects.filter(id__in=list(variant_ids)))
+
+    @classmethod
+    def for_option(cls, option_id) -> int:
+        return cls.recompute(
+            ProductVariant.objects.filter(
+                id__in=ProductVariant.options.through.objects.filter(
+                    productvariantoption_id=option_id
+                ).values("productvariant_id")
+            )
+        )
+
+    @classmethod
+    def for_variant_type(cls, variant_type_id) -> int:
+        return cls.recompute(
+            ProductVariant.objects.filter(
+                id__in=ProductVariant.options.through.objects.filter(
+                    productvariantoption__variant_type_id=variant_type_id
+                ).values("productvariant_id")
+            )
+        )
+
+    @staticmethod
+    def for_product(product_id, price: Optional[Decimal]) -> int:
+        """Variants without their own price follow the product price"""
+        updated = (
+            ProductVariant.objects.filter(product_id=product_id, price__isnull=True)
+            .exclude(final_price=price)
+            .update(final_price=price)
+        )
+        if updated:
+            VariantMatrixService.invalidate([product_id])
+        return updated
@@ -12,17 +12,26 @@ from django.db.models import Count, Sum, Min, Max, Avg, Q, F, Prefetch
 from django_redis import get_redis_connection
 from apps.products.models import Product
 
-# from apps.core.utils.cache_manager import CacheManager
+from apps.core.utils.cache_manager import CacheManager
 from apps.core.utils.cache_key_manager import CacheKeyManager
 
 from apps.products.models import (
+    InventoryTransaction,
     ProductVariantType,
     ProductVariantOption,
     ProductVariant,
     ProductVariantImage,
 )
+from apps.products.models.managers import STOCK_FIELDS
+from apps.products.services.variant_matrix_service import VariantMatrixService
+from apps.products.services.watchlist_alert_service import (
+    VARIANT_ALERT_FIELDS,
+    WatchlistAlertService,
+)
 
 CACHE_TTL = getattr(settings, "VARIANTS_CACHE_TTL", 300)
+BULK_BATCH_SIZE = 500
+STOCK_ACTIONS = ("set", "add", "subtract")
 logger = logging.getLogger("variant_performance")
 
 
@@ -31,6 +40,8 @@ class ProductVariantService:
 
     CACHE_TIMEOUT = CACHE_TTL
     DETAIL_KEYS_SET = "safetrade:product_variant:detail:keys"
+    # Detail keys of one product, so its caches can be dropped on their own
+    PRODUCT_DETAIL_KEYS_SET = "safetrade:product_variant:detail:keys:{product_id}"
 
     @staticmethod
     @transaction.atomic
@@ -43,19 +54,22 @@ class ProductVariantService:
         Returns:
             List[ProductVariantType]: List of created variant types
         """
-        created_types = []
-        for type_data in types_data:
-            # Create the variant type
-            variant_type = ProductVariantType.objects.create(
-                name=type_data.get("name"),
-                slug=type_data.get("slug"),
-                sort_order=type_data.get("sort_order", 0),
-                is_active=type_data.get("is_active", True),
-            )
-            created_types.append(variant_type)
+        created_types = ProductVariantType.objects.bulk_create(
+            [
+                ProductVariantType(
+                    name=type_data.get("name"),
+                    slug=type_data.get("slug"),
+                    sort_order=type_data.get("sort_order", 0),
+                    is_active=type_data.get("is_active", True),
+                )
+                for type_data in types_data
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
 
-        # Clear cache after bulk creation
+        # Clear cache after bulk creation; bulk_create skips the save signals
         cache.delete_pattern("product_variant:types:*")
+        ProductVariantService._invalidate_variant_types_cache()
         return created_types
 
     @staticmethod
@@ -73,23 +87,28 @@ class ProductVariantService:
             List[ProductVariantOption]: List of created variant options
         """
         variant_type = ProductVariantType.objects.get(id=variant_type_id)
-        created_options = []
-
-        for option_data in options_data:
-            option = ProductVariantOption.objects.create(
-                variant_type=variant_type,
-                value=option_data.get("value"),
-                slug=option_data.get("slug"),
-                display_value=option_data.get("display_value"),
-                color_code=option_data.get("color_code"),
-                price_adjustment=option_data.get("price_adjustment", Decimal("0.00")),
-                sort_order=option_data.get("sort_order", 0),
-                is_active=option_data.get("is_active", True),
-            )
-            created_options.append(option)
+        created_options = ProductVariantOption.objects.bulk_create(
+            [
+                ProductVariantOption(
+                    variant_type=variant_type,
+                    value=option_data.get("value"),
+                    slug=option_data.get("slug"),
+                    display_value=option_data.get("display_value") or "",
+                    color_code=option_data.get("color_code"),
+                    price_adjustment=option_data.get(
+                        "price_adjustment", Decimal("0.00")
+                    ),
+                    sort_order=option_data.get("sort_order", 0),
+                    is_active=option_data.get("is_active", True),
+                )
+                for option_data in options_data
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
 
-        # Clear cache after bulk creation
+        # Clear cache after bulk creation; bulk_create skips the save signals
         cache.delete_pattern("product_variant:types:*")
+        ProductVariantService._invalidate_variant_types_cache()
         return created_options
 
     # ==========================================
@@ -221,6 +240,12 @@ class ProductVariantService:
         key = CacheKeyManager.make_key("product_variant", "detail", params=params_hash)
         redis_conn = get_redis_connection("default")
         redis_conn.sadd(ProductVariantService.DETAIL_KEYS_SET, key)
+        redis_conn.sadd(
+            ProductVariantService.PRODUCT_DETAIL_KEYS_SET.format(
+                product_id=params["product_id"]
+            ),
+            key,
+        )
         logger.info(f"Generated cache key: {key} with params: {params}")
         return key
 
@@ -228,142 +253,43 @@ class ProductVariantService:
     def get_variant_by_options(
         product_id: int, option_ids: List[int]
     ) -> Optional[ProductVariant]:
-        """Find variant by exact option combination."""
-        if not option_ids:
+        """
+        Find the variant with exactly this option combination, active or not.
+
+        The lookup is one equality match on the indexed option signature; the
+        cache holds only the variant id, which is re-checked against the
+        signature so a stale entry reads as a miss.
+        """
+        signature = ProductVariant.make_option_signature(option_ids)
+        if not signature:
             return None
 
-        # Sort option_ids for consistent caching
-        sorted_option_ids = sorted(option_ids)
         cache_key = CacheKeyManager.make_key(
             "product_variant",
             "options",
             product_id=product_id,
-            option_ids="-".join(map(str, sorted_option_ids)),
+            option_ids=signature,
         )
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        # Find variant with exact option match
-        variants = (
-            ProductVariant.objects.filter(
-                product_id=product_id, is_active=True, options__in=option_ids
-            )
-            .annotate(option_count=Count("options"))
-            .filter(option_count=len(option_ids))
-            .prefetch_related("options")
-        )
-
-        # Verify exact match (no extra options)
-        for variant in variants:
-            variant_option_ids = set(variant.options.values_list("id", flat=True))
-            if variant_option_ids == set(option_ids):
-                cache.set(cache_key, variant, ProductVariantService.CACHE_TIMEOUT)
+        variants = ProductVariant.objects.by_options(product_id, option_ids)
+        cached_id = cache.get(cache_key)
+        if cached_id is not None:
+            variant = variants.filter(pk=cached_id).first()
+            if variant is not None:
                 return variant
 
-        cache.set(cache_key, None, ProductVariantService.CACHE_TIMEOUT)
-        return None
+        variant = variants.first()
+        if variant is not None:
+            cache.set(cache_key, variant.id, ProductVariantService.CACHE_TIMEOUT)
+        return variant
 
     @staticmethod
     def get_variant_matrix(product_id: int) -> Dict:
-        """Enhanced variant matrix with pricing and availability info."""
-        cache_key = CacheKeyManager.make_key("variant_matrix", product_id=product_id)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
-
-        variants = (
-            ProductVariant.objects.filter(product_id=product_id, is_active=True)
-            .prefetch_related("options__variant_type")
-            .select_related("product")
-        )
-
-        matrix = {}
-        for variant in variants:
-            # Create sorted key for consistent lookup
-            key_parts = []
-            options_data = []
-
-            for opt in variant.options.all():
-                key_parts.append(f"{opt.variant_type.slug}:{opt.slug}")
-                options_data.append(
-                    {
-                        "id": opt.id,
-                        "type_id": opt.variant_type.id,
-                        "type": opt.variant_type.name,
-                        "type_slug": opt.variant_type.slug,
-                        "value": opt.value,
-                        "display_value": opt.display_value or opt.value,
-                        "slug": opt.slug,
-                        "price_adjustment": str(opt.price_adjustment),
-                        "color_code": opt.color_code,
-                        "image": opt.image.url if opt.image else None,
-                    }
-                )
-
-            matrix_key = "|".join(sorted(key_parts))
-
-            matrix[matrix_key] = {
-                "id": variant.id,
-                "sku": variant.sku,
-                "price": str(variant.price) if variant.price is not None else None,
-                "final_price": (
-                    str(variant.final_price)
-                    if variant.final_price is not None
-                    else None
-                ),
-                "cost_price": (
-                    str(variant.cost_price) if variant.cost_price is not None else None
-                ),
-                "stock_quantity": variant.stock_quantity,
-                "reserved_quantity": variant.reserved_quantity,
-                "available_quantity": variant.available_quantity,
-                "is_in_stock": variant.is_in_stock,
-                "is_low_stock": variant.is_low_stock,
-                "low_stock_threshold": variant.low_stock_threshold,
-                "weight": str(variant.weight) if variant.weight else None,
-                "dimensions": (
-                    {
-                        "length": (
-                            str(variant.dimensions_length)
-                            if variant.dimensions_length
-                            else None
-                        ),
-                        "width": (
-                            str(variant.dimensions_width)
-                            if variant.dimensions_width
-                            else None
-                        ),
-                        "height": (
-                            str(variant.dimensions_height)
-                            if variant.dimensions_height
-                            else None
-                        ),
-                    }
-                    if any(
-                        [
-                            variant.dimensions_length,
-                            variant.dimensions_width,
-                            variant.dimensions_height,
-                        ]
-                    )
-                    else None
-                ),
-                "is_digital": variant.is_digital,
-                "requires_shipping": variant.product.requires_shipping,
-                "is_backorderable": variant.is_backorderable,
-                "expected_restock_date": (
-                    variant.expected_restock_date.isoformat()
-                    if variant.expected_restock_date
-                    else None
-                ),
-                "escrow_hold_period": variant.escrow_hold_period,
-                "requires_inspection": variant.requires_inspection,
-                "options": sorted(options_data, key=lambda x: x["type_id"]),
-            }
-
-        cache.set(cache_key, matrix, ProductVariantService.CACHE_TIMEOUT)
-        return matrix
+        """
+        Variants keyed by their sorted "type:option" pairs, with stock. See
+        VariantMatrixService for how the static part and the stock overlay
+        are cached.
+        """
+        return VariantMatrixService.get_matrix(product_id)["variants"]
 
     # ==========================================
     # VARIANT CREATION METHODS
@@ -426,16 +352,41 @@ class ProductVariantService:
         # 3. Set the variant’s price to base + adjustment:
         kwargs["price"] = base_price + total_adjustment
         # Create variant
-        variant = ProductVariant.objects.create(
-            product_id=product_id, sku=sku, **kwargs
+        [variant] = ProductVariantService._insert_variants(
+            product, [(ProductVariant(sku=sku, **kwargs), options)]
         )
-        variant.options.set(options)
 
         # Clear caches
-        ProductVariantService.invalidate_variant_detail_caches()
+        ProductVariantService._clear_product_caches(product_id)
 
         return variant
 
+    @staticmethod
+    def _insert_variants(product: Product, rows: List[tuple]) -> List[ProductVariant]:
+        """
+        Insert (variant, options) pairs with one bulk INSERT for the variants
+        and one for their option links. bulk_create skips save() and the
+        m2m signals, so final_price and option_signature are set here.
+        """
+        through = ProductVariant.options.through
+        variants, links = [], []
+        for variant, options in rows:
+            variant.product = product
+            variant.final_price = variant.compute_final_price(options)
+            variant.option_signature = ProductVariant.make_option_signature(
+                [option.id for option in options]
+            )
+            variants.append(variant)
+            links.extend(
+                through(productvariant_id=variant.id, productvariantoption_id=option.id)
+                for option in options
+            )
+
+        ProductVariant.objects.bulk_create(variants, batch_size=BULK_BATCH_SIZE)
+        through.objects.bulk_create(links, batch_size=BULK_BATCH_SIZE)
+        VariantMatrixService.invalidate([product.id])
+        return variants
+
     @staticmethod
     @transaction.atomic
     def bulk_create_variants(
@@ -444,7 +395,11 @@ class ProductVariantService:
         validate_uniqueness: bool = True,
         update_cache: bool = True,
     ) -> List[ProductVariant]:
-        """Enhanced bulk creation with better validation and error handling."""
+        """
+        Create many variants at once: SKUs and option combinations are checked
+        with one query each, variants and option links are inserted in
+        batches and caches are invalidated once at the end.
+        """
         if not variant_data:
             raise ValidationError("No variant data provided")
 
@@ -454,11 +409,11 @@ class ProductVariantService:
         except Product.DoesNotExist:
             raise ValidationError(f"Product with id {product_id} does not exist")
 
-        created_variants = []
-        errors = []
-
         # Pre-validate all SKUs for uniqueness
         skus = [data.get("sku") for data in variant_data if data.get("sku")]
+        duplicate_skus = {sku for sku in skus if skus.count(sku) > 1}
+        if duplicate_skus:
+            raise ValidationError(f"Duplicate SKUs in request: {duplicate_skus}")
         if validate_uniqueness and skus:
             existing_skus = set(
                 ProductVariant.objects.filter(sku__in=skus).values_list(
@@ -482,6 +437,9 @@ class ProductVariantService:
             ).select_related("variant_type")
         }
 
+        rows = []
+        errors = []
+        signatures = {}
         for i, data in enumerate(variant_data):
             try:
                 sku = data.get("sku")
@@ -505,33 +463,46 @@ class ProductVariantService:
                 if len(set(variant_type_ids)) != len(variant_type_ids):
                     raise ValidationError(f"Duplicate variant types in variant {i}")
 
+                signature = ProductVariant.make_option_signature(option_ids)
+                if signature in signatures:
+                    raise ValidationError(
+                        f"Same options as {signatures[signature]} in variant {i}"
+                    )
+                signatures[signature] = sku
+
                 # Set default price
                 if "price" not in data or data["price"] is None:
                     data["price"] = (
                         product.base_price if hasattr(product, "base_price") else None
                     )
 
-                # Create variant
                 variant_data_clean = {
                     k: v for k, v in data.items() if k != "option_combinations"
                 }
-                variant = ProductVariant.objects.create(
-                    product_id=product_id, **variant_data_clean
-                )
-                variant.options.set(options)
-                created_variants.append(variant)
+                rows.append((ProductVariant(**variant_data_clean), options))
 
             except Exception as e:
                 errors.append(f"Variant {i} ({data.get('sku', 'unknown')}): {str(e)}")
 
+        if validate_uniqueness and signatures:
+            existing = ProductVariant.objects.filter(
+                product_id=product_id, option_signature__in=list(signatures)
+            ).values_list("option_signature", "sku")
+            for signature, existing_sku in existing:
+                errors.append(
+                    f"Variant {signatures[signature]}: options already used by "
+                    f"{existing_sku}"
+                )
+
         if errors:
             # Rollback transaction
             raise ValidationError(f"Errors in bulk creation: {'; '.join(errors)}")
 
+        created_variants = ProductVariantService._insert_variants(product, rows)
+
         # Clear caches
         if update_cache:
             ProductVariantService._clear_product_caches(product_id)
-            ProductVariantService.update_variant_cache(product_id)
 
         return created_variants
 
@@ -609,7 +580,7 @@ class ProductVariantService:
                     "sku": sku,
                     "option_combinations": [opt.id for opt in combo],
                     "price": final_price,
-                    "stock_quantity": 0,
+                    "total_inventory": 0,
                     "is_active": True,
                     "weight": None,
                     "dimensions_length": None,
@@ -625,76 +596,133 @@ class ProductVariantService:
     # ==========================================
 
     @staticmethod
-    @transaction.atomic
     def reserve_stock(variant_id: int, quantity: int) -> bool:
         """Reserve stock for a variant."""
-        try:
-            variant = ProductVariant.objects.select_for_update().get(id=variant_id)
-            if variant.reserve_stock(quantity):
-                ProductVariantService._clear_product_caches(variant.product_id)
-                return True
-            return False
-        except ProductVariant.DoesNotExist:
-            return False
+        return ProductVariant.objects.reserve(variant_id, quantity) is not None
 
     @staticmethod
-    @transaction.atomic
     def release_stock(variant_id: int, quantity: int) -> bool:
         """Release reserved stock for a variant."""
-        try:
-            variant = ProductVariant.objects.select_for_update().get(id=variant_id)
-            variant.release_stock(quantity)
-            ProductVariantService._clear_product_caches(variant.product_id)
-            return True
-        except ProductVariant.DoesNotExist:
-            return False
+        return ProductVariant.objects.release(variant_id, quantity) is not None
 
     @staticmethod
-    @transaction.atomic
     def reduce_stock(variant_id: int, quantity: int) -> bool:
         """Reduce actual stock for a variant."""
-        try:
-            variant = ProductVariant.objects.select_for_update().get(id=variant_id)
-            if variant.reduce_stock(quantity):
-                ProductVariantService._clear_product_caches(variant.product_id)
-                return True
-            return False
-        except ProductVariant.DoesNotExist:
-            return False
+        return ProductVariant.objects.reduce(variant_id, quantity) is not None
 
     @staticmethod
     @transaction.atomic
-    def bulk_update_stock(stock_updates: List[Dict]) -> Dict:
-        """Bulk update stock for multiple variants."""
+    def bulk_update_stock(stock_updates: List[Dict], user=None) -> Dict:
+        """
+        Apply set/add/subtract updates to total inventory as one batch.
+
+        The variants are locked with one ``SELECT ... FOR UPDATE`` in id
+        order, so concurrent batches cannot deadlock; they are written with
+        one ``bulk_update`` and recorded with one InventoryTransaction
+        ``bulk_create``. Caches are cleared once per product. Updates for the
+        same variant apply in request order; an update that would drop total
+        inventory below what is held in escrow is reported as an error.
+        """
         results = {"success": [], "errors": []}
 
+        def fail(update, error):
+            results["errors"].append(
+                {"variant_id": update.get("variant_id"), "error": str(error)}
+            )
+
+        parsed = []
         for update in stock_updates:
             try:
-                variant_id = update["variant_id"]
-                action = update["action"]  # 'set', 'add', 'subtract'
-                quantity = update["quantity"]
-
-                variant = ProductVariant.objects.select_for_update().get(id=variant_id)
-
-                if action == "set":
-                    variant.stock_quantity = quantity
-                elif action == "add":
-                    variant.stock_quantity += quantity
-                elif action == "subtract":
-                    variant.stock_quantity = max(0, variant.stock_quantity - quantity)
-                else:
+                variant_id = ProductVariant._meta.pk.to_python(update["variant_id"])
+                # The API serializer sends "operation"
+                action = update.get("action", update.get("operation"))
+                quantity = int(update["quantity"])
+                if action not in STOCK_ACTIONS:
                     raise ValueError(f"Invalid action: {action}")
+                if quantity < 0:
+                    raise ValueError("Quantity must be non-negative")
+                parsed.append((update, variant_id, action, quantity))
+            except (KeyError, TypeError, ValueError, ValidationError) as e:
+                fail(update, e)
+
+        variants = {
+            variant.pk: variant
+            for variant in ProductVariant.objects.select_for_update(of=("self",))
+            .select_related("product")
+            .filter(pk__in={variant_id for _, variant_id, _, _ in parsed})
+            .order_by("pk")
+        }
+        before = {
+            pk: {field: getattr(variant, field) for field in VARIANT_ALERT_FIELDS}
+            for pk, variant in variants.items()
+        }
 
-                variant.save(update_fields=["stock_quantity"])
-                results["success"].append(variant_id)
-
-                # Clear cache for this product
-                ProductVariantService._clear_product_caches(variant.product_id)
+        records = []
+        for update, variant_id, action, quantity in parsed:
+            variant = variants.get(variant_id)
+            if variant is None:
+                fail(update, f"Variant {variant_id} not found")
+                continue
+
+            previous = {field: getattr(variant, field) for field in STOCK_FIELDS}
+            if action == "set":
+                new_total = quantity
+            elif action == "add":
+                new_total = variant.total_inventory + quantity
+            else:
+                new_total = max(0, variant.total_inventory - quantity)
+            if new_total < variant.in_escrow_inventory:
+                fail(
+                    update,
+                    f"Total inventory {new_total} is below the "
+                    f"{variant.in_escrow_inventory} units held in escrow",
+                )
+                continue
 
-            except Exception as e:
-                results["errors"].append(
-                    {"variant_id": update.get("variant_id"), "error": str(e)}
+            variant.total_inventory = new_total
+            variant.available_inventory = min(
+                variant.available_inventory, new_total - variant.in_escrow_inventory
+            )
+            records.append(
+                InventoryTransaction(
+                    product_id=variant.product_id,
+                    variant=variant,
+                    transaction_type="ADD" if action == "add" else "ADJUST",
+                    quantity=new_total - previous["total_inventory"],
+                    previous_total=previous["total_inventory"],
+                    previous_available=previous["available_inventory"],
+                    previous_in_escrow=previous["in_escrow_inventory"],
+                    new_total=variant.total_inventory,
+                    new_available=variant.available_inventory,
+                    new_in_escrow=variant.in_escrow_inventory,
+                    created_by=user,
+                    notes=f"Bulk stock update: {action} {quantity}",
                 )
+            )
+            results["success"].append(update["variant_id"])
+
+        changed = {record.variant_id: record.variant for record in records}
+        ProductVariant.objects.bulk_update(
+            changed.values(),
+            ["total_inventory", "available_inventory"],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        InventoryTransaction.objects.bulk_create(records, batch_size=BULK_BATCH_SIZE)
+
+        # bulk_update skips the variant save signals
+        VariantMatrixService.invalidate_stock(
+            [
+                {"id": variant.pk, "product_id": variant.product_id}
+                for variant in changed.values()
+            ]
+        )
+        for variant in changed.values():
+            WatchlistAlertService.schedule(
+                variant.product_id,
+                WatchlistAlertService.variant_changes(before[variant.pk], variant),
+            )
+        for product_id in {variant.product_id for variant in changed.values()}:
+            ProductVariantService._clear_product_caches(product_id)
 
         return results
 
@@ -932,6 +960,45 @@ class ProductVariantService:
 
         return result
 
+    @staticmethod
+    def _clear_product_caches(product_id: int, lists: bool = True):
+        """
+        After commit, invalidate what a variant post_save would for the
+        product; bulk writes skip those signals and call this once instead.
+        Stock movements (through ProductVariantQuerySet) pass ``lists=False``:
+        they leave the product lists alone and only drop this product's
+        detail and variant caches.
+        """
+
+        def invalidate_caches():
+            from apps.products.services.product_detail_service import (
+                ProductDetailService,
+            )
+            from apps.products.services.product_list_service import (
+                ProductCacheInvalidationService,
+            )
+
+            short_code = (
+                Product.objects.filter(pk=product_id)
+                .values_list("short_code", flat=True)
+                .first()
+            )
+            if short_code:
+                ProductDetailService.invalidate_product_cache(short_code)
+            if lists:
+                ProductCacheInvalidationService.invalidate_all_product_caches()
+            ProductVariantService.invalidate_product_variant_detail_caches(product_id)
+
+        transaction.on_commit(invalidate_caches)
+
+    @staticmethod
+    def _invalidate_variant_types_cache():
+        transaction.on_commit(
+            lambda: CacheManager.invalidate_key(
+                "product_variant", "types", active_only=True, with_options=True
+            )
+        )
+
     @staticmethod
     def invalidate_variant_detail_caches():
         from django_redis import get_redis_connection
@@ -942,12 +1009,26 @@ class ProductVariantService:
         logger.info("Deleting detail caches with pattern")
         raw_keys = redis_conn.smembers(ProductVariantService.DETAIL_KEYS_SET)
         decoded_keys = [k.decode("utf-8") for k in raw_keys]
-        print(decoded_keys)
         for key in decoded_keys:
             logger.info(f"Deleted single key: {key}")
             cache.delete(key)
             logger.info(f"✅ Deleted {key} list cache keys")
 
+    @staticmethod
+    def invalidate_product_variant_detail_caches(product_id):
+        """Delete the variant detail caches of one product"""
+        from django_redis import get_redis_connection
+
+        redis_conn = get_redis_connection("default")
+        keys_set = ProductVariantService.PRODUCT_DETAIL_KEYS_SET.format(
+            product_id=product_id
+        )
+        keys = [k.decode("utf-8") for k in redis_conn.smembers(keys_set)]
+        if keys:
+            cache.delete_many(keys)
+            redis_conn.srem(ProductVariantService.DETAIL_KEYS_SET, *keys)
+        redis_conn.delete(keys_set)
+
     # ==========================================
     # ASYNC METHOD WRAPPERS
     # ==========================================
@@ -0,0 +1,129 @@
+import logging
+from decimal import Decimal
+from typing import Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+
+logger = logging.getLogger(__name__)
+
+PRICE_DROP = "product_price_drop"
+BACK_IN_STOCK = "product_back_in_stock"
+
+# Fields whose changes can produce a watcher alert, per model
+PRODUCT_ALERT_FIELDS = ("price", "is_active", "status")
+VARIANT_ALERT_FIELDS = ("price", "total_inventory", "in_escrow_inventory", "is_active")
+
+
+class WatchlistAlertService:
+    """
+    Detects price drops and availability changes on products and variants
+    and fans them out to watchers.
+
+    Signals snapshot the stored values before a save; after commit, a real
+    change enqueues ``notify_product_watchers``, at most once per product
+    and event every ``WATCHLIST_ALERT_COOLDOWN`` seconds.
+    """
+
+    COOLDOWN = getattr(settings, "WATCHLIST_ALERT_COOLDOWN", 60 * 60)
+
+    @staticmethod
+    def snapshot_from_db(model, pk, fields) -> Optional[Dict]:
+        return model.objects.filter(pk=pk).values(*fields).first()
+
+    @staticmethod
+    def needs_snapshot(instance, fields, update_fields) -> bool:
+        if instance._state.adding:
+            return False
+        return update_fields is None or bool(set(update_fields) & set(fields))
+
+    @staticmethod
+    def _price_dropped(before, after) -> bool:
+        return (
+            before["price"] is not None
+            and after["price"] is not None
+            and Decimal(after["price"]) < Decimal(before["price"])
+        )
+
+    @classmethod
+    def product_changes(cls, before: Optional[Dict], product) -> list:
+        """[(event, context)] for a saved product compared with ``before``"""
+        if not before:
+            return []
+
+        changes = []
+        context = {"product_id": str(product.id), "product_title": product.title}
+        is_live = product.is_active and product.status == product.ProductsStatus.ACTIVE
+        if is_live and cls._price_dropped(before, {"price": product.price}):
+            changes.append(
+                (
+                    PRICE_DROP,
+                    {
+                        **context,
+                        "old_price": str(before["price"]),
+                        "new_price": str(product.price),
+                    },
+                )
+            )
+
+        was_live = (
+            before["is_active"] and before["status"] == product.ProductsStatus.ACTIVE
+        )
+        if is_live and not was_live:
+            changes.append((BACK_IN_STOCK, context))
+        return changes
+
+    @classmethod
+    def variant_changes(cls, before: Optional[Dict], variant) -> list:
+        """[(event, context)] for a saved variant compared with ``before``"""
+        if not before or not variant.is_active:
+            return []
+
+        changes = []
+        context = {
+            "product_id": str(variant.product_id),
+            "product_title": variant.product.title,
+            "sku": variant.sku,
+        }
+        if cls._price_dropped(before, {"price": variant.price}):
+            changes.append(
+                (
+                    PRICE_DROP,
+                    {
+                        **context,
+                        "old_price": str(before["price"]),
+                        "new_price": str(variant.price),
+                    },
+                )
+            )
+
+        was_available = before["is_active"] and (
+            before["total_inventory"] - before["in_escrow_inventory"] > 0
+        )
+        if variant.available_quantity > 0 and not was_available:
+            changes.append((BACK_IN_STOCK, context))
+        return changes
+
+    @classmethod
+    def schedule(cls, product_id, changes):
+        """Enqueue one fan-out per change once the save commits"""
+        if not changes:
+            return
+
+        def enqueue():
+            from apps.products.tasks.watchlist import notify_product_watchers
+
+            for event, context in changes:
+                cooldown_key = CacheKeyManager.make_key(
+                    "watchlist", "alert_cooldown", product_id=product_id, event=event
+                )
+                # cache.add is atomic: only the first change in the window wins
+                if not cache.add(cooldown_key, 1, cls.COOLDOWN):
+                    logger.info(f"Skipping {event} alert for {product_id}: cooldown")
+                    continue
+                notify_product_watchers.delay(str(product_id), event, context)
+
+        transaction.on_commit(enqueue)
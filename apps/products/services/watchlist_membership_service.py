@@ -0,0 +1,148 @@
+import logging
+from typing import Dict, Iterable, Set
+
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+from redis.exceptions import WatchError
+
+from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.models import ProductWatchlistItem
+
+logger = logging.getLogger(__name__)
+
+
+class WatchlistMembershipService:
+    """
+    Per-user watchlist membership kept in a Redis SET of product ids.
+
+    The ``ProductWatchlistItem`` save/delete signals (and
+    ``bulk_add_products``, which skips them) write through to the set after
+    commit, so "is this watched?" for a whole page of products is one
+    ``SMISMEMBER`` and the per-user size used by limit checks is ``SCARD``.
+    A companion marker key says the set has been loaded from the database;
+    without it the set is (re)built from ``ProductWatchlistItem`` on first
+    use. Every write-through also bumps a generation key; a rebuild watches
+    it across its database read and is discarded if a write-through landed
+    meanwhile, since the rows it read may predate that commit. The keys
+    expire after ``WATCHLIST_MEMBERSHIP_TTL`` seconds.
+    """
+
+    TTL = getattr(settings, "WATCHLIST_MEMBERSHIP_TTL", 60 * 60 * 24)
+
+    @staticmethod
+    def _keys(user_id):
+        return tuple(
+            CacheKeyManager.make_key("watchlist_membership", name, user_id=user_id)
+            for name in ("members", "loaded", "generation")
+        )
+
+    @staticmethod
+    def _product_ids(user_id) -> Set[str]:
+        return {
+            str(pid)
+            for pid in ProductWatchlistItem.objects.filter(user_id=user_id)
+            .order_by()
+            .values_list("product_id", flat=True)
+        }
+
+    @classmethod
+    def _load(cls, user_id) -> Set[str]:
+        """
+        Rebuild a user's membership set from the database and return the
+        product ids read. The set is left unloaded if a write-through ran
+        during the read, so the next read rebuilds it.
+        """
+        members_key, loaded_key, generation_key = cls._keys(user_id)
+        with get_redis_connection("default").pipeline() as pipe:
+            pipe.watch(generation_key)
+            product_ids = cls._product_ids(user_id)
+            pipe.multi()
+            pipe.delete(members_key)
+            if product_ids:
+                pipe.sadd(members_key, *product_ids)
+                pipe.expire(members_key, cls.TTL)
+            pipe.set(loaded_key, 1, ex=cls.TTL)
+            try:
+                pipe.execute()
+            except WatchError:
+                logger.debug(f"Watchlist membership of {user_id} changed during load")
+        return product_ids
+
+    @classmethod
+    def load(cls, user_id) -> int:
+        """Rebuild a user's membership set from the database"""
+        return len(cls._load(user_id))
+
+    @classmethod
+    def get_watch_status(cls, user_id, product_ids: Iterable) -> Dict[str, bool]:
+        """Map each product id (as a string) to whether the user watches it"""
+        product_ids = [str(pid) for pid in product_ids]
+        if not product_ids:
+            return {}
+
+        members_key, loaded_key, _ = cls._keys(user_id)
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.exists(loaded_key)
+        pipe.smismember(members_key, product_ids)
+        loaded, flags = pipe.execute()
+        if not loaded:
+            members = cls._load(user_id)
+            flags = [pid in members for pid in product_ids]
+
+        return {pid: bool(flag) for pid, flag in zip(product_ids, flags)}
+
+    @classmethod
+    def count(cls, user_id) -> int:
+        """Number of products in the user's watchlist"""
+        members_key, loaded_key, _ = cls._keys(user_id)
+        pipe = get_redis_connection("default").pipeline(transaction=False)
+        pipe.exists(loaded_key)
+        pipe.scard(members_key)
+        loaded, size = pipe.execute()
+        if not loaded:
+            return cls.load(user_id)
+        return size
+
+    @classmethod
+    def add(cls, user_id, product_ids: Iterable):
+        cls._write_through(user_id, product_ids, "sadd")
+
+    @classmethod
+    def remove(cls, user_id, product_ids: Iterable):
+        cls._write_through(user_id, product_ids, "srem")
+
+    @classmethod
+    def _write_through(cls, user_id, product_ids, command):
+        product_ids = [str(pid) for pid in product_ids]
+        if not product_ids:
+            return
+        members_key, _, generation_key = cls._keys(user_id)
+
+        def apply():
+            try:
+                pipe = get_redis_connection("default").pipeline(transaction=True)
+                getattr(pipe, command)(members_key, *product_ids)
+                pipe.expire(members_key, cls.TTL)
+                pipe.incr(generation_key)
+                pipe.expire(generation_key, cls.TTL)
+                pipe.execute()
+            except Exception as e:
+                # A stale set would answer wrongly until it expires; drop it
+                logger.error(f"Error updating watchlist membership: {e}")
+                cls.forget(user_id)
+
+        transaction.on_commit(apply)
+
+    @classmethod
+    def forget(cls, user_id):
+        """Drop the cached set so the next read reloads it"""
+        members_key, loaded_key, generation_key = cls._keys(user_id)
+        try:
+            pipe = get_redis_connection("default").pipeline(transaction=True)
+            pipe.delete(members_key, loaded_key)
+            pipe.incr(generation_key)
+            pipe.expire(generation_key, cls.TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error clearing watchlist membership: {e}")
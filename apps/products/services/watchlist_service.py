@@ -2,7 +2,8 @@
 import uuid
 import logging
 from datetime import datetime, timedelta
-from django.db.models import Count, Prefetch, Min, Max
+from django.utils import timezone
+from django.db.models import Count, F, Prefetch, Q
 from django.db import transaction
 from django.shortcuts import get_object_or_404
 from django.core.cache import cache
@@ -18,6 +19,11 @@ from apps.products.utils.exceptions import (
 )
 
 from apps.products.models import ProductWatchlistItem
+from apps.products.services.counter_service import ProductCounterService
+from apps.products.services.watchlist_membership_service import (
+    WatchlistMembershipService,
+)
+from apps.products.services.watchlist_summary_service import WatchlistSummaryService
 
 logger = logging.getLogger(__name__)
 
@@ -145,12 +151,12 @@ class WatchlistService:
         user, target_user_id: Optional[str] = None, force_refresh: bool = False
     ) -> WatchlistStats:
         """
-        Calculate comprehensive watchlist statistics with caching.
+        Read watchlist statistics from the user's incremental summary row.
 
         Args:
             user: The requesting user
             target_user_id: Optional user ID for staff operations
-            force_refresh: Whether to bypass cache
+            force_refresh: Whether to rebuild the summary from the watchlist
 
         Returns:
             WatchlistStats: Comprehensive statistics object
@@ -159,81 +165,24 @@ class WatchlistService:
             effective_user_id = WatchlistService.validate_user_permissions(
                 user, target_user_id
             )
-            # Generate cache key
-            cache_key = WatchlistService.get_cache_key(
-                "stats", user_id=effective_user_id
+            summary = (
+                WatchlistSummaryService.rebuild(effective_user_id)
+                if force_refresh
+                else WatchlistSummaryService.get(effective_user_id)
             )
 
-            # Check cache unless force refresh
-            if not force_refresh:
-                cached_stats = cache.get(cache_key)
-                if cached_stats is not None:
-                    logger.info(f"Returning cached stats for user {effective_user_id}")
-                    return cached_stats
-
-            # Build queryset
-            base_queryset = WatchlistService.get_user_watchlist_queryset(
-                user, target_user_id
+            category_counts = WatchlistService._named_category_counts(
+                summary.category_counts
             )
-
-            # Get basic counts
-            total_items = base_queryset.count()
-
-            if total_items == 0:
-                stats = WatchlistStats(
-                    total_items=0,
-                    recently_added=[],
-                    most_watched_categories=[],
-                    categories_count=0,
-                )
-            else:
-                # Get date range information
-                date_info = base_queryset.aggregate(
-                    oldest=Min("added_at"), newest=Max("added_at")
-                )
-
-                # Get recently added items (limit to prevent memory issues)
-                recently_added = list(
-                    base_queryset.order_by("-added_at")[:10].values_list(
-                        "product_id", flat=True
-                    )
-                )
-
-                # Get category statistics with proper handling
-                category_stats = list(
-                    base_queryset.exclude(product__category__isnull=True)
-                    .values("product__category__name")
-                    .annotate(count=Count("id"))
-                    .order_by("-count")[:10]
-                )
-
-                most_watched_categories = [
-                    {"name": item["product__category__name"], "count": item["count"]}
-                    for item in category_stats
-                ]
-
-                # Count unique categories
-                categories_count = (
-                    base_queryset.values("product__category").distinct().count()
-                )
-
-                stats = WatchlistStats(
-                    total_items=total_items,
-                    recently_added=recently_added,
-                    most_watched_categories=most_watched_categories,
-                    oldest_item_date=date_info["oldest"],
-                    newest_item_date=date_info["newest"],
-                    categories_count=categories_count,
-                )
-
-            # Cache the result
-            cache.set(cache_key, stats, CACHE_TTL)
-            logger.info(
-                f"Generated watchlist stats for user {effective_user_id}: {total_items} items"
+            return WatchlistStats(
+                total_items=summary.total_items,
+                recently_added=summary.recent_product_ids,
+                most_watched_categories=category_counts[:10],
+                oldest_item_date=summary.oldest_added_at,
+                newest_item_date=summary.newest_added_at,
+                categories_count=len(category_counts),
             )
 
-            return stats
-
         except Exception as e:
             logger.error(f"Error generating watchlist stats: {e}")
             # Return empty stats on error
@@ -244,6 +193,35 @@ class WatchlistService:
                 categories_count=0,
             )
 
+    @staticmethod
+    def _named_category_counts(category_counts: Dict[str, int]) -> List[Dict]:
+        """[{name, count}] sorted by count, names from the breadcrumb index"""
+        from apps.categories.models import Category
+        from apps.categories.utils.breadcrumb_index import CategoryBreadcrumbIndex
+
+        names = {}
+        for category_id in category_counts:
+            chain = CategoryBreadcrumbIndex.get_chain(category_id)
+            if chain:
+                names[category_id] = chain[-1][1]
+        missing = set(category_counts) - set(names)
+        if missing:
+            names.update(
+                (str(pk), name)
+                for pk, name in Category.objects.filter(id__in=missing).values_list(
+                    "id", "name"
+                )
+            )
+
+        return sorted(
+            (
+                {"name": names.get(category_id), "count": count}
+                for category_id, count in category_counts.items()
+            ),
+            key=lambda item: item["count"],
+            reverse=True,
+        )
+
     @staticmethod
     def is_product_in_watchlist(
         user, product_id: Union[str, uuid.UUID], use_cache: bool = True
@@ -269,28 +247,60 @@ class WatchlistService:
                     return False
 
             if use_cache:
-                cache_key = WatchlistService.get_cache_key(
-                    "check_product", user_id=user.id, product_id=str(product_id)
+                watched = WatchlistService.get_watch_status(user, [product_id])
+                # The set holds every watched product, active or not
+                return (
+                    watched[str(product_id)]
+                    and Product.objects.filter(id=product_id, is_active=True).exists()
                 )
 
-                cached_result = cache.get(cache_key)
-                if cached_result is not None:
-                    return cached_result
-
-            result = ProductWatchlistItem.objects.filter(
+            return ProductWatchlistItem.objects.filter(
                 user=user, product_id=product_id, product__is_active=True
             ).exists()
 
-            if use_cache:
-                # Cache for shorter time since this can change frequently
-                cache.set(cache_key, result, CACHE_TTL // 2)
-
-            return result
-
         except Exception as e:
             logger.error(f"Error checking product in watchlist: {e}")
             return False
 
+    @staticmethod
+    def get_watch_status(
+        user, product_ids: List[Union[str, uuid.UUID]]
+    ) -> Dict[str, bool]:
+        """
+        Batch "is it watched?" lookup for a page of products.
+
+        Args:
+            user: The user to check for
+            product_ids: Product IDs to check
+
+        Returns:
+            Dict mapping each product ID (as a string) to a bool
+        """
+        product_ids = [str(pid) for pid in product_ids]
+        if not user or not user.is_authenticated:
+            return {pid: False for pid in product_ids}
+
+        try:
+            return WatchlistMembershipService.get_watch_status(user.id, product_ids)
+        except Exception as e:
+            logger.error(f"Error reading watchlist membership: {e}")
+            watched = {
+                str(pid)
+                for pid in ProductWatchlistItem.objects.filter(
+                    user=user, product_id__in=product_ids
+                ).values_list("product_id", flat=True)
+            }
+            return {pid: pid in watched for pid in product_ids}
+
+    @staticmethod
+    def get_user_watchlist_size(user) -> int:
+        """O(1) watchlist size from the membership set, for limit checks"""
+        try:
+            return WatchlistMembershipService.count(user.id)
+        except Exception as e:
+            logger.error(f"Error reading watchlist size: {e}")
+            return ProductWatchlistItem.objects.filter(user=user).count()
+
     @staticmethod
     def get_product_watchlist_count(
         product_id: Union[str, uuid.UUID], use_cache: bool = True
@@ -370,7 +380,7 @@ class WatchlistService:
                     )
 
             # Check if user has reached watchlist limit
-            current_count = ProductWatchlistItem.objects.filter(user=user).count()
+            current_count = WatchlistService.get_user_watchlist_size(user)
             if current_count >= MAX_WATCHLIST_SIZE:
                 return WatchlistOperationResult(
                     success=False,
@@ -470,9 +480,9 @@ class WatchlistService:
 
             # Check if product exists in watchlist
             try:
-                watchlist_item = ProductWatchlistItem.objects.get(
-                    user=user, product_id=product_id
-                )
+                watchlist_item = ProductWatchlistItem.objects.select_related(
+                    "product"
+                ).get(user=user, product_id=product_id)
 
             except ProductWatchlistItem.DoesNotExist:
                 return WatchlistOperationResult(
@@ -538,7 +548,7 @@ class WatchlistService:
                     )
 
             # Check if user has reached watchlist limit
-            current_count = ProductWatchlistItem.objects.filter(user=user).count()
+            current_count = WatchlistService.get_user_watchlist_size(user)
 
             # Get or validate product exists and is active
             try:
@@ -663,7 +673,7 @@ class WatchlistService:
 
             # Check watchlist size limit
             if validate_limit:
-                current_count = ProductWatchlistItem.objects.filter(user=user).count()
+                current_count = WatchlistService.get_user_watchlist_size(user)
                 if current_count + len(validated_product_ids) > MAX_WATCHLIST_SIZE:
                     return WatchlistOperationResult(
                         success=False,
@@ -673,11 +683,12 @@ class WatchlistService:
                     )
 
             # Validate all products exist and are active
-            valid_products = set(
+            product_categories = dict(
                 Product.objects.filter(
                     id__in=validated_product_ids, is_active=True
-                ).values_list("id", flat=True)
+                ).values_list("id", "category_id")
             )
+            valid_products = set(product_categories)
 
             invalid_products = set(validated_product_ids) - valid_products
             if invalid_products:
@@ -705,13 +716,42 @@ class WatchlistService:
                     for product_id in new_product_ids
                 ]
 
-                created_items = ProductWatchlistItem.objects.bulk_create(
+                ProductWatchlistItem.objects.bulk_create(
                     watchlist_items, ignore_conflicts=True
                 )
+                # ignore_conflicts returns every object, including those a
+                # concurrent add beat us to; their client-side ids never landed
+                inserted_ids = set(
+                    ProductWatchlistItem.objects.filter(
+                        pk__in=[item.pk for item in watchlist_items]
+                    ).values_list("pk", flat=True)
+                )
+                created_items = [
+                    item for item in watchlist_items if item.pk in inserted_ids
+                ]
+                added_product_ids = [item.product_id for item in created_items]
                 added_count = len(created_items)
 
+                # bulk_create skips the post_save counter, membership and
+                # summary signals
+                ProductCounterService.adjust_many(
+                    {product_id: 1 for product_id in added_product_ids},
+                    "cached_watchers_count",
+                )
+
+                WatchlistMembershipService.add(user.id, added_product_ids)
+                WatchlistSummaryService.record_added(
+                    user.id,
+                    [
+                        WatchlistSummaryService.change(
+                            item, product_categories[item.product_id]
+                        )
+                        for item in created_items
+                    ],
+                )
+
                 # Invalidate caches
-                for pid in new_product_ids:
+                for pid in added_product_ids:
                     WatchlistService._invalidate_caches_for_user_and_product(
                         user.id, pid
                     )
@@ -802,11 +842,21 @@ class WatchlistService:
                 )
 
             # Perform bulk delete
-            removed_count, _ = ProductWatchlistItem.objects.filter(
+            items = ProductWatchlistItem.objects.filter(
                 user=user, product_id__in=validated_product_ids
-            ).delete()
+            )
+            removed = list(
+                items.values(
+                    "product_id", "added_at", category_id=F("product__category_id")
+                )
+            )
+            # One summary update for the batch instead of one per row
+            items._summary_recorded = True
+            removed_count, _ = items.delete()
 
             if removed_count > 0:
+                WatchlistSummaryService.record_removed(user.id, removed)
+
                 # Invalidate caches
                 for pid in validated_product_ids:
                     WatchlistService._invalidate_caches_for_user_and_product(
@@ -846,11 +896,9 @@ class WatchlistService:
         """
         try:
             # User-specific cache keys
+            # Membership itself is written through by WatchlistMembershipService
             user_cache_keys = [
                 WatchlistService.get_cache_key("stats", user_id=user_id),
-                WatchlistService.get_cache_key(
-                    "check_product", user_id=user_id, product_id=str(product_id)
-                ),
             ]
 
             # Product-specific cache keys
@@ -900,12 +948,8 @@ class WatchlistService:
             if cached_insights is not None:
                 return cached_insights
 
-            queryset = WatchlistService.get_user_watchlist_queryset(
-                user, target_user_id
-            )
-
-            # Calculate insights
-            total_items = queryset.count()
+            summary = WatchlistSummaryService.get(effective_user_id)
+            total_items = summary.total_items
 
             if total_items == 0:
                 insights = {
@@ -914,20 +958,27 @@ class WatchlistService:
                     "recommendations": ["Start adding products to your watchlist"],
                 }
             else:
-                # Time-based analysis
-                now = datetime.now()
+                # Time-based analysis (one indexed pass over recent rows)
+                now = timezone.now()
                 last_week = now - timedelta(days=7)
                 last_month = now - timedelta(days=30)
 
-                recent_additions = queryset.filter(added_at__gte=last_week).count()
-                monthly_additions = queryset.filter(added_at__gte=last_month).count()
-
-                # Category distribution
-                category_distribution = list(
-                    queryset.values("product__category__name")
-                    .annotate(count=Count("id"))
-                    .order_by("-count")
+                activity = ProductWatchlistItem.objects.filter(
+                    user_id=effective_user_id, added_at__gte=last_month
+                ).aggregate(
+                    last_week=Count("id", filter=Q(added_at__gte=last_week)),
+                    last_month=Count("id"),
                 )
+                recent_additions = activity["last_week"]
+                monthly_additions = activity["last_month"]
+
+                # Category distribution from the summary row
+                category_distribution = [
+                    {"product__category__name": item["name"], "count": item["count"]}
+                    for item in WatchlistService._named_category_counts(
+                        summary.category_counts
+                    )
+                ]
 
                 # Price range analysis (if price field exists)
                 # This would depend on your Product model structure
@@ -941,7 +992,7 @@ class WatchlistService:
                     "category_distribution": category_distribution[:10],
                     "activity_summary": f"{recent_additions} items added this week",
                     "recommendations": WatchlistService._generate_recommendations(
-                        queryset, category_distribution
+                        total_items, category_distribution
                     ),
                 }
 
@@ -953,13 +1004,13 @@ class WatchlistService:
             return {"error": "Unable to generate insights"}
 
     @staticmethod
-    def _generate_recommendations(queryset, category_distribution) -> List[str]:
+    def _generate_recommendations(
+        total_items: int, category_distribution
+    ) -> List[str]:
         """Generate personalized recommendations based on watchlist data."""
         recommendations = []
 
         try:
-            total_items = queryset.count()
-
             if total_items > 50:
                 recommendations.append(
                     "Consider organizing your watchlist by removing items you're no longer interested in"
@@ -0,0 +1,169 @@
+import logging
+from typing import Dict, Iterable, List
+
+from django.db import transaction
+from django.db.models import Count, Max, Min
+
+from apps.products.models import ProductWatchlistItem, WatchlistSummary
+
+logger = logging.getLogger(__name__)
+
+
+class WatchlistSummaryService:
+    """
+    Maintains WatchlistSummary rows.
+
+    The ``ProductWatchlistItem`` save/delete signals adjust the user's row
+    under a row lock: totals and per-category counts by delta, dates and the
+    recent list in place. ``bulk_add_products`` and ``bulk_remove_products``
+    record their whole batch in one call instead. Only removing the
+    oldest/newest or a recent item costs a query on ``ProductWatchlistItem``.
+    Deletes too large to apply row by row, such as a product cascading to
+    its watchers, ``discard`` the rows instead. A missing row is rebuilt from
+    the watchlist on first use.
+
+    Each change is a dict with ``product_id``, ``category_id`` and
+    ``added_at``.
+    """
+
+    RECENT_LIMIT = 10
+
+    @classmethod
+    def get(cls, user_id) -> WatchlistSummary:
+        summary = WatchlistSummary.objects.filter(user_id=user_id).first()
+        return summary or cls.rebuild(user_id)
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, user_id) -> WatchlistSummary:
+        """Recompute a user's summary from the watchlist table"""
+        items = ProductWatchlistItem.objects.filter(user_id=user_id)
+        dates = items.aggregate(
+            total=Count("id"), oldest=Min("added_at"), newest=Max("added_at")
+        )
+        category_counts = {
+            str(row["product__category_id"]): row["count"]
+            for row in items.filter(product__category__isnull=False)
+            .values("product__category_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        }
+        summary, _ = WatchlistSummary.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                "total_items": dates["total"],
+                "category_counts": category_counts,
+                "recent_product_ids": cls._recent_ids(items),
+                "oldest_added_at": dates["oldest"],
+                "newest_added_at": dates["newest"],
+            },
+        )
+        return summary
+
+    @staticmethod
+    def change(watchlist_item, category_id) -> Dict:
+        return {
+            "product_id": watchlist_item.product_id,
+            "category_id": category_id,
+            "added_at": watchlist_item.added_at,
+        }
+
+    @staticmethod
+    def discard(user_ids):
+        """
+        Drop the summary rows of ``user_ids`` (a list or a values queryset)
+        in one DELETE; each is rebuilt on its next read. Used for deletes
+        too large to apply row by row.
+        """
+        WatchlistSummary.objects.filter(user_id__in=user_ids).delete()
+
+    @classmethod
+    def _locked(cls, user_id, rebuild_missing=True):
+        """The user's row locked for update, or None if it was missing"""
+        summary = (
+            WatchlistSummary.objects.select_for_update()
+            .filter(user_id=user_id)
+            .first()
+        )
+        if summary is None and rebuild_missing:
+            # The watchlist write is already in this transaction
+            cls.rebuild(user_id)
+        return summary
+
+    @classmethod
+    @transaction.atomic
+    def record_added(cls, user_id, changes: Iterable[Dict]):
+        changes = list(changes)
+        if not changes:
+            return
+        summary = cls._locked(user_id)
+        if summary is None:
+            return
+
+        counts = summary.category_counts
+        for change in changes:
+            if change["category_id"]:
+                key = str(change["category_id"])
+                counts[key] = counts.get(key, 0) + 1
+
+        added = sorted(changes, key=lambda change: change["added_at"], reverse=True)
+        recent = [str(change["product_id"]) for change in added]
+        recent += [pid for pid in summary.recent_product_ids if pid not in recent]
+
+        oldest, newest = added[-1]["added_at"], added[0]["added_at"]
+        summary.total_items += len(changes)
+        summary.recent_product_ids = recent[: cls.RECENT_LIMIT]
+        if summary.oldest_added_at is None or oldest < summary.oldest_added_at:
+            summary.oldest_added_at = oldest
+        if summary.newest_added_at is None or newest > summary.newest_added_at:
+            summary.newest_added_at = newest
+        summary.save()
+
+    @classmethod
+    @transaction.atomic
+    def record_removed(cls, user_id, changes: Iterable[Dict]):
+        changes = list(changes)
+        if not changes:
+            return
+        # Left missing: a user delete may already have cascaded to the row
+        summary = cls._locked(user_id, rebuild_missing=False)
+        if summary is None:
+            return
+
+        counts = summary.category_counts
+        for change in changes:
+            key = str(change["category_id"])
+            if change["category_id"] and key in counts:
+                counts[key] -= 1
+                if counts[key] <= 0:
+                    del counts[key]
+
+        removed_ids = {str(change["product_id"]) for change in changes}
+        removed_dates = {change["added_at"] for change in changes}
+        summary.total_items = max(summary.total_items - len(changes), 0)
+        summary.recent_product_ids = [
+            pid for pid in summary.recent_product_ids if pid not in removed_ids
+        ]
+
+        items = ProductWatchlistItem.objects.filter(user_id=user_id)
+        if summary.total_items == 0:
+            summary.oldest_added_at = summary.newest_added_at = None
+            summary.recent_product_ids = []
+        elif removed_dates & {summary.oldest_added_at, summary.newest_added_at}:
+            dates = items.aggregate(oldest=Min("added_at"), newest=Max("added_at"))
+            summary.oldest_added_at = dates["oldest"]
+            summary.newest_added_at = dates["newest"]
+
+        wanted = min(cls.RECENT_LIMIT, summary.total_items)
+        if len(summary.recent_product_ids) < wanted:
+            summary.recent_product_ids = cls._recent_ids(items)
+        summary.save()
+
+    @classmethod
+    def _recent_ids(cls, items) -> List[str]:
+        return [
+            str(pid)
+            for pid in items.order_by("-added_at").values_list(
+                "product_id", flat=True
+            )[: cls.RECENT_LIMIT]
+        ]
@@ -2,3 +2,5 @@ from .base import *  # noqa: F401, F403
 from .brand import *  # noqa: F401, F403
 from .search import *  # noqa: F401, F403
 from .variant import *  # noqa: F401, F403
+from .counters import *  # noqa: F401, F403
+from .watchlist import *  # noqa: F401, F403
@@ -1,11 +1,16 @@
 import logging
 from django.db import transaction
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 
 from apps.products.services.product_detail_service import (
     ProductDetailService,
 )
+from apps.products.services.watchlist_alert_service import (
+    PRODUCT_ALERT_FIELDS,
+    VARIANT_ALERT_FIELDS,
+    WatchlistAlertService,
+)
 from apps.products.tasks import generate_seo_keywords_for_product
 
 
@@ -35,9 +40,6 @@ def invalidate_product_cache_on_save(sender, instance, created, **kwargs):
                 logger.info(f"SEO generation task for product: {instance.title}")
 
         if not created:
-            # Import here to avoid circular imports
-            from apps.products.services import ProductDetailService
-
             ProductDetailService.invalidate_product_cache(instance.short_code)
             logger.info(f"Invalidated detail cache for product {instance.short_code}")
 
@@ -61,7 +63,6 @@ def invalidate_product_cache_on_delete(sender, instance, **kwargs):
         logger.info("=== PRODUCT DELETED - CACHE INVALIDATION ===")
         logger.info(f"Product: {instance.short_code}")
 
-        from apps.products.services import ProductDetailService
         from apps.products.services.product_list_service import (
             ProductCacheInvalidationService,
         )
@@ -81,7 +82,6 @@ def invalidate_product_cache_on_variant_change(sender, instance, created, **kwar
 
     def invalidate_caches():
         if hasattr(instance, "product"):
-            from apps.products.services import ProductDetailService
             from apps.products.services import ProductVariantService
             from apps.products.services.product_list_service import (
                 ProductCacheInvalidationService,
@@ -102,6 +102,49 @@ def invalidate_product_cache_on_variant_change(sender, instance, created, **kwar
     transaction.on_commit(invalidate_caches)
 
 
+@receiver(pre_save, sender="products.Product")
+def capture_product_alert_snapshot(sender, instance, update_fields=None, **kwargs):
+    """Remember stored price/availability so post_save can detect changes"""
+    instance._alert_before = (
+        WatchlistAlertService.snapshot_from_db(
+            sender, instance.pk, PRODUCT_ALERT_FIELDS
+        )
+        if WatchlistAlertService.needs_snapshot(
+            instance, PRODUCT_ALERT_FIELDS, update_fields
+        )
+        else None
+    )
+
+
+@receiver(post_save, sender="products.Product")
+def alert_watchers_on_product_change(sender, instance, created, **kwargs):
+    changes = WatchlistAlertService.product_changes(
+        getattr(instance, "_alert_before", None), instance
+    )
+    WatchlistAlertService.schedule(instance.pk, changes)
+
+
+@receiver(pre_save, sender="products.ProductVariant")
+def capture_variant_alert_snapshot(sender, instance, update_fields=None, **kwargs):
+    instance._alert_before = (
+        WatchlistAlertService.snapshot_from_db(
+            sender, instance.pk, VARIANT_ALERT_FIELDS
+        )
+        if WatchlistAlertService.needs_snapshot(
+            instance, VARIANT_ALERT_FIELDS, update_fields
+        )
+        else None
+    )
+
+
+@receiver(post_save, sender="products.ProductVariant")
+def alert_watchers_on_variant_change(sender, instance, created, **kwargs):
+    changes = WatchlistAlertService.variant_changes(
+        getattr(instance, "_alert_before", None), instance
+    )
+    WatchlistAlertService.schedule(instance.product_id, changes)
+
+
 # DEBUGGING FUNCTIONS - Add these temporarily to test if signals work at all
 @receiver(post_save)
 def debug_all_post_save_signals(sender, **kwargs):
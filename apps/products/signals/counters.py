@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.products.services.counter_service import ProductCounterService
+from apps.products.services.rating_aggregate_service import RatingAggregateService
+
+
+@receiver(post_save, sender="products.ProductWatchlistItem")
+def increment_watchers_count(sender, instance, created, **kwargs):
+    if created:
+        ProductCounterService.adjust(instance.product_id, "cached_watchers_count", 1)
+
+
+@receiver(post_delete, sender="products.ProductWatchlistItem")
+def decrement_watchers_count(sender, instance, **kwargs):
+    ProductCounterService.adjust(instance.product_id, "cached_watchers_count", -1)
+
+
+@receiver(post_save, sender="products.ProductImage")
+def increment_images_count(sender, instance, created, **kwargs):
+    if created:
+        ProductCounterService.adjust(instance.product_id, "cached_images_count", 1)
+
+
+@receiver(post_delete, sender="products.ProductImage")
+def decrement_images_count(sender, instance, **kwargs):
+    ProductCounterService.adjust(instance.product_id, "cached_images_count", -1)
+
+
+@receiver(post_delete, sender="products.ProductRating")
+def mark_rating_aggregate_dirty(sender, instance, **kwargs):
+    if instance.is_approved:
+        RatingAggregateService.mark_dirty([instance.product_id])
@@ -1,13 +1,23 @@
 import logging
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
 from apps.core.utils.cache_manager import CacheManager
 from apps.products.models import (
+    ProductVariant,
     ProductVariantOption,
     ProductVariantType,
 )
+from apps.products.models.managers import STOCK_FIELDS
+from apps.products.services.variant_matrix_service import VariantMatrixService
+from apps.products.services.variant_price_service import VariantPriceService
 
 logger = logging.getLogger("variant_performance")
 
@@ -36,3 +46,172 @@ def invalidate_options_cache_on_save(sender, instance, **kwargs):
         logger.info(f"Cache invalidated for deleted product variant: {instance.id}")
 
     transaction.on_commit(invalidate_caches)
+
+
+def _stored_value(instance, field, update_fields):
+    """The stored value of ``field`` if this save may change it, else None"""
+    if instance._state.adding:
+        return None
+    if update_fields is not None and field not in update_fields:
+        return None
+    return (
+        type(instance)
+        .objects.filter(pk=instance.pk)
+        .values_list(field, flat=True)
+        .first()
+    )
+
+
+@receiver(pre_save, sender=ProductVariantOption)
+def capture_option_price_adjustment(sender, instance, update_fields=None, **kwargs):
+    instance._price_adjustment_before = _stored_value(
+        instance, "price_adjustment", update_fields
+    )
+
+
+@receiver(post_save, sender=ProductVariantOption)
+def reprice_variants_on_option_change(sender, instance, created, **kwargs):
+    before = getattr(instance, "_price_adjustment_before", None)
+    if before is not None and before != instance.price_adjustment:
+        VariantPriceService.for_option(instance.id)
+
+
+@receiver(pre_save, sender=ProductVariantType)
+def capture_type_affects_price(sender, instance, update_fields=None, **kwargs):
+    instance._affects_price_before = _stored_value(
+        instance, "affects_price", update_fields
+    )
+
+
+@receiver(post_save, sender=ProductVariantType)
+def reprice_variants_on_type_change(sender, instance, created, **kwargs):
+    before = getattr(instance, "_affects_price_before", None)
+    if before is not None and before != instance.affects_price:
+        VariantPriceService.for_variant_type(instance.id)
+
+
+@receiver(post_save, sender="products.Product")
+def reprice_unpriced_variants(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or "price" in update_fields:
+        VariantPriceService.for_product(instance.id, instance.price)
+
+
+def _resign_after_commit(variant_ids):
+    """
+    Re-sign variants left unsigned by a conflicting intermediate edit. Any
+    still matching a sibling then are true duplicates and stay unsigned.
+    """
+
+    def resign():
+        with transaction.atomic():
+            left = ProductVariant.objects.filter(
+                id__in=variant_ids
+            ).refresh_option_signatures(defer_conflicts=True)
+        if left:
+            logger.warning(
+                f"Variants {left} duplicate a sibling's options; left unsigned"
+            )
+
+    transaction.on_commit(resign)
+
+
+@receiver(pre_delete, sender=ProductVariantOption)
+def collect_variants_on_option_delete(sender, instance, **kwargs):
+    """
+    Deleting an option (or its variant type, which cascades to it) removes
+    through rows without m2m_changed; remember the variants to reprice and
+    re-sign.
+    """
+    instance._variant_ids = list(
+        ProductVariant.objects.filter(options=instance).values_list("id", flat=True)
+    )
+
+
+@receiver(post_delete, sender=ProductVariantOption)
+def sync_variants_on_option_delete(sender, instance, **kwargs):
+    variant_ids = getattr(instance, "_variant_ids", None)
+    if not variant_ids:
+        return
+    VariantPriceService.for_variants(variant_ids)
+    deferred = ProductVariant.objects.filter(
+        id__in=variant_ids
+    ).refresh_option_signatures(defer_conflicts=True)
+    if deferred:
+        logger.warning(
+            f"Variants {deferred} duplicate a sibling's options after deleting "
+            f"option {instance.pk}; left unsigned"
+        )
+
+
+@receiver(m2m_changed, sender=ProductVariant.options.through)
+def sync_variants_on_options_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Keep final_price and option_signature in step with variant options"""
+    if not reverse:
+        variant_ids = [instance.pk]
+    elif action == "pre_clear":
+        # option.variants.clear(): remember the variants before the rows go
+        instance._cleared_variant_ids = list(
+            instance.variants.values_list("id", flat=True)
+        )
+        return
+    elif action == "post_clear":
+        variant_ids = getattr(instance, "_cleared_variant_ids", [])
+    else:
+        # option.variants.add/remove: pk_set holds variant ids
+        variant_ids = pk_set
+    if action not in ("post_add", "post_remove", "post_clear") or not variant_ids:
+        return
+
+    VariantPriceService.for_variants(variant_ids)
+    variants = ProductVariant.objects.filter(id__in=list(variant_ids))
+    # A removal may be the first half of options.set(); its add re-signs
+    deferred = variants.refresh_option_signatures(
+        defer_conflicts=action != "post_add"
+    )
+    if deferred:
+        _resign_after_commit(deferred)
+    if not reverse:
+        instance.final_price, instance.option_signature = variants.values_list(
+            "final_price", "option_signature"
+        ).get()
+
+
+@receiver(post_save, sender=ProductVariant)
+def sync_variant_matrix_on_save(sender, instance, update_fields=None, **kwargs):
+    """Stock-only saves drop the overlay field; anything else the matrix"""
+    fields = set(update_fields) if update_fields is not None else None
+    if fields is None or fields - set(STOCK_FIELDS):
+        VariantMatrixService.invalidate([instance.product_id])
+    if fields is None or fields & set(STOCK_FIELDS):
+        VariantMatrixService.invalidate_stock(
+            [{"id": instance.pk, "product_id": instance.product_id}]
+        )
+
+
+@receiver(post_delete, sender=ProductVariant)
+def invalidate_variant_matrix_on_delete(sender, instance, **kwargs):
+    VariantMatrixService.invalidate([instance.product_id])
+
+
+@receiver([post_save, pre_delete], sender=ProductVariantOption)
+def invalidate_variant_matrix_on_option_change(sender, instance, **kwargs):
+    VariantMatrixService.invalidate_for_variants(
+        ProductVariant.objects.filter(options=instance)
+    )
+
+
+@receiver([post_save, pre_delete], sender=ProductVariantType)
+def invalidate_variant_matrix_on_type_change(sender, instance, **kwargs):
+    VariantMatrixService.invalidate_for_variants(
+        ProductVariant.objects.filter(options__variant_type=instance)
+    )
+
+
+@receiver(post_save, sender="products.Product")
+def invalidate_variant_matrix_on_product_change(
+    sender, instance, update_fields=None, **kwargs
+):
+    if update_fields is None or "requires_shipping" in update_fields:
+        VariantMatrixService.invalidate([instance.pk])
@@ -0,0 +1,71 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.products.models import Product, ProductWatchlistItem
+from apps.products.services.watchlist_membership_service import (
+    WatchlistMembershipService,
+)
+from apps.products.services.watchlist_summary_service import WatchlistSummaryService
+
+
+def _category_id(instance):
+    if ProductWatchlistItem.product.is_cached(instance):
+        return instance.product.category_id
+    return (
+        Product.objects.filter(pk=instance.product_id)
+        .values_list("category_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=ProductWatchlistItem)
+def add_watchlist_membership(sender, instance, created, **kwargs):
+    if created:
+        WatchlistMembershipService.add(instance.user_id, [instance.product_id])
+
+
+@receiver(post_delete, sender=ProductWatchlistItem)
+def remove_watchlist_membership(sender, instance, **kwargs):
+    WatchlistMembershipService.remove(instance.user_id, [instance.product_id])
+
+
+@receiver(post_save, sender=ProductWatchlistItem)
+def add_to_watchlist_summary(sender, instance, created, **kwargs):
+    if created:
+        WatchlistSummaryService.record_added(
+            instance.user_id,
+            [WatchlistSummaryService.change(instance, _category_id(instance))],
+        )
+
+
+@receiver(post_delete, sender=ProductWatchlistItem)
+def remove_from_watchlist_summary(sender, instance, origin=None, **kwargs):
+    """
+    Single deletes update the summary in place. Queryset deletes flagged
+    with ``_summary_recorded`` were recorded in one call by their caller;
+    other queryset deletes drop each affected user's row once. Cascades
+    from Product are handled in bulk by ``discard_watchers_summaries`` and
+    cascades from the user delete the row with it.
+    """
+    if origin is instance:
+        WatchlistSummaryService.record_removed(
+            instance.user_id,
+            [WatchlistSummaryService.change(instance, _category_id(instance))],
+        )
+        return
+    if getattr(origin, "model", None) is not ProductWatchlistItem:
+        return
+    if getattr(origin, "_summary_recorded", False):
+        return
+    discarded = origin.__dict__.setdefault("_summary_discarded", set())
+    if instance.user_id not in discarded:
+        discarded.add(instance.user_id)
+        WatchlistSummaryService.discard([instance.user_id])
+
+
+@receiver(pre_delete, sender=Product)
+def discard_watchers_summaries(sender, instance, **kwargs):
+    """Drop every watcher's summary row in one statement before a cascade"""
+    WatchlistSummaryService.discard(
+        ProductWatchlistItem.objects.filter(product=instance).values("user_id")
+    )
@@ -1,5 +1,6 @@
 from .base import *  # noqa: F401, F403
 from .brand import *  # noqa: F401, F403
+from .counters import *  # noqa: F401, F403
 from .image import *  # noqa: F401, F403
 from .inventory import *  # noqa: F401, F403
 from .metadata import *  # noqa: F401, F403
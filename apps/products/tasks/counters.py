@@ -0,0 +1,18 @@
+import logging
+
+from celery import shared_task
+
+from apps.products.services.counter_service import ProductCounterService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def reconcile_product_counters(batch_size=1000):
+    """
+    Repair drift in the denormalized product engagement counters, e.g. after
+    queryset updates or raw SQL that bypassed the counter signals.
+    """
+    fixed = ProductCounterService.reconcile(batch_size=batch_size)
+    logger.info(f"Product counter reconciliation corrected {fixed} products")
+    return fixed
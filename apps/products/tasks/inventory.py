@@ -95,16 +95,27 @@ def generate_inventory_report(user_id, date_from=None, date_to=None):
 @shared_task
 def cleanup_old_inventory_transactions(days_old=365):
     """
-    Clean up old inventory transactions (optional maintenance task)
+    Clean up old inventory transactions in chunks (optional maintenance
+    task). Once the table is partitioned, whole months are dropped and only
+    the month straddling the cutoff is deleted from.
     """
     from django.utils import timezone
     from datetime import timedelta
 
-    cutoff_date = timezone.now() - timedelta(days=days_old)
-
-    old_transactions = InventoryTransaction.objects.filter(created_at__lt=cutoff_date)
+    from apps.core.partitioning import PartitionManager
+    from apps.core.utils.batch_delete import BatchDeleter
 
-    count = old_transactions.count()
-    old_transactions.delete()
+    cutoff_date = timezone.now() - timedelta(days=days_old)
 
-    return f"Deleted {count} inventory transactions older than {days_old} days"
+    expired = PartitionManager.for_model(InventoryTransaction).expire_before(
+        cutoff_date
+    )
+    count = BatchDeleter(
+        InventoryTransaction.objects.filter(created_at__lt=cutoff_date),
+        "cleanup_old_inventory_transactions",
+    ).run()["deleted"]
+
+    result = f"Deleted {count} inventory transactions older than {days_old} days"
+    if expired:
+        result += f" and expired partitions {', '.join(expired)}"
+    return result
@@ -1,16 +1,9 @@
 # apps/products/product_negotiation/tasks.py
 import logging
-from datetime import timedelta
-from django.utils import timezone
 from django.conf import settings
 from celery import shared_task
 
-from apps.core.utils.cache_manager import CacheManager
-from apps.products.models import (
-    PriceNegotiation,
-    NegotiationHistory,
-)
-from apps.products.services.negotiation_service import NegotiationNotificationService
+from apps.products.services.negotiation_service import NegotiationExpiryService
 
 logger = logging.getLogger("negotiation_performance")
 
@@ -21,42 +14,15 @@ def expire_old_negotiations():
     Expire old negotiations that have passed their deadline.
     Run daily to clean up stale negotiations.
     """
-    start_time = timezone.now()
-
-    # Get expiry threshold from settings
-    expiry_hours = getattr(settings, "NEGOTIATION_SETTINGS", {}).get(
-        "AUTO_EXPIRE_HOURS", 168
+    negotiation_settings = getattr(settings, "NEGOTIATION_SETTINGS", {})
+    metrics = NegotiationExpiryService.expire_stale(
+        expiry_hours=negotiation_settings.get("AUTO_EXPIRE_HOURS", 168),
+        batch_size=negotiation_settings.get("EXPIRE_BATCH_SIZE", 500),
     )
-    expiry_threshold = timezone.now() - timedelta(hours=expiry_hours)
 
-    # Find negotiations to expire
-    negotiations_to_expire = PriceNegotiation.objects.filter(
-        status__in=["pending", "countered"], updated_at__lt=expiry_threshold
+    logger.info(
+        f"Expired {metrics['expired']} negotiations in {metrics['batches']} "
+        f"batches, {metrics['duration']:.2f} seconds "
+        f"({metrics['rows_per_second']:.0f} rows/s)"
     )
-
-    expired_count = 0
-
-    for negotiation in negotiations_to_expire:
-        # Update status to expired
-        negotiation.status = "rejected"  # or create an 'expired' status
-        negotiation.save()
-
-        # Record in history
-        NegotiationHistory.objects.create(
-            negotiation=negotiation,
-            action="price_rejected",
-            user=negotiation.seller,  # System action
-            notes=f"Negotiation expired after {expiry_hours} hours of inactivity",
-        )
-
-        # Send expiration notifications
-        NegotiationNotificationService.notify_negotiation_expired(negotiation)
-
-        # Invalidate related caches
-        CacheManager.invalidate("negotiation", id=negotiation.id)
-        CacheManager.invalidate("product", id=negotiation.product.id)
-
-        expired_count += 1
-
-    duration = (timezone.now() - start_time).total_seconds()
-    logger.info(f"Expired {expired_count} negotiations in {duration:.2f} seconds")
+    return metrics
@@ -3,7 +3,9 @@ from django.utils import timezone
 from datetime import timedelta
 import logging
 
+from apps.core.partitioning import PartitionManager
 from apps.core.tasks import BaseTaskWithRetry
+from apps.core.utils.batch_delete import BatchDeleter
 from apps.products.models import SearchLog
 from apps.products.documents import ProductDocument
 
@@ -73,13 +75,23 @@ def bulk_update_seo_keywords():
 
 
 @shared_task(bind=True, base=BaseTaskWithRetry)
-def cleanup_search_logs(days_to_keep=30):
-    """Clean up old search logs"""
+def cleanup_search_logs(self, days_to_keep=30):
+    """
+    Clean up old search logs in chunks. Once the table is partitioned, whole
+    months are dropped and only the month straddling the cutoff is deleted
+    from.
+    """
     try:
         cutoff_date = timezone.now() - timedelta(days=days_to_keep)
-        deleted_count = SearchLog.objects.filter(created_at__lt=cutoff_date).delete()[0]
+        expired = PartitionManager.for_model(SearchLog).expire_before(cutoff_date)
+        deleted_count = BatchDeleter(
+            SearchLog.objects.filter(created_at__lt=cutoff_date), "cleanup_search_logs"
+        ).run()["deleted"]
 
-        logger.info(f"Cleaned up {deleted_count} old search log entries")
+        logger.info(
+            f"Cleaned up {deleted_count} old search log entries"
+            + (f" and expired partitions {', '.join(expired)}" if expired else "")
+        )
         return deleted_count
 
     except Exception as e:
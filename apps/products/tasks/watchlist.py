@@ -0,0 +1,57 @@
+import logging
+
+from celery import shared_task
+
+from apps.core.tasks import BaseTaskWithRetry
+
+logger = logging.getLogger(__name__)
+
+FANOUT_CHUNK_SIZE = 1000
+FANOUT_CHUNKS_PER_TASK = 20
+
+
+@shared_task(bind=True, base=BaseTaskWithRetry)
+def notify_product_watchers(
+    self,
+    product_id,
+    notification_type,
+    context,
+    after_id=None,
+    chunk_size=FANOUT_CHUNK_SIZE,
+):
+    """
+    Notify everyone watching a product, walking the watchlist by primary key
+    in chunks of ``chunk_size`` with one bulk insert per chunk. After
+    ``FANOUT_CHUNKS_PER_TASK`` chunks the task re-enqueues itself from the
+    last id, so memory and task runtime stay bounded for any audience size.
+    """
+    from apps.notifications.services.notification_service import (
+        NotificationService,
+    )
+    from apps.products.models import ProductWatchlistItem
+
+    watchers = ProductWatchlistItem.objects.filter(product_id=product_id).order_by(
+        "id"
+    )
+    notified = 0
+    for _ in range(FANOUT_CHUNKS_PER_TASK):
+        chunk = watchers.filter(id__gt=after_id) if after_id else watchers
+        rows = list(chunk.values_list("id", "user_id")[:chunk_size])
+        if not rows:
+            break
+
+        notified += NotificationService.bulk_notify(
+            [user_id for _, user_id in rows], notification_type, context
+        )
+        after_id = rows[-1][0]
+        if len(rows) < chunk_size:
+            break
+    else:
+        notify_product_watchers.delay(
+            product_id, notification_type, context, str(after_id), chunk_size
+        )
+
+    logger.info(
+        f"Sent {notified} {notification_type} notifications for product {product_id}"
+    )
+    return notified
@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductImage,
+    ProductWatchlistItem,
+)
+from apps.products.services.counter_service import ProductCounterService
+from apps.products.services.watchlist_service import WatchlistService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProductCounters:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        self.condition = ProductCondition.objects.create(name="New", slug="new")
+        self.category = Category.objects.create(name="Electronics", slug="elec")
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=self.condition,
+            category=self.category,
+            price=200.00,
+        )
+
+    def counters(self):
+        self.product.refresh_from_db()
+        return self.product.cached_watchers_count, self.product.cached_images_count
+
+    def test_single_writes_keep_counters_in_step(self):
+        item = ProductWatchlistItem.objects.create(
+            user=self.buyer, product=self.product
+        )
+        image = ProductImage.objects.create(
+            product=self.product, image_url="https://example.com/a.jpg"
+        )
+        assert self.counters() == (1, 1)
+
+        item.delete()
+        image.delete()
+        assert self.counters() == (0, 0)
+
+    def test_bulk_add_counts_watchers(self):
+        WatchlistService.bulk_add_products(self.buyer, [str(self.product.id)])
+        assert self.counters() == (1, 0)
+
+    def test_reconcile_repairs_drift(self):
+        ProductWatchlistItem.objects.create(user=self.buyer, product=self.product)
+        Product.objects.filter(pk=self.product.pk).update(
+            cached_watchers_count=5, cached_images_count=3
+        )
+
+        assert ProductCounterService.reconcile() == 1
+        assert self.counters() == (1, 0)
@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.categories.models import Category
+from apps.notifications.models import Notification, NotificationTemplate
+from apps.products.models import (
+    NegotiationHistory,
+    PriceNegotiation,
+    Product,
+    ProductCondition,
+)
+from apps.products.services.negotiation_service import NegotiationExpiryService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestNegotiationExpiry:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Electronics", slug="elec"),
+            price=200.00,
+        )
+        NotificationTemplate.objects.create(
+            name="negotiation_expired",
+            subject="Negotiation expired",
+            body="Your negotiation on {product_name} expired",
+        )
+        self.negotiations = [
+            PriceNegotiation.objects.create(
+                product=self.product,
+                buyer=self.buyer,
+                seller=self.seller,
+                original_price=200,
+                offered_price=150,
+                status=status,
+            )
+            for status in ["pending", "countered", "pending", "accepted"]
+        ]
+        PriceNegotiation.objects.update(updated_at=timezone.now() - timedelta(days=8))
+        # Recent activity keeps a negotiation open
+        PriceNegotiation.objects.filter(id=self.negotiations[2].id).update(
+            updated_at=timezone.now()
+        )
+
+    def test_expires_stale_open_negotiations_in_batches(self):
+        metrics = NegotiationExpiryService.expire_stale(expiry_hours=168, batch_size=1)
+
+        assert metrics["expired"] == 2
+        assert metrics["batches"] == 2
+        statuses = dict(PriceNegotiation.objects.values_list("id", "status"))
+        assert [statuses[n.id] for n in self.negotiations] == [
+            "rejected",
+            "rejected",
+            "pending",
+            "accepted",
+        ]
+        assert NegotiationHistory.objects.filter(action="price_rejected").count() == 2
+
+        messages = Notification.objects.filter(notification_type="negotiation_expired")
+        assert messages.count() == 4
+        assert messages.first().message == "Your negotiation on Test Widget expired"
+
+    def test_second_run_finds_nothing(self):
+        NegotiationExpiryService.expire_stale(expiry_hours=168)
+        assert NegotiationExpiryService.expire_stale(expiry_hours=168)["expired"] == 0
@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductNegotiationStats,
+    ProductVariant,
+    UserNegotiationStats,
+)
+from apps.products.services.negotiation_service import (
+    NegotiationAnalyticsService,
+    NegotiationService,
+)
+from apps.products.services.negotiation_stats_service import NegotiationStatsService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestNegotiationStats:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyers = [
+            User.objects.create_user(
+                email=f"buyer{i}@test.com", password="testpass123", first_name="B"
+            )
+            for i in range(2)
+        ]
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Electronics", slug="elec"),
+            price=Decimal("200.00"),
+            status="active",
+            is_negotiable=True,
+        )
+        self.variant = ProductVariant.objects.create(
+            product=self.product,
+            sku="WIDGET-1",
+            price=Decimal("200.00"),
+            total_inventory=5,
+            available_inventory=5,
+        )
+
+    def negotiate(self):
+        first = NegotiationService.initiate_negotiation(
+            self.variant, self.buyers[0], Decimal("160.00")
+        )[1]["negotiation"]
+        NegotiationService.respond_to_negotiation(
+            first, self.seller, "counter", counter_price=Decimal("180.00")
+        )
+        NegotiationService.respond_to_negotiation(first, self.buyers[0], "accept")
+
+        second = NegotiationService.initiate_negotiation(
+            self.variant, self.buyers[1], Decimal("150.00")
+        )[1]["negotiation"]
+        NegotiationService.respond_to_negotiation(second, self.seller, "reject")
+
+    def test_counters_follow_negotiation_flow(self):
+        self.negotiate()
+
+        stats = NegotiationAnalyticsService.get_negotiation_stats(self.product)
+        assert stats["total_negotiations"] == 2
+        assert stats["accepted_negotiations"] == 1
+        assert stats["rejected_negotiations"] == 1
+        assert stats["pending_negotiations"] == 0
+        assert stats["offers_count"] == 3
+        assert stats["average_offered_price"] == 165.0
+        assert stats["average_final_price"] == 180.0
+        assert stats["average_discount"] == 10.0
+        assert stats["success_rate"] == 50.0
+
+        seller_stats = NegotiationAnalyticsService.get_user_negotiation_stats(
+            self.seller
+        )
+        assert seller_stats["as_seller"]["total_negotiations"] == 2
+        assert seller_stats["as_buyer"]["total_negotiations"] == 0
+
+    def test_incremental_rows_match_rebuild(self):
+        self.negotiate()
+        fields = [
+            f.name
+            for f in ProductNegotiationStats._meta.concrete_fields
+            if f.name not in ("id", "product", "created_at", "updated_at")
+        ]
+
+        def rows():
+            return sorted(
+                list(ProductNegotiationStats.objects.values_list(*fields))
+                + list(UserNegotiationStats.objects.values_list(*fields)),
+                key=str,
+            )
+
+        incremental = rows()
+        NegotiationStatsService.rebuild()
+        assert rows() == incremental
@@ -0,0 +1,97 @@
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from apps.categories.models import Category
+from apps.products.models import Product, ProductCondition, ProductRatingAggregate
+from apps.products.services.rating_aggregate_service import RatingAggregateService
+from apps.products.services.rating_service import ProductRatingService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestRatingAggregateDeltas:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyers = [
+            User.objects.create_user(
+                email=f"buyer{i}@test.com", password="testpass123", first_name="Buyer"
+            )
+            for i in range(3)
+        ]
+        self.condition = ProductCondition.objects.create(name="New", slug="new")
+        self.category = Category.objects.create(name="Electronics", slug="elec")
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=self.condition,
+            category=self.category,
+            price=200.00,
+        )
+
+    def rate(self, buyer, stars, review="Good"):
+        return ProductRatingService.add_or_update_rating(
+            product_id=self.product.id,
+            user_id=buyer.id,
+            rating=stars,
+            review=review,
+        )
+
+    def aggregate(self):
+        return ProductRatingAggregate.objects.get(product=self.product)
+
+    def test_ratings_apply_deltas(self):
+        self.rate(self.buyers[0], 5)
+        self.rate(self.buyers[1], 4, review="")
+        self.rate(self.buyers[2], 4)
+
+        aggregate = self.aggregate()
+        assert aggregate.total_count == 3
+        assert aggregate.rating_sum == 13
+        assert aggregate.average_rating == Decimal("4.33")
+        assert (aggregate.stars_5_count, aggregate.stars_4_count) == (1, 2)
+        assert aggregate.has_reviews is True
+        assert RatingAggregateService.find_drift([self.product.id]) == {}
+
+        # Changing a rating moves it between star buckets
+        self.rate(self.buyers[0], 1)
+        aggregate = self.aggregate()
+        assert aggregate.rating_sum == 9
+        assert (aggregate.stars_5_count, aggregate.stars_1_count) == (0, 1)
+        assert aggregate.average_rating == Decimal("3.00")
+
+    def test_moderation_goes_through_dirty_set(
+        self, django_capture_on_commit_callbacks
+    ):
+        self.rate(self.buyers[0], 5)
+        rating = self.rate(self.buyers[1], 3)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductRatingService.moderate_rating(rating.id, False, self.seller.id)
+        assert self.aggregate().total_count == 2
+
+        RatingAggregateService.process_dirty()
+        aggregate = self.aggregate()
+        assert aggregate.total_count == 1
+        assert aggregate.average_rating == Decimal("5.00")
+
+    def test_verify_command_reports_and_fixes_drift(self):
+        self.rate(self.buyers[0], 5)
+        ProductRatingAggregate.objects.filter(product=self.product).update(
+            total_count=7
+        )
+
+        out = StringIO()
+        call_command("verify_rating_aggregates", stdout=out)
+        assert "total_count: 7 != 1" in out.getvalue()
+
+        call_command("verify_rating_aggregates", "--fix", stdout=StringIO())
+        assert self.aggregate().total_count == 1
+        assert RatingAggregateService.find_drift([self.product.id]) == {}
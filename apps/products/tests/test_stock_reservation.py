@@ -0,0 +1,221 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+
+from apps.categories.models import Category
+from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.models import (
+    InventoryTransaction,
+    Product,
+    ProductCondition,
+    ProductVariant,
+)
+from apps.products.services.inventory_service import InventoryService
+from apps.products.services.variant_service import ProductVariantService
+from apps.transactions.models import EscrowTransaction
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestStockReservation:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Electronics", slug="elec"),
+            price=Decimal("200.00"),
+            status="active",
+        )
+        self.variant = ProductVariant.objects.create(
+            product=self.product,
+            sku="WIDGET-1",
+            price=Decimal("200.00"),
+            total_inventory=3,
+            available_inventory=3,
+        )
+
+    def test_reserve_is_a_single_conditional_update(self, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            stock = ProductVariant.objects.reserve(self.variant.id, 2)
+        assert stock["in_escrow_inventory"] == 2
+
+        assert ProductVariant.objects.reserve(self.variant.id, 2) is None
+        assert self.variant.reserve_stock(1)
+        assert self.variant.in_escrow_inventory == 3
+        assert not self.variant.reserve_stock(1)
+
+        self.variant.release_stock(5)
+        self.variant.refresh_from_db()
+        assert self.variant.in_escrow_inventory == 0
+
+    def test_place_in_escrow_reserves_once(self):
+        InventoryService.place_in_escrow(self.variant, quantity=2, buyer=self.buyer)
+
+        self.variant.refresh_from_db()
+        assert self.variant.in_escrow_inventory == 2
+        assert self.variant.available_inventory == 1
+
+    def test_place_in_escrow_drops_cached_product_detail(
+        self, django_capture_on_commit_callbacks
+    ):
+        detail_key = CacheKeyManager.make_key(
+            "product_base", "detail_by_shortcode", short_code=self.product.short_code
+        )
+        cache.set(detail_key, {"total_inventory": 3})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InventoryService.place_in_escrow(self.variant, quantity=1, buyer=self.buyer)
+
+        assert cache.get(detail_key) is None
+
+    def test_place_in_escrow_rolls_back_when_stock_is_gone(self):
+        # Another buyer took the stock after this variant instance was loaded
+        ProductVariant.objects.reserve(self.variant.id, 3)
+
+        with pytest.raises(ValidationError):
+            InventoryService.place_in_escrow(self.variant, quantity=1, buyer=self.buyer)
+        assert not EscrowTransaction.objects.exists()
+
+    def test_cart_reservation_is_all_or_nothing(self):
+        other = ProductVariant.objects.create(
+            product=self.product,
+            sku="WIDGET-2",
+            price=Decimal("50.00"),
+            total_inventory=1,
+            available_inventory=1,
+        )
+        cart = [
+            {"variant": self.variant, "quantity": 2},
+            {"variant": other, "quantity": 1},
+        ]
+
+        orders, total = InventoryService.place_multiple_variants_in_escrow(
+            cart, buyer=self.buyer
+        )
+        assert total == Decimal("450.00")
+        assert [order["escrow_transaction"].quantity for order in orders] == [2, 1]
+        assert ProductVariant.objects.get(id=self.variant.id).in_escrow_inventory == 2
+
+        with pytest.raises(ValidationError):
+            InventoryService.place_multiple_variants_in_escrow(cart, buyer=self.buyer)
+        assert EscrowTransaction.objects.count() == 2
+
+    def test_cart_reservation_drops_every_product_detail(
+        self, django_capture_on_commit_callbacks
+    ):
+        other_product = Product.objects.create(
+            title="Other Widget",
+            seller=self.seller,
+            condition=self.product.condition,
+            category=self.product.category,
+            price=Decimal("10.00"),
+            status="active",
+        )
+        other = ProductVariant.objects.create(
+            product=other_product,
+            sku="OTHER-1",
+            price=Decimal("10.00"),
+            total_inventory=1,
+            available_inventory=1,
+        )
+        detail_keys = [
+            CacheKeyManager.make_key(
+                "product_base", "detail_by_shortcode", short_code=product.short_code
+            )
+            for product in (self.product, other_product)
+        ]
+        cache.set_many({key: {"cached": True} for key in detail_keys})
+        cart = [
+            {"variant": self.variant, "quantity": 1},
+            {"variant": other, "quantity": 1},
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            InventoryService.place_multiple_variants_in_escrow(cart, buyer=self.buyer)
+
+        assert cache.get_many(detail_keys) == {}
+
+    def test_reserve_many_reports_short_lines(self):
+        other = ProductVariant.objects.create(
+            product=self.product, sku="WIDGET-2", total_inventory=1
+        )
+        stock, short = ProductVariant.objects.reserve_many(
+            {self.variant.id: 3, other.id: 2}
+        )
+        assert (stock, short) == ({}, [other.id])
+        assert ProductVariant.objects.get(id=self.variant.id).in_escrow_inventory == 0
+
+        stock, short = ProductVariant.objects.reserve_many(
+            {self.variant.id: 3, str(other.id): 1}
+        )
+        assert short == []
+        assert stock[other.id]["in_escrow_inventory"] == 1
+
+    def test_bulk_update_stock_applies_one_batch(self, django_assert_max_num_queries):
+        other = ProductVariant.objects.create(
+            product=self.product, sku="WIDGET-2", total_inventory=4
+        )
+        ProductVariant.objects.reserve(self.variant.id, 2)
+        updates = [
+            {"variant_id": str(other.id), "action": "add", "quantity": 6},
+            {"variant_id": str(self.variant.id), "operation": "set", "quantity": 1},
+            {"variant_id": str(self.variant.id), "action": "subtract", "quantity": 1},
+            {"variant_id": str(other.id), "action": "subtract", "quantity": 3},
+            {"variant_id": "not-a-uuid", "action": "add", "quantity": 1},
+        ]
+
+        with django_assert_max_num_queries(6):
+            results = ProductVariantService.bulk_update_stock(updates)
+
+        assert len(results["success"]) == 3
+        assert len(results["errors"]) == 2  # set below escrow, bad id
+        other.refresh_from_db()
+        self.variant.refresh_from_db()
+        assert other.total_inventory == 7
+        assert (self.variant.total_inventory, self.variant.available_inventory) == (
+            2,
+            0,
+        )
+        assert sorted(
+            InventoryTransaction.objects.values_list("transaction_type", "quantity")
+        ) == [("ADD", 6), ("ADJUST", -3), ("ADJUST", -1)]
+
+    def test_reserve_stock_clears_only_its_product_caches(
+        self, django_capture_on_commit_callbacks
+    ):
+        other_product = Product.objects.create(
+            title="Other Widget",
+            seller=self.seller,
+            condition=self.product.condition,
+            category=self.product.category,
+            price=Decimal("10.00"),
+            status="active",
+        )
+        own_key = ProductVariantService._generate_detail_cache_key(
+            self.product.id, active_only=True
+        )
+        other_key = ProductVariantService._generate_detail_cache_key(
+            other_product.id, active_only=True
+        )
+        cache.set_many({own_key: ["cached"], other_key: ["cached"]})
+
+        with django_capture_on_commit_callbacks(execute=False) as callbacks:
+            assert ProductVariantService.reserve_stock(self.variant.id, 1)
+        assert cache.get(own_key) == ["cached"]
+
+        for callback in callbacks:
+            callback()
+        assert cache.get(own_key) is None
+        assert cache.get(other_key) == ["cached"]
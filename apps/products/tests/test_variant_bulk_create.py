@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductVariant,
+    ProductVariantType,
+)
+from apps.products.services.variant_service import ProductVariantService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestVariantBulkCreate:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.product = Product.objects.create(
+            title="Test Phone",
+            seller=seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Phones", slug="phones"),
+            price=Decimal("300.00"),
+            status="active",
+        )
+        self.grid = {}
+        for name, affects_price in (("size", False), ("color", False), ("gb", True)):
+            variant_type = ProductVariantType.objects.create(
+                name=name, slug=name, affects_price=affects_price
+            )
+            options = ProductVariantService.bulk_create_variant_options(
+                variant_type.id,
+                [
+                    {
+                        "value": f"{name}{i}",
+                        "slug": f"{name}{i}",
+                        "price_adjustment": Decimal(i),
+                    }
+                    for i in range(4)
+                ],
+            )
+            self.grid[variant_type.id] = [option.id for option in options]
+
+    def combos(self):
+        return ProductVariantService.generate_all_combinations(
+            self.product.id, self.grid, base_sku="PHONE", base_price=Decimal("300")
+        )
+
+    def test_queries_do_not_grow_with_combinations(self, django_assert_max_num_queries):
+        combos = self.combos()
+        with django_assert_max_num_queries(10):
+            variants = ProductVariantService.bulk_create_variants(
+                self.product.id, combos
+            )
+        assert len(variants) == ProductVariant.objects.count() == 64
+
+        variant = ProductVariant.objects.get(sku=combos[-1]["sku"])
+        assert set(variant.options.values_list("id", flat=True)) == set(
+            combos[-1]["option_combinations"]
+        )
+        # generate_all_combinations folds affects_price adjustments into price
+        assert variant.price == Decimal("303.00")
+        assert variant.final_price == variant.compute_final_price()
+        assert ProductVariantService.get_variant_by_options(
+            self.product.id, combos[-1]["option_combinations"]
+        ) == variant
+
+    def test_existing_combinations_are_rejected(self):
+        combos = self.combos()
+        ProductVariantService.bulk_create_variants(self.product.id, combos[:1])
+
+        repeat = [dict(combos[0], sku="PHONE-OTHER")]
+        with pytest.raises(ValidationError, match="options already used"):
+            ProductVariantService.bulk_create_variants(self.product.id, repeat)
+        assert ProductVariant.objects.count() == 1
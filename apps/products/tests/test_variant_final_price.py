@@ -0,0 +1,103 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductVariant,
+    ProductVariantOption,
+    ProductVariantType,
+)
+from apps.products.services.variant_price_service import VariantPriceService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestVariantFinalPrice:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.product = Product.objects.create(
+            title="Test Shirt",
+            seller=seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Clothing", slug="clothing"),
+            price=Decimal("50.00"),
+            status="active",
+        )
+        self.size = ProductVariantType.objects.create(
+            name="Size", slug="size", affects_price=True
+        )
+        self.large = ProductVariantOption.objects.create(
+            variant_type=self.size,
+            value="L",
+            slug="l",
+            price_adjustment=Decimal("5.00"),
+        )
+        self.variant = ProductVariant.objects.create(
+            product=self.product, sku="SHIRT-L", price=Decimal("40.00")
+        )
+
+    def stored(self, variant):
+        return ProductVariant.objects.get(pk=variant.pk).final_price
+
+    def test_final_price_follows_options(self):
+        assert self.stored(self.variant) == Decimal("40.00")
+
+        self.variant.options.add(self.large)
+        assert self.variant.final_price == Decimal("45.00")
+        assert self.stored(self.variant) == Decimal("45.00")
+
+        self.large.price_adjustment = Decimal("7.50")
+        self.large.save()
+        assert self.stored(self.variant) == Decimal("47.50")
+
+        self.size.affects_price = False
+        self.size.save()
+        assert self.stored(self.variant) == Decimal("40.00")
+
+        self.size.affects_price = True
+        self.size.save()
+        self.large.variants.clear()
+        assert self.stored(self.variant) == Decimal("40.00")
+
+    def test_deleting_an_option_or_type_reprices(self):
+        medium = ProductVariantOption.objects.create(
+            variant_type=self.size,
+            value="M",
+            slug="m",
+            price_adjustment=Decimal("2.00"),
+        )
+        other = ProductVariant.objects.create(
+            product=self.product, sku="SHIRT-M", price=Decimal("40.00")
+        )
+        self.variant.options.add(self.large)
+        other.options.add(medium)
+
+        self.large.delete()
+        assert self.stored(self.variant) == Decimal("40.00")
+
+        # The type's delete cascades to its options
+        self.size.delete()
+        assert self.stored(other) == Decimal("40.00")
+
+    def test_unpriced_variant_follows_product_price(self):
+        unpriced = ProductVariant.objects.create(product=self.product, sku="SHIRT")
+        assert self.stored(unpriced) == Decimal("50.00")
+
+        self.product.price = Decimal("55.00")
+        self.product.save(update_fields=["price"])
+        assert self.stored(unpriced) == Decimal("55.00")
+
+    def test_recompute_repairs_drift(self):
+        self.variant.options.add(self.large)
+        ProductVariant.objects.update(final_price=None)
+
+        assert VariantPriceService.recompute() == 1
+        assert self.stored(self.variant) == Decimal("45.00")
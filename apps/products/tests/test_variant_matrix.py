@@ -0,0 +1,131 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django_redis import get_redis_connection
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductVariant,
+    ProductVariantOption,
+    ProductVariantType,
+)
+from apps.products.services.variant_matrix_service import VariantMatrixService
+from apps.products.services.variant_service import ProductVariantService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestVariantMatrix:
+    @pytest.fixture(autouse=True)
+    def setup_data(self, django_capture_on_commit_callbacks):
+        seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.product = Product.objects.create(
+            title="Test Shirt",
+            seller=seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Clothing", slug="clothing"),
+            price=Decimal("50.00"),
+            status="active",
+        )
+        size = ProductVariantType.objects.create(name="Size", slug="size")
+        self.small = ProductVariantOption.objects.create(
+            variant_type=size, value="S", slug="s"
+        )
+        large = ProductVariantOption.objects.create(
+            variant_type=size, value="L", slug="l"
+        )
+        with django_capture_on_commit_callbacks(execute=True):
+            self.variant = ProductVariantService.create_variant_combination(
+                self.product.id, [self.small.id], "SHIRT-S", total_inventory=5
+            )
+            ProductVariantService.create_variant_combination(
+                self.product.id, [large.id], "SHIRT-L", total_inventory=2
+            )
+
+    def test_stock_changes_drop_overlay_fields_without_rebuild(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        matrix = VariantMatrixService.get_matrix(self.product.id)
+        assert set(matrix["variants"]) == {"size:s", "size:l"}
+        assert [t["option_count"] for t in matrix["variant_types"]] == [2]
+        assert matrix["variants"]["size:s"]["available_quantity"] == 5
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductVariant.objects.reserve(self.variant.id, 2)
+            ProductVariantService.bulk_update_stock(
+                [{"variant_id": self.variant.id, "action": "add", "quantity": 1}]
+            )
+
+        # Only the changed variant's stock is reloaded
+        with django_assert_num_queries(1):
+            VariantMatrixService.get_matrix(self.product.id)
+        with django_assert_num_queries(0):
+            matrix = VariantMatrixService.get_matrix(self.product.id)
+        assert matrix["variants"]["size:s"]["total_inventory"] == 6
+        assert matrix["variants"]["size:s"]["reserved_quantity"] == 2
+        assert matrix["variants"]["size:s"]["available_quantity"] == 4
+
+    def test_out_of_order_commits_leave_no_stale_stock(
+        self, django_capture_on_commit_callbacks
+    ):
+        # A field written from an older read must not survive a later commit
+        VariantMatrixService.get_stock(self.product.id, [str(self.variant.id)])
+        get_redis_connection("default").hset(
+            VariantMatrixService._stock_key(self.product.id),
+            str(self.variant.id),
+            "99:0",
+        )
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ProductVariant.objects.reserve(self.variant.id, 1)
+
+        stock = VariantMatrixService.get_stock(self.product.id, [str(self.variant.id)])
+        assert stock[str(self.variant.id)]["total_inventory"] == 5
+        assert stock[str(self.variant.id)]["reserved_quantity"] == 1
+
+    def test_reload_racing_a_commit_is_not_written_back(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        variant_id = str(self.variant.id)
+        store_stock = VariantMatrixService._store_stock
+
+        def commit_before_store(product_id, versions, loaded):
+            # A reservation commits after the reload read the old stock
+            with django_capture_on_commit_callbacks(execute=True):
+                ProductVariant.objects.reserve(self.variant.id, 1)
+            store_stock(product_id, versions, loaded)
+
+        monkeypatch.setattr(VariantMatrixService, "_store_stock", commit_before_store)
+        stock = VariantMatrixService.get_stock(self.product.id, [variant_id])
+        assert stock[variant_id]["reserved_quantity"] == 0
+        monkeypatch.undo()
+
+        assert not get_redis_connection("default").hexists(
+            VariantMatrixService._stock_key(self.product.id), variant_id
+        )
+        stock = VariantMatrixService.get_stock(self.product.id, [variant_id])
+        assert stock[variant_id]["reserved_quantity"] == 1
+
+    def test_structural_changes_rebuild_static_part(
+        self, django_capture_on_commit_callbacks
+    ):
+        VariantMatrixService.get_matrix(self.product.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.small.display_value = "Small"
+            self.small.save()
+        matrix = VariantMatrixService.get_matrix(self.product.id)
+        assert matrix["variants"]["size:s"]["options"][0]["display_value"] == "Small"
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.variant.is_active = False
+            self.variant.save(update_fields=["is_active"])
+        assert set(ProductVariantService.get_variant_matrix(self.product.id)) == {
+            "size:l"
+        }
@@ -0,0 +1,110 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError
+
+from apps.categories.models import Category
+from apps.core.utils.cache_key_manager import CacheKeyManager
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductVariant,
+    ProductVariantOption,
+    ProductVariantType,
+)
+from apps.products.services.variant_service import ProductVariantService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestVariantOptionSignature:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.product = Product.objects.create(
+            title="Test Shirt",
+            seller=seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Clothing", slug="clothing"),
+            price=Decimal("50.00"),
+            status="active",
+        )
+        size = ProductVariantType.objects.create(name="Size", slug="size")
+        color = ProductVariantType.objects.create(name="Color", slug="color")
+        self.large = ProductVariantOption.objects.create(
+            variant_type=size, value="L", slug="l"
+        )
+        self.red = ProductVariantOption.objects.create(
+            variant_type=color, value="Red", slug="red"
+        )
+        self.blue = ProductVariantOption.objects.create(
+            variant_type=color, value="Blue", slug="blue"
+        )
+        self.variant = ProductVariant.objects.create(
+            product=self.product, sku="SHIRT-L-RED"
+        )
+        self.variant.options.set([self.large, self.red])
+
+    def test_lookup_is_order_independent_and_exact(self):
+        ids = [self.red.id, self.large.id]
+        found = ProductVariantService.get_variant_by_options(self.product.id, ids)
+        assert found == self.variant
+        assert self.variant.option_signature == ProductVariant.make_option_signature(
+            reversed(ids)
+        )
+        assert not ProductVariantService.get_variant_by_options(
+            self.product.id, [self.red.id]
+        )
+
+    def test_cache_holds_only_a_revalidated_id(self, django_assert_num_queries):
+        ids = [self.large.id, self.red.id]
+        ProductVariantService.get_variant_by_options(self.product.id, ids)
+        cache_key = CacheKeyManager.make_key(
+            "product_variant",
+            "options",
+            product_id=self.product.id,
+            option_ids=self.variant.option_signature,
+        )
+        assert cache.get(cache_key) == self.variant.id
+
+        with django_assert_num_queries(1):
+            ProductVariantService.get_variant_by_options(self.product.id, ids)
+
+        # Editing the options re-signs the variant; the cached id goes stale
+        self.variant.options.remove(self.red)
+        self.variant.options.add(self.blue)
+        assert not ProductVariantService.get_variant_by_options(self.product.id, ids)
+        assert ProductVariantService.get_variant_by_options(
+            self.product.id, [self.blue.id, self.large.id]
+        ) == ProductVariant.objects.get(pk=self.variant.pk)
+
+    def test_duplicate_combination_is_rejected(self):
+        duplicate = ProductVariant.objects.create(
+            product=self.product, sku="SHIRT-L-RED-2"
+        )
+        with pytest.raises(IntegrityError):
+            duplicate.options.set([self.red, self.large])
+
+    def test_set_may_pass_through_a_sibling_combination(self):
+        sibling = ProductVariant.objects.create(product=self.product, sku="SHIRT-L")
+        sibling.options.set([self.large])
+
+        # Removes Red first, briefly matching the sibling's {L}
+        self.variant.options.set([self.large, self.blue])
+
+        self.variant.refresh_from_db()
+        assert self.variant.option_signature == ProductVariant.make_option_signature(
+            [self.large.id, self.blue.id]
+        )
+
+    def test_deleting_a_variant_type_re_signs_its_variants(self):
+        self.red.variant_type.delete()
+
+        assert ProductVariantService.get_variant_by_options(
+            self.product.id, [self.large.id]
+        ) == ProductVariant.objects.get(pk=self.variant.pk)
@@ -0,0 +1,97 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.notifications.models import Notification
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductVariant,
+    ProductWatchlistItem,
+)
+from apps.products.tasks import watchlist as watchlist_tasks
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWatchlistAlerts:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.watchers = [
+            User.objects.create_user(
+                email=f"watcher{i}@test.com", password="testpass123", first_name="W"
+            )
+            for i in range(3)
+        ]
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=ProductCondition.objects.create(name="New", slug="new"),
+            category=Category.objects.create(name="Electronics", slug="elec"),
+            price=200.00,
+            status="active",
+        )
+        ProductWatchlistItem.objects.bulk_create(
+            [
+                ProductWatchlistItem(user=user, product=self.product)
+                for user in self.watchers
+            ]
+        )
+
+    def drops(self):
+        return Notification.objects.filter(notification_type="product_price_drop")
+
+    def test_price_drop_notifies_watchers_once_per_cooldown(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            self.product.price = 150
+            self.product.save()
+        assert self.drops().count() == 3
+        assert "from 200.00 to 150" in self.drops().first().message
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.product.price = 120
+            self.product.save()
+        assert self.drops().count() == 3
+
+    def test_price_increase_is_ignored(self, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            self.product.price = 250
+            self.product.save()
+        assert self.drops().count() == 0
+
+    def test_fanout_continues_in_follow_up_tasks(self, monkeypatch):
+        monkeypatch.setattr(watchlist_tasks, "FANOUT_CHUNKS_PER_TASK", 1)
+        context = {
+            "product_id": str(self.product.id),
+            "product_title": self.product.title,
+            "old_price": "200.00",
+            "new_price": "150.00",
+        }
+
+        watchlist_tasks.notify_product_watchers(
+            str(self.product.id), "product_price_drop", context, chunk_size=2
+        )
+        assert sorted(self.drops().values_list("recipient_id", flat=True)) == sorted(
+            user.id for user in self.watchers
+        )
+
+    def test_released_reservation_alerts_back_in_stock(
+        self, django_capture_on_commit_callbacks
+    ):
+        variant = ProductVariant.objects.create(
+            product=self.product, sku="WIDGET-1", price=200, total_inventory=1
+        )
+        ProductVariant.objects.reserve(variant.id, 1)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            variant.release_stock(1)
+
+        assert Notification.objects.filter(
+            notification_type="product_back_in_stock"
+        ).count() == 3
@@ -0,0 +1,114 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import Product, ProductCondition, ProductWatchlistItem
+from apps.products.services.watchlist_membership_service import (
+    WatchlistMembershipService,
+)
+from apps.products.services.watchlist_service import WatchlistService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWatchlistMembership:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        condition = ProductCondition.objects.create(name="New", slug="new")
+        category = Category.objects.create(name="Electronics", slug="elec")
+        self.products = [
+            Product.objects.create(
+                title=f"Widget {i}",
+                seller=self.seller,
+                condition=condition,
+                category=category,
+                price=100.00,
+            )
+            for i in range(3)
+        ]
+        self.ids = [str(product.id) for product in self.products]
+
+    def test_write_through_answers_batches_without_queries(
+        self, django_capture_on_commit_callbacks, django_assert_num_queries
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            WatchlistService.bulk_add_products(self.buyer, self.ids[:2])
+
+        # The limit check loaded the set; everything after is Redis-only
+        with django_assert_num_queries(0):
+            assert WatchlistService.get_watch_status(self.buyer, self.ids) == {
+                self.ids[0]: True,
+                self.ids[1]: True,
+                self.ids[2]: False,
+            }
+        with django_assert_num_queries(0):
+            assert WatchlistService.get_user_watchlist_size(self.buyer) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            WatchlistService.bulk_remove_products(self.buyer, [self.ids[0]])
+
+        with django_assert_num_queries(0):
+            assert WatchlistService.get_watch_status(self.buyer, self.ids) == {
+                self.ids[0]: False,
+                self.ids[1]: True,
+                self.ids[2]: False,
+            }
+            assert WatchlistService.get_user_watchlist_size(self.buyer) == 1
+
+    def test_forgotten_set_reloads_from_database(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            WatchlistService.bulk_add_products(self.buyer, [self.ids[2]])
+        WatchlistMembershipService.forget(self.buyer.id)
+
+        assert WatchlistService.is_product_in_watchlist(self.buyer, self.ids[2])
+        assert not WatchlistService.is_product_in_watchlist(self.buyer, self.ids[0])
+
+    def test_load_racing_a_write_through_is_not_kept(
+        self, django_capture_on_commit_callbacks, monkeypatch
+    ):
+        product_ids = WatchlistMembershipService._product_ids
+
+        def commit_after_read(user_id):
+            # An add commits after the rebuild read the user's rows
+            read = product_ids(user_id)
+            with django_capture_on_commit_callbacks(execute=True):
+                ProductWatchlistItem.objects.create(
+                user=self.buyer, product=self.products[0]
+            )
+            return read
+
+        monkeypatch.setattr(
+            WatchlistMembershipService, "_product_ids", commit_after_read
+        )
+        assert WatchlistMembershipService.load(self.buyer.id) == 0
+        monkeypatch.undo()
+
+        assert WatchlistService.is_product_in_watchlist(self.buyer, self.ids[0])
+        assert WatchlistService.get_user_watchlist_size(self.buyer) == 1
+
+    def test_orm_deletes_and_inactive_products(
+        self, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            WatchlistService.bulk_add_products(self.buyer, self.ids[:2])
+
+        # Deletes outside the service (API destroy, admin, cascades) use signals
+        with django_capture_on_commit_callbacks(execute=True):
+            self.buyer.watchlist.get(product=self.products[0]).delete()
+        assert WatchlistService.get_user_watchlist_size(self.buyer) == 1
+        assert not WatchlistService.is_product_in_watchlist(self.buyer, self.ids[0])
+
+        Product.objects.filter(pk=self.products[1].pk).update(is_active=False)
+        assert not WatchlistService.is_product_in_watchlist(self.buyer, self.ids[1])
+        assert not WatchlistService.is_product_in_watchlist(
+            self.buyer, self.ids[1], use_cache=False
+        )
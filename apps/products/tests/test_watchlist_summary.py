@@ -0,0 +1,135 @@
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import (
+    Product,
+    ProductCondition,
+    ProductWatchlistItem,
+    WatchlistSummary,
+)
+from apps.products.services.watchlist_service import WatchlistService
+from apps.products.services.watchlist_summary_service import WatchlistSummaryService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWatchlistSummary:
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        condition = ProductCondition.objects.create(name="New", slug="new")
+        self.phones = Category.objects.create(name="Phones", slug="phones")
+        self.books = Category.objects.create(name="Books", slug="books")
+        self.products = [
+            Product.objects.create(
+                title=f"Widget {i}",
+                seller=self.seller,
+                condition=condition,
+                category=category,
+                price=100.00,
+            )
+            for i, category in enumerate([self.phones, self.phones, self.books])
+        ]
+        self.ids = [str(product.id) for product in self.products]
+
+    def test_adds_and_removes_update_the_summary_row(self):
+        WatchlistService.bulk_add_products(self.buyer, self.ids)
+        WatchlistService.bulk_remove_products(self.buyer, [self.ids[2]])
+
+        summary = WatchlistSummary.objects.get(user=self.buyer)
+        assert summary.total_items == 2
+        assert summary.category_counts == {str(self.phones.id): 2}
+        assert set(summary.recent_product_ids) == set(self.ids[:2])
+
+        stats = WatchlistService.get_watchlist_stats(self.buyer)
+        assert stats.total_items == 2
+        assert stats.most_watched_categories == [{"name": "Phones", "count": 2}]
+        assert stats.categories_count == 1
+
+    def test_incremental_row_matches_rebuild(self):
+        WatchlistService.bulk_add_products(self.buyer, self.ids[:2])
+        WatchlistService.bulk_remove_products(self.buyer, [self.ids[0]])
+        WatchlistService.bulk_add_products(self.buyer, [self.ids[2]])
+
+        summary = WatchlistSummary.objects.get(user=self.buyer)
+        incremental = (
+            summary.total_items,
+            summary.category_counts,
+            summary.recent_product_ids,
+            summary.oldest_added_at,
+            summary.newest_added_at,
+        )
+        rebuilt = WatchlistSummaryService.rebuild(self.buyer.id)
+        assert incremental == (
+            rebuilt.total_items,
+            rebuilt.category_counts,
+            rebuilt.recent_product_ids,
+            rebuilt.oldest_added_at,
+            rebuilt.newest_added_at,
+        )
+
+    def test_deletes_outside_the_service_update_the_summary(self):
+        WatchlistService.bulk_add_products(self.buyer, self.ids)
+        WatchlistService.get_watchlist_stats(self.buyer)
+
+        # As the watchlist DELETE endpoint (BaseViewSet.destroy) does
+        self.buyer.watchlist.get(product=self.products[2]).delete()
+
+        summary = WatchlistSummary.objects.get(user=self.buyer)
+        assert summary.total_items == 2
+        assert summary.category_counts == {str(self.phones.id): 2}
+
+    def test_bulk_add_counts_only_inserted_rows(self, monkeypatch):
+        manager = ProductWatchlistItem.objects
+        bulk_create = manager.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            # Another request adds one of the products first
+            ProductWatchlistItem.objects.create(
+                user=self.buyer, product_id=objs[0].product_id
+            )
+            return bulk_create(objs, **kwargs)
+
+        monkeypatch.setattr(manager, "bulk_create", racing_bulk_create)
+        result = WatchlistService.bulk_add_products(self.buyer, self.ids)
+
+        assert result.affected_count == 2
+        assert WatchlistSummary.objects.get(user=self.buyer).total_items == 3
+        assert sorted(
+            Product.objects.filter(pk__in=self.ids).values_list(
+                "cached_watchers_count", flat=True
+            )
+        ) == [1, 1, 1]
+
+    def test_bulk_remove_records_one_summary_update(self, monkeypatch):
+        WatchlistService.bulk_add_products(self.buyer, self.ids)
+        calls = []
+        record_removed = WatchlistSummaryService.record_removed
+        monkeypatch.setattr(
+            WatchlistSummaryService,
+            "record_removed",
+            lambda user_id, changes: calls.append(list(changes))
+            or record_removed(user_id, changes),
+        )
+
+        WatchlistService.bulk_remove_products(self.buyer, self.ids[:2])
+
+        assert [len(changes) for changes in calls] == [2]
+        assert WatchlistSummary.objects.get(user=self.buyer).total_items == 1
+
+    def test_product_delete_discards_watcher_summaries_in_bulk(self):
+        WatchlistService.bulk_add_products(self.buyer, self.ids)
+        WatchlistService.get_watchlist_stats(self.buyer)
+
+        self.products[0].delete()
+
+        assert not WatchlistSummary.objects.filter(user=self.buyer).exists()
+        stats = WatchlistService.get_watchlist_stats(self.buyer)
+        assert stats.total_items == 2
@@ -20,6 +20,7 @@ from apps.products.services import (
     NegotiationService,
     NegotiationAnalyticsService,
     NegotiationNotificationService,
+    NegotiationStatsService,
 )
 from apps.products.serializers import (
     NegotiationResponseSerializer,
@@ -326,6 +327,19 @@ class ProductNegotiationViewSet(BaseViewSet):
 
         return Response({"results": serializer.data, "count": len(serializer.data)})
 
+    @action(detail=False, methods=["get"])
+    def my_stats(self, request):
+        """
+        Get the user's negotiation statistics as buyer and as seller.
+        """
+        stats = NegotiationAnalyticsService.get_user_negotiation_stats(request.user)
+        return Response(
+            {
+                key: NegotiationStatsSerializer(role_stats).data
+                for key, role_stats in stats.items()
+            }
+        )
+
     @CANCEL_NEGOTIATION
     @action(
         detail=False, url_path=r"cancel/(?P<negotiation_id>[^/.]+)", methods=["post"]
@@ -353,8 +367,12 @@ class ProductNegotiationViewSet(BaseViewSet):
             )
 
         # Cancel the negotiation
+        before = NegotiationStatsService.snapshot(negotiation)
         negotiation.status = "rejected"
         negotiation.save()
+        NegotiationStatsService.record_change(
+            before, NegotiationStatsService.snapshot(negotiation)
+        )
 
         # Record in history
         role = "buyer" if request.user == negotiation.buyer else "seller"
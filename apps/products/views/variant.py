@@ -6,7 +6,6 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
 from django.db import models
-from django.db.models import Prefetch
 
 
 from apps.core.views import BaseViewSet
@@ -25,6 +24,7 @@ from apps.products.serializers import (
     ProductVariantOptionBulkCreateSerializer,
 )
 from apps.products.services import ProductVariantService, CACHE_TTL
+from apps.products.services.variant_matrix_service import VariantMatrixService
 
 
 class ProductVariantTypeViewSet(BaseViewSet):
@@ -363,9 +363,12 @@ class ProductVariantViewSet(BaseViewSet):
         )
 
     @action(detail=False, methods=["get"])
-    @method_decorator(cache_page(CACHE_TTL))
     def matrix(self, request):
-        """Get variant matrix for a product with enhanced data and optimized queries"""
+        """
+        Variant matrix for a product. Not page-cached: the static part and
+        the stock overlay are cached separately by VariantMatrixService, so
+        stock stays current without rebuilding the matrix.
+        """
         product_id = request.query_params.get("product_id")
         if not product_id:
             return self.error_response(
@@ -374,41 +377,9 @@ class ProductVariantViewSet(BaseViewSet):
             )
 
         try:
-            # Get variant matrix and types in parallel using asyncio or Promise.all
-            matrix = ProductVariantService.get_variant_matrix(product_id)
-
-            # Get only the variant types that are actually used in the matrix
-            used_type_ids = {
-                option["type_id"]
-                for variant_data in matrix.values()
-                for option in variant_data.get("options", [])
-            }
-
-            # Fetch only the relevant variant types with optimized query
-            variant_types = (
-                ProductVariantType.objects.filter(id__in=used_type_ids, is_active=True)
-                .prefetch_related(
-                    Prefetch(
-                        "options",
-                        queryset=ProductVariantOption.objects.filter(is_active=True)
-                        .only(
-                            "id",
-                            "value",
-                            "display_value",
-                            "slug",
-                            "sort_order",
-                            "variant_type_id",
-                        )
-                        .order_by("sort_order"),
-                    )
-                )
-                .order_by("sort_order")
-            )
-
             serializer = ProductVariantMatrixSerializer(
-                {"variant_types": variant_types, "variants": matrix}
+                VariantMatrixService.get_matrix(product_id)
             )
-
             return Response(serializer.data)
 
         except Exception as e:
@@ -593,7 +564,9 @@ class ProductVariantViewSet(BaseViewSet):
                     status=status.HTTP_202_ACCEPTED,
                 )
             else:
-                results = ProductVariantService.bulk_update_stock(stock_updates)
+                results = ProductVariantService.bulk_update_stock(
+                    stock_updates, user=request.user
+                )
                 return Response(
                     {
                         "message": "Stock updates completed",
@@ -23,6 +23,7 @@ from apps.products.serializers import (
     WatchlistOperationResultSerializer,
 )
 from apps.products.services import WatchlistService
+from apps.products.services.watchlist_service import BULK_OPERATION_LIMIT
 from apps.products.utils.rate_limiting import (
     AdminWatchlistThrottle,
     WatchlistBulkThrottle,
@@ -325,8 +326,27 @@ class ProductWatchlistViewSet(BaseViewSet):
 
     @action(detail=False, methods=["get"])
     def check_product(self, request):
-        """Check if a product is in the user's watchlist with caching."""
+        """
+        Check if a product is in the user's watchlist with caching.
+        Pass ``product_ids`` (comma-separated) to check a page of products at once.
+        """
         try:
+            product_ids = request.query_params.get("product_ids")
+            if product_ids:
+                product_ids = [pid for pid in product_ids.split(",") if pid]
+                if len(product_ids) > BULK_OPERATION_LIMIT:
+                    return self.error_response(
+                        message=f"Too many products. Limit is {BULK_OPERATION_LIMIT}",
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                    )
+                return self.success_response(
+                    data={
+                        "statuses": WatchlistService.get_watch_status(
+                            request.user, product_ids
+                        )
+                    }
+                )
+
             product_id = request.query_params.get("product_id")
             if not product_id:
                 return self.error_response(
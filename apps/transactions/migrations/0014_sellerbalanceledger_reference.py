@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0013_fundhold_sellerbalanceledger'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sellerbalanceledger',
+            name='reference',
+            field=models.CharField(blank=True, db_index=True, help_text='External gateway reference (e.g. Paystack transfer reference)', max_length=100),
+        ),
+    ]
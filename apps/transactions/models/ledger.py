@@ -54,6 +54,12 @@ class SellerBalanceLedger(BaseModel):
         blank=True,
         help_text=_("Explanation of the ledger adjustment"),
     )
+    reference = models.CharField(
+        max_length=100,
+        blank=True,
+        db_index=True,
+        help_text=_("External gateway reference (e.g. Paystack transfer reference)"),
+    )
 
     class Meta:
         db_table = "seller_balance_ledger"
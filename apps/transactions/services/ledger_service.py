@@ -40,6 +40,7 @@ class SellerBalanceService:
         entry_type: str,
         transaction_obj=None,
         description: str = "",
+        reference: str = "",
     ) -> SellerBalanceLedger:
         """
         Record a credit or debit entry into the seller ledger.
@@ -50,6 +51,7 @@ class SellerBalanceService:
             entry_type=entry_type,
             transaction=transaction_obj,
             description=description,
+            reference=reference,
         )
         logger.info(
             f"Recorded ledger entry {entry.id} of type {entry_type} for seller {seller.id}: {amount}"
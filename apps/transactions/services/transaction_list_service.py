@@ -2,6 +2,10 @@ from django.core.cache import cache
 from django.db.models import Q, Prefetch
 from django.shortcuts import get_object_or_404
 from django_redis import get_redis_connection
+from apps.core.pagination import (
+    StandardResultsSetPagination,
+    wants_cursor_pagination,
+)
 from apps.core.utils.cache_manager import CacheKeyManager, CacheManager
 from apps.transactions.models import EscrowTransaction, TransactionHistory
 from apps.transactions.api.serializers import (
@@ -23,6 +27,8 @@ class TransactionListService:
 
     CACHE_TTL = 60 * 5  # 5 minutes cache
     TRACKING_CACHE_TTL = 60 * 2  # 2 minutes
+    # Generation counters only need to outlive the list keys built from them
+    GENERATION_TTL = 60 * 60 * 24  # 1 day
 
     @classmethod
     def get_transaction_list(
@@ -63,18 +69,28 @@ class TransactionListService:
             "offset": offset,
             "limit": limit,
         }
+        keyset = wants_cursor_pagination(request)
+        if keyset:
+            params["cursor"] = request.query_params.get("cursor", "")
+            params["page_size"] = request.query_params.get("page_size", "")
 
         # Create hash from parameters
         params_str = json.dumps(params, sort_keys=True)
         params_hash = hashlib.md5(params_str.encode()).hexdigest()[:12]
 
-        # Create cache key with user_id and params_hash
+        # Create cache key with user_id, the current generations and params_hash.
+        # Bumping a generation orphans every key built with the old value; the
+        # orphans simply expire after CACHE_TTL.
+        global_generation, generation = cls._get_list_generations(user.id)
         cache_key = CacheKeyManager.make_key(
-            "escrow_transaction", "list_user", user_id=user.id, params=params_hash
+            "escrow_transaction",
+            "list_user",
+            user_id=user.id,
+            global_generation=global_generation,
+            generation=generation,
+            params=params_hash,
         )
         logger.info(f"cache key:{cache_key} ")
-        # Store cache key for later invalidation
-        cls._store_cache_key(cache_key)
 
         # Try cache first
         cached_data = cache.get(cache_key)
@@ -101,11 +117,16 @@ class TransactionListService:
         if ordering:
             optimized_queryset = optimized_queryset.order_by(*ordering)
 
-        # Use LimitOffsetPagination internally to paginate optimized queryset
-        from rest_framework.pagination import LimitOffsetPagination
-        paginator = LimitOffsetPagination()
-        paginator.default_limit = 25
-        paginator.max_limit = 100
+        # Use LimitOffsetPagination internally to paginate optimized queryset,
+        # or keyset pagination when the client opted in with ?pagination=cursor
+        if keyset:
+            paginator = StandardResultsSetPagination()
+        else:
+            from rest_framework.pagination import LimitOffsetPagination
+
+            paginator = LimitOffsetPagination()
+            paginator.default_limit = 25
+            paginator.max_limit = 100
 
         page = paginator.paginate_queryset(optimized_queryset, request)
         if page is not None:
@@ -287,64 +308,61 @@ class TransactionListService:
         return tx_data
 
     @classmethod
-    def _store_cache_key(cls, cache_key):
-        """Store cache key in Redis set for batch invalidation"""
-        redis_conn = get_redis_connection("default")
-        # Store the cache key in a set for later batch deletion
-        redis_conn.sadd("safetrade:escrow_transaction:list_user:keys", cache_key)
-        logger.debug(f"Stored cache key: {cache_key}")
+    def _generation_key(cls, user_id=None):
+        """Raw Redis key holding the list generation for a user (or all users)"""
+        if user_id is None:
+            return CacheKeyManager.make_key(
+                "escrow_transaction", "list_global_generation"
+            )
+        return CacheKeyManager.make_key(
+            "escrow_transaction", "list_generation", user_id=user_id
+        )
 
     @classmethod
-    def invalidate_user_transaction_caches(cls, user_id):
-        """Invalidate all transaction caches for a specific user"""
+    def _get_list_generations(cls, user_id):
+        """Fetch the global and per-user list generations in one round trip"""
         redis_conn = get_redis_connection("default")
+        global_generation, generation = redis_conn.mget(
+            [cls._generation_key(), cls._generation_key(user_id)]
+        )
+        return int(global_generation or 0), int(generation or 0)
 
-        # Get all stored cache keys
-        keys = redis_conn.smembers("safetrade:escrow_transaction:list_user:keys")
-        decoded_keys = [k.decode("utf-8") for k in keys]
-
-        # Filter keys that belong to this user
-        user_keys = [key for key in decoded_keys if f"{user_id}" in key]
+    @classmethod
+    def _bump_list_generations(cls, *user_ids):
+        """
+        INCR the list generation for each user (or the global one when no user
+        ids are given) and refresh its TTL, all in a single pipeline.
+        """
+        keys = [cls._generation_key(user_id) for user_id in user_ids] or [
+            cls._generation_key()
+        ]
+        redis_conn = get_redis_connection("default")
+        pipe = redis_conn.pipeline(transaction=False)
+        for key in keys:
+            pipe.incr(key)
+            pipe.expire(key, cls.GENERATION_TTL)
+        pipe.execute()
 
-        if user_keys:
-            logger.info(f"Deleting {len(user_keys)} cache keys for user {user_id}")
-            for key in user_keys:
-                cache.delete(key)
-                # Remove from the set
-                redis_conn.srem("safetrade:escrow_transaction:list_user:keys", key)
-                logger.info(f"✅ Deleted cache key: {key}")
-        else:
-            logger.warning(f"⚠️ No transaction cache keys found for user {user_id}")
+    @classmethod
+    def invalidate_user_transaction_caches(cls, user_id):
+        """Invalidate all transaction list caches for a specific user"""
+        cls._bump_list_generations(user_id)
+        logger.info(f"Bumped transaction list generation for user {user_id}")
 
     @classmethod
     def invalidate_all_transaction_list_caches(cls):
         """Invalidate all transaction list caches"""
-        redis_conn = get_redis_connection("default")
-
-        logger.info("Deleting all transaction list caches")
-        keys = redis_conn.smembers("safetrade:escrow_transaction:list_user:keys")
-        decoded_keys = [k.decode("utf-8") for k in keys]
-
-        if decoded_keys:
-            for key in decoded_keys:
-                cache.delete(key)
-                logger.info(f"Deleted cache key: {key}")
-
-            # Clear the keys set
-            redis_conn.delete("safetrade:escrow_transaction:list_user:keys")
-            logger.info(f"✅ Deleted {len(decoded_keys)} transaction list cache keys")
-        else:
-            logger.warning("⚠️ No transaction list cache keys found to delete")
+        cls._bump_list_generations()
+        logger.info("Bumped global transaction list generation")
 
     @classmethod
     def invalidate_transaction_caches(cls, transaction):
         """Invalidate specific transaction caches for both buyer and seller"""
         # Invalidate caches for both buyer and seller since they're both affected
-        cls.invalidate_user_transaction_caches(transaction.buyer.id)
-        cls.invalidate_user_transaction_caches(transaction.seller.id)
+        cls._bump_list_generations(transaction.buyer_id, transaction.seller_id)
 
         logger.info(
-            f"Invalidated caches for transaction {transaction.id} (buyer: {transaction.buyer.id}, seller: {transaction.seller.id})"
+            f"Invalidated caches for transaction {transaction.id} (buyer: {transaction.buyer_id}, seller: {transaction.seller_id})"
         )
 
     @classmethod
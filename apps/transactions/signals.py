@@ -61,7 +61,9 @@ def update_product_inventory(sender, instance, created, **kwargs):
         return
 
     if created:
-        instance.variant.reserve_stock(instance.quantity)
+        # InventoryService reserves stock itself before the escrow commits
+        if not getattr(instance, "_stock_reserved", False):
+            instance.variant.reserve_stock(instance.quantity)
     elif instance.status == "cancelled":
         instance.variant.release_stock(instance.quantity)
     elif instance.status == "completed":
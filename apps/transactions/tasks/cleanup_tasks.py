@@ -5,6 +5,7 @@ from django.conf import settings
 from datetime import timedelta
 
 from apps.core.tasks import BaseTaskWithRetry
+from apps.core.utils.batch_delete import BatchDeleter
 from apps.transactions.models import EscrowTransaction
 
 # Default retention periods
@@ -17,13 +18,14 @@ DEFAULT_CANCELLED_RETENTION_DAYS = (
 
 
 @shared_task(bind=True, base=BaseTaskWithRetry)
-def clean_old_completed_transactions():
+def clean_old_completed_transactions(self):
     """
     Archives or deletes old completed/cancelled/refunded transactions
     that are beyond the retention period.
 
-    In a production system, this would typically move them to an archive
-    table rather than deleting them.
+    Transactions are only counted unless PURGE_OLD_TRANSACTIONS is set, as
+    deleting one also removes its history, dispute and rating. When set,
+    they are deleted in chunks by BatchDeleter.
     """
     now = timezone.now()
 
@@ -45,13 +47,25 @@ def clean_old_completed_transactions():
 
     # Get transactions to clean up
     old_completed = EscrowTransaction.objects.filter(
-        status="completed", modified_at__lt=completed_cutoff
+        status="completed", updated_at__lt=completed_cutoff
     )
 
     old_cancelled = EscrowTransaction.objects.filter(
-        status__in=["cancelled", "refunded"], modified_at__lt=cancelled_cutoff
+        status__in=["cancelled", "refunded"], updated_at__lt=cancelled_cutoff
     )
 
+    if getattr(settings, "PURGE_OLD_TRANSACTIONS", False):
+        completed_count = BatchDeleter(
+            old_completed, "clean_old_completed_transactions:completed"
+        ).run()["deleted"]
+        cancelled_count = BatchDeleter(
+            old_cancelled, "clean_old_completed_transactions:cancelled"
+        ).run()["deleted"]
+        return (
+            f"Deleted {completed_count} rows for old completed and "
+            f"{cancelled_count} rows for old cancelled/refunded transactions"
+        )
+
     # In a real system, you would:
     # 1. Archive these to another table
     # 2. Then delete them from the active table
@@ -5,6 +5,7 @@ from django.utils import timezone
 
 
 from apps.core.tasks import BaseTaskWithRetry
+from apps.core.utils.batch_delete import BatchDeleter
 from apps.products.services.inventory_service import InventoryService
 
 from apps.transactions.models import (
@@ -466,11 +467,14 @@ def cleanup_completed_timeouts(self, days_old=30):
     try:
         cutoff_date = timezone.now() - timezone.timedelta(days=days_old)
 
-        # Delete old completed/cancelled timeouts
-        deleted_count = EscrowTimeout.objects.filter(
-            models.Q(is_executed=True) | models.Q(is_cancelled=True),
-            updated_at__lt=cutoff_date,
-        ).delete()[0]
+        # Delete old completed/cancelled timeouts, a chunk at a time
+        deleted_count = BatchDeleter(
+            EscrowTimeout.objects.filter(
+                models.Q(is_executed=True) | models.Q(is_cancelled=True),
+                updated_at__lt=cutoff_date,
+            ),
+            "cleanup_completed_timeouts",
+        ).run()["deleted"]
 
         logger.info(f"Cleaned up {deleted_count} old timeout records")
         return (
@@ -182,3 +182,33 @@ class TestEscrowHoldsAndLedger:
         running_balance = SellerBalanceService.get_running_balance(self.seller.id)
         assert running_balance == Decimal("-10.00")
         assert SellerBalanceService.is_balance_negative(self.seller.id)
+
+
+@pytest.mark.django_db
+class TestTransactionListCacheGenerations:
+
+    def test_bump_only_affects_the_given_user(self):
+        from apps.transactions.services.transaction_list_service import (
+            TransactionListService,
+        )
+
+        # Users 1 and 11 used to collide on a substring match
+        _, before_1 = TransactionListService._get_list_generations(1)
+        _, before_11 = TransactionListService._get_list_generations(11)
+
+        TransactionListService.invalidate_user_transaction_caches(1)
+
+        assert TransactionListService._get_list_generations(1)[1] == before_1 + 1
+        assert TransactionListService._get_list_generations(11)[1] == before_11
+
+    def test_global_bump_changes_every_users_generation(self):
+        from apps.transactions.services.transaction_list_service import (
+            TransactionListService,
+        )
+
+        before = TransactionListService._get_list_generations(1)
+        TransactionListService.invalidate_all_transaction_list_caches()
+        after = TransactionListService._get_list_generations(1)
+
+        assert after[0] == before[0] + 1
+        assert after[1] == before[1]
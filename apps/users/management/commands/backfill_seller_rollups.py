@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services.seller_rollup_service import SellerRollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild seller daily/monthly analytics rollups from escrow transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seller",
+            action="append",
+            dest="sellers",
+            help="Only rebuild rollups for this seller id (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Rows fetched/inserted per batch (default: 1000)",
+        )
+
+    def handle(self, *args, **options):
+        sellers = options["sellers"]
+        target = f"{len(sellers)} seller(s)" if sellers else "all sellers"
+        self.stdout.write(f"Rebuilding seller rollups for {target}...")
+
+        scanned = SellerRollupService.rebuild(
+            seller_ids=sellers, batch_size=options["batch_size"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt seller rollups from {scanned} transactions")
+        )
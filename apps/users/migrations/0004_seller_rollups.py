@@ -0,0 +1,66 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:35
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_sellerpaymentprofile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SellerDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(max_length=20)),
+                ('order_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('quantity', models.IntegerField(default=0)),
+                ('fees', models.DecimalField(decimal_places=2, default=0, help_text='Platform fees at the configured marketplace fee percentage', max_digits=14)),
+                ('under_25_count', models.IntegerField(default=0)),
+                ('mid_count', models.IntegerField(default=0)),
+                ('high_count', models.IntegerField(default=0)),
+                ('day', models.DateField()),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Seller Daily Rollup',
+                'verbose_name_plural': 'Seller Daily Rollups',
+                'db_table': 'seller_daily_rollups',
+                'indexes': [models.Index(fields=['seller', 'day'], name='seller_dail_seller__5e4ca8_idx')],
+                'constraints': [models.UniqueConstraint(fields=('seller', 'day', 'status'), name='unique_seller_daily_rollup')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SellerMonthlyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('status', models.CharField(max_length=20)),
+                ('order_count', models.IntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('quantity', models.IntegerField(default=0)),
+                ('fees', models.DecimalField(decimal_places=2, default=0, help_text='Platform fees at the configured marketplace fee percentage', max_digits=14)),
+                ('under_25_count', models.IntegerField(default=0)),
+                ('mid_count', models.IntegerField(default=0)),
+                ('high_count', models.IntegerField(default=0)),
+                ('month', models.DateField(help_text='First day of the month')),
+                ('seller', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Seller Monthly Rollup',
+                'verbose_name_plural': 'Seller Monthly Rollups',
+                'db_table': 'seller_monthly_rollups',
+                'indexes': [models.Index(fields=['seller', 'month'], name='seller_mont_seller__3db023_idx')],
+                'constraints': [models.UniqueConstraint(fields=('seller', 'month', 'status'), name='unique_seller_monthly_rollup')],
+            },
+        ),
+    ]
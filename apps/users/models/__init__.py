@@ -3,6 +3,7 @@ from .base import CustomUser
 from .user_address import UserAddress
 from .user_profile import UserProfile
 from .payment_profile import SellerPaymentProfile
+from .seller_rollup import SellerDailyRollup, SellerMonthlyRollup
 
 
 __all__ = [
@@ -10,4 +11,6 @@ __all__ = [
     "UserAddress",
     "UserProfile",
     "SellerPaymentProfile",
+    "SellerDailyRollup",
+    "SellerMonthlyRollup",
 ]
@@ -0,0 +1,78 @@
+from django.db import models
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from apps.core.models import BaseModel
+
+
+class SellerRollupBase(BaseModel):
+    """
+    Pre-aggregated escrow transaction totals for one seller, one period and
+    one transaction status. Rows are kept up to date incrementally from
+    EscrowTransaction saves so analytics never scan raw transactions.
+    """
+
+    seller = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    status = models.CharField(max_length=20)
+
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    quantity = models.IntegerField(default=0)
+    fees = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text=_("Platform fees at the configured marketplace fee percentage"),
+    )
+
+    # Order value distribution (see SellerAnalyticsService._product_performance)
+    under_25_count = models.IntegerField(default=0)
+    mid_count = models.IntegerField(default=0)
+    high_count = models.IntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class SellerDailyRollup(SellerRollupBase):
+    day = models.DateField()
+
+    class Meta:
+        db_table = "seller_daily_rollups"
+        verbose_name = _("Seller Daily Rollup")
+        verbose_name_plural = _("Seller Daily Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seller", "day", "status"], name="unique_seller_daily_rollup"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["seller", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.seller_id} {self.day} {self.status}: {self.order_count}"
+
+
+class SellerMonthlyRollup(SellerRollupBase):
+    month = models.DateField(help_text=_("First day of the month"))
+
+    class Meta:
+        db_table = "seller_monthly_rollups"
+        verbose_name = _("Seller Monthly Rollup")
+        verbose_name_plural = _("Seller Monthly Rollups")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["seller", "month", "status"],
+                name="unique_seller_monthly_rollup",
+            )
+        ]
+        indexes = [
+            models.Index(fields=["seller", "month"]),
+        ]
+
+    def __str__(self):
+        return f"{self.seller_id} {self.month:%Y-%m} {self.status}: {self.order_count}"
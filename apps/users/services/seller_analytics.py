@@ -1,21 +1,34 @@
-from django.db.models import Sum, Count, Avg, Q
-from django.db.models.functions import TruncMonth, ExtractWeekDay
+from collections import defaultdict
+from django.db.models import Sum
+from django.db.models.functions import ExtractWeekDay
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 import calendar
 
+from apps.users.models import SellerDailyRollup, SellerMonthlyRollup
+
 
 class SellerAnalyticsService:
     """
-    Optimized seller analytics: most metrics come from 1–3 queries
-    instead of dozens.
+    Seller analytics served from the pre-aggregated SellerMonthlyRollup /
+    SellerDailyRollup rows (see SellerRollupService): every metric is derived
+    from O(months) rollup rows instead of the seller's raw transactions.
     """
 
+    ROLLUP_FIELDS = (
+        "order_count",
+        "revenue",
+        "quantity",
+        "fees",
+        "under_25_count",
+        "mid_count",
+        "high_count",
+    )
+
     def __init__(self, user):
         now = timezone.now()
         self.user = user
-        self.qs = user.seller_transactions.all()
         # boundaries
         self.start_current = now.replace(
             day=1, hour=0, minute=0, second=0, microsecond=0
@@ -27,6 +40,36 @@ class SellerAnalyticsService:
         )
         self.active_statuses = ["payment_received", "shipped", "delivered"]
 
+        self.monthly = list(
+            SellerMonthlyRollup.objects.filter(seller=user).values(
+                "month", "status", *self.ROLLUP_FIELDS
+            )
+        )
+        self._revenue = None
+        self._weekday = None
+
+    def _total(self, field, statuses=None, since=None, until=None):
+        """Sum a rollup field over monthly rows matching the filters"""
+        return sum(
+            row[field]
+            for row in self.monthly
+            if (statuses is None or row["status"] in statuses)
+            and (since is None or row["month"] >= since.date())
+            and (until is None or row["month"] < until.date())
+        )
+
+    def _weekday_totals(self):
+        """Orders and revenue per weekday (1=Sunday .. 7=Saturday), from daily rollups"""
+        if self._weekday is None:
+            self._weekday = list(
+                SellerDailyRollup.objects.filter(seller=self.user)
+                .annotate(dow=ExtractWeekDay("day"))
+                .values("dow")
+                .annotate(orders=Sum("order_count"), revenue=Sum("revenue"))
+                .order_by("dow")
+            )
+        return self._weekday
+
     def get_comprehensive_seller_analytics(self):
         return {
             "revenue_analytics": self._revenue_analytics(),
@@ -40,103 +83,68 @@ class SellerAnalyticsService:
         }
 
     def _revenue_analytics(self):
-        agg = self.qs.aggregate(
-            # revenue by period
-            curr=Sum(
-                "total_amount",
-                filter=Q(
-                    status__in=self.active_statuses, created_at__gte=self.start_current
-                ),
-            ),
-            prev=Sum(
-                "total_amount",
-                filter=Q(
-                    status__in=self.active_statuses,
-                    created_at__gte=self.start_prev,
-                    created_at__lt=self.start_current,
-                ),
-            ),
-            quarter=Sum(
-                "total_amount",
-                filter=Q(
-                    status__in=self.active_statuses, created_at__gte=self.start_quarter
-                ),
-            ),
-            year=Sum(
-                "total_amount",
-                filter=Q(
-                    status__in=self.active_statuses, created_at__gte=self.start_year
-                ),
-            ),
-            # counts
-            cnt_year=Count(
-                "id",
-                filter=Q(
-                    status__in=self.active_statuses, created_at__gte=self.start_year
-                ),
-            ),
-            # withdrawable & pending
-            withdraw=Sum("total_amount", filter=Q(status="funds_released")),
-            pending=Sum("total_amount", filter=Q(status__in=self.active_statuses)),
+        if self._revenue is not None:
+            return self._revenue
+
+        active = self.active_statuses
+        curr = self._total("revenue", active, since=self.start_current)
+        prev = self._total(
+            "revenue", active, since=self.start_prev, until=self.start_current
+        )
+        # 90 days does not align with month boundaries, so use daily rows
+        quarter = (
+            SellerDailyRollup.objects.filter(
+                seller=self.user,
+                status__in=active,
+                day__gte=self.start_quarter.date(),
+            ).aggregate(total=Sum("revenue"))["total"]
+            or 0
         )
-        curr = agg["curr"] or 0
-        prev = agg["prev"] or 0
         growth = ((curr - prev) / prev * 100) if prev else (100 if curr else 0)
         # avg order values
-        count_curr = (
-            self.qs.filter(
-                status__in=self.active_statuses, created_at__gte=self.start_current
-            ).count()
-            or 1
-        )
+        count_curr = self._total("order_count", active, since=self.start_current) or 1
         count_prev = (
-            self.qs.filter(
-                status__in=self.active_statuses,
-                created_at__gte=self.start_prev,
-                created_at__lt=self.start_current,
-            ).count()
+            self._total(
+                "order_count", active, since=self.start_prev, until=self.start_current
+            )
             or 1
         )
         aov_curr = curr / count_curr
         aov_prev = prev / count_prev
         aov_change = ((aov_curr - aov_prev) / aov_prev * 100) if aov_prev else 0
 
-        return {
+        self._revenue = {
             "current_month": curr,
             "previous_month": prev,
-            "quarterly": agg["quarter"] or 0,
-            "yearly": agg["year"] or 0,
-            "withdrawable_funds": agg["withdraw"] or 0,
-            "pending_revenue": agg["pending"] or 0,
+            "quarterly": quarter,
+            "yearly": self._total("revenue", active, since=self.start_year),
+            "withdrawable_funds": self._total("revenue", ["funds_released"]),
+            "pending_revenue": self._total("revenue", active),
             "revenue_growth": growth,
             "current_aov": aov_curr,
             "aov_change": aov_change,
-            "total_transactions": agg["cnt_year"],
+            "total_transactions": self._total(
+                "order_count", active, since=self.start_year
+            ),
         }
+        return self._revenue
 
     def _order_analytics(self):
-        # Status breakdown in one query
-        breakdown = list(
-            self.qs.values("status").annotate(
-                count=Count("id"), total=Sum("total_amount")
-            )
-        )
-
-        totals = self.qs.aggregate(
-            total_orders=Count("id"),
-            paid=Count("id", filter=Q(status="payment_received")),
-            shipped=Count("id", filter=Q(status="shipped")),
-            delivered=Count("id", filter=Q(status="delivered")),
-            failed=Count(
-                "id", filter=Q(status__in=["cancelled", "refunded", "failed"])
-            ),
-            lost=Sum(
-                "total_amount", filter=Q(status__in=["cancelled", "refunded", "failed"])
-            ),
-        )
+        by_status = defaultdict(lambda: {"count": 0, "total": 0})
+        for row in self.monthly:
+            by_status[row["status"]]["count"] += row["order_count"]
+            by_status[row["status"]]["total"] += row["revenue"]
+        breakdown = [
+            {"status": status, **totals}
+            for status, totals in by_status.items()
+            if totals["count"]
+        ]
 
-        t = totals["total_orders"] or 1
-        paid, ship, deliv = totals["paid"], totals["shipped"], totals["delivered"]
+        failed_statuses = ["cancelled", "refunded", "failed"]
+        t = self._total("order_count") or 1
+        paid = self._total("order_count", ["payment_received"])
+        ship = self._total("order_count", ["shipped"])
+        deliv = self._total("order_count", ["delivered"])
         return {
             "status_breakdown": breakdown,
             "conversion_funnel": {
@@ -149,55 +157,58 @@ class SellerAnalyticsService:
                 "delivery_rate": deliv / ship * 100 if ship else 0,
             },
             "failed_orders": {
-                "count": totals["failed"],
-                "lost_revenue": totals["lost"] or 0,
+                "count": self._total("order_count", failed_statuses),
+                "lost_revenue": self._total("revenue", failed_statuses),
             },
             "success_rate": deliv / t * 100,
         }
 
     def _product_performance(self):
-        # Example: order value buckets in one go
-        buckets = self.qs.aggregate(
-            under_25=Count("id", filter=Q(total_amount__lt=25)),
-            mid=Count("id", filter=Q(total_amount__gte=25, total_amount__lt=100)),
-            high=Count("id", filter=Q(total_amount__gte=100)),
-        )
-        avg_qty = self.qs.aggregate(avg=Avg("quantity"))["avg"] or 0
+        buckets = {
+            "under_25": self._total("under_25_count"),
+            "mid": self._total("mid_count"),
+            "high": self._total("high_count"),
+        }
+        orders = self._total("order_count")
+        avg_qty = self._total("quantity") / orders if orders else 0
         return {
             "order_value_distribution": buckets,
             "average_quantity": avg_qty,
         }
 
     def _customer_analytics(self):
-        # Transaction patterns by hour
-        patterns = list(
-            self.qs.annotate(hour=ExtractWeekDay("created_at"))
-            .values("hour")
-            .annotate(count=Count("id"))
-            .order_by("hour")
-        )
+        # Transaction patterns by day of week
+        patterns = [
+            {"hour": item["dow"], "count": item["orders"]}
+            for item in self._weekday_totals()
+        ]
         return {
             "transaction_patterns": patterns,
             "peak_hours": patterns[:3],
         }
 
+    def _monthly_revenue(self):
+        """Total revenue per month across all statuses, newest first"""
+        totals = defaultdict(Decimal)
+        for row in self.monthly:
+            totals[row["month"]] += row["revenue"]
+        return sorted(totals.items(), reverse=True)
+
     def _financial_health(self):
-        # Monthly trend and volatility with one query
-        months = list(
-            self.qs.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(total=Sum("total_amount"))
-            .order_by("-month")[:6]
+        months = self._monthly_revenue()[:6]
+        revenues = [total for _, total in months]
+        avg = sum(revenues) / len(revenues) if revenues else Decimal(0)
+        var = (
+            sum((r - avg) ** 2 for r in revenues) / len(revenues)
+            if revenues
+            else Decimal(0)
         )
-        revenues = [m["total"] or 0 for m in months]
-        avg = sum(revenues) / len(revenues) if revenues else 0
-        var = sum((r - avg) ** 2 for r in revenues) / len(revenues) if revenues else 0
         vol = var.sqrt()
         return {
             "total_revenue": self._revenue_analytics()["yearly"],
             "monthly_trends": [
-                {"month": m["month"].strftime("%B %Y"), "revenue": m["total"] or 0}
-                for m in reversed(months)
+                {"month": month.strftime("%B %Y"), "revenue": total}
+                for month, total in reversed(months)
             ],
             "average_monthly_revenue": avg,
             "revenue_volatility": vol,
@@ -205,58 +216,39 @@ class SellerAnalyticsService:
         }
 
     def _operational_metrics(self):
-        totals = self.qs.aggregate(
-            total=Count("id"),
-            success=Count("id", filter=Q(status="delivered")),
-            fulfill_count=Count("id", filter=Q(status__in=["shipped", "delivered"])),
-            fulfill_rev=Sum(
-                "total_amount", filter=Q(status__in=["shipped", "delivered"])
-            ),
-        )
+        total = self._total("order_count")
+        success = self._total("order_count", ["delivered"])
         days = max(1, (timezone.now() - self.start_current).days)
         return {
-            "processing_efficiency": (
-                totals["success"] / totals["total"] * 100 if totals["total"] else 0
-            ),
-            "daily_transaction_average": totals["total"] / days,
+            "processing_efficiency": (success / total * 100 if total else 0),
+            "daily_transaction_average": total / days,
             "fulfillment_metrics": {
-                "count": totals["fulfill_count"],
-                "revenue": totals["fulfill_rev"] or 0,
+                "count": self._total("order_count", ["shipped", "delivered"]),
+                "revenue": self._total("revenue", ["shipped", "delivered"]),
             },
         }
 
     def _growth_metrics(self):
         rev = self._revenue_analytics()
-        growth = (
-            (rev["current_month"] - rev["previous_month"]) / rev["previous_month"] * 100
-            if rev["previous_month"]
-            else (100 if rev["current_month"] else 0)
-        )
         return {
             "revenue_growth": rev["revenue_growth"],
             "growth_trajectory": rev,  # you can reuse or recompute as needed
         }
 
     def _seasonal_trends(self):
-        # Yearly month & day-of-week at once
-        month_perf = {
-            item["month"]: {"revenue": item["revenue"], "orders": item["orders"]}
-            for item in self.qs.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(revenue=Sum("total_amount"), orders=Count("id"))
-        }
+        month_perf = defaultdict(lambda: {"revenue": 0, "orders": 0})
+        for row in self.monthly:
+            month_perf[row["month"]]["revenue"] += row["revenue"]
+            month_perf[row["month"]]["orders"] += row["order_count"]
 
         dow_perf = {
             item["dow"]: {"revenue": item["revenue"], "orders": item["orders"]}
-            for item in self.qs.annotate(dow=ExtractWeekDay("created_at"))
-            .values("dow")
-            .annotate(revenue=Sum("total_amount"), orders=Count("id"))
+            for item in self._weekday_totals()
         }
 
         return {
             "monthly_performance": {
-                m.strftime("%B"): month_perf.get(m, {"revenue": 0, "orders": 0})
-                for m in month_perf
+                m.strftime("%B"): perf for m, perf in sorted(month_perf.items())
             },
             "day_of_week_performance": {
                 calendar.day_name[d - 1]: dow_perf.get(d, {"revenue": 0, "orders": 0})
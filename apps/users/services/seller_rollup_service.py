@@ -0,0 +1,155 @@
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.users.models import SellerDailyRollup, SellerMonthlyRollup
+
+logger = logging.getLogger(__name__)
+
+# EscrowTransaction fields that determine a transaction's rollup contribution
+ROLLUP_SOURCE_FIELDS = ("seller_id", "created_at", "status", "total_amount", "quantity")
+
+
+class SellerRollupService:
+    """
+    Maintains SellerDailyRollup / SellerMonthlyRollup rows.
+
+    Every EscrowTransaction contributes one order to the (seller, period,
+    status) bucket of the day and month it was created in. When a transaction
+    changes, its old contribution is subtracted and the new one added, so the
+    rollups stay exact without rescanning history. Bulk ``QuerySet.update()``
+    calls bypass signals; run ``backfill_seller_rollups`` after those.
+    """
+
+    @staticmethod
+    def fee_for(amount) -> Decimal:
+        """Platform fee for an amount, matching the ledger fee debit"""
+        fee_percentage = Decimal(
+            str(getattr(settings, "MARKETPLACE_FEE_PERCENTAGE", 0.05))
+        )
+        return (Decimal(str(amount)) * fee_percentage).quantize(Decimal("0.01"))
+
+    @staticmethod
+    def snapshot(escrow_transaction):
+        """Extract the rollup-relevant values of a transaction instance"""
+        return {
+            field: getattr(escrow_transaction, field) for field in ROLLUP_SOURCE_FIELDS
+        }
+
+    @staticmethod
+    def snapshot_from_db(pk):
+        """Load the currently stored rollup-relevant values, or None"""
+        from apps.transactions.models import EscrowTransaction
+
+        return (
+            EscrowTransaction.objects.filter(pk=pk)
+            .values(*ROLLUP_SOURCE_FIELDS)
+            .first()
+        )
+
+    @staticmethod
+    def _periods(created_at):
+        day = timezone.localtime(created_at).date()
+        return day, day.replace(day=1)
+
+    @classmethod
+    def _deltas(cls, values, sign):
+        amount = Decimal(str(values["total_amount"] or 0))
+        return {
+            "order_count": sign,
+            "revenue": sign * amount,
+            "quantity": sign * (values["quantity"] or 0),
+            "fees": sign * cls.fee_for(amount),
+            "under_25_count": sign if amount < 25 else 0,
+            "mid_count": sign if 25 <= amount < 100 else 0,
+            "high_count": sign if amount >= 100 else 0,
+        }
+
+    @classmethod
+    def apply(cls, values, sign):
+        """Add (sign=1) or remove (sign=-1) one transaction's contribution"""
+        if not values or not values.get("created_at"):
+            return
+
+        day, month = cls._periods(values["created_at"])
+        deltas = cls._deltas(values, sign)
+        updates = {field: F(field) + delta for field, delta in deltas.items()}
+
+        for model, lookup in (
+            (SellerDailyRollup, {"day": day}),
+            (SellerMonthlyRollup, {"month": month}),
+        ):
+            row, _ = model.objects.get_or_create(
+                seller_id=values["seller_id"], status=values["status"], **lookup
+            )
+            model.objects.filter(pk=row.pk).update(**updates)
+
+    @classmethod
+    def record_change(cls, before, after):
+        """Move a transaction's contribution from its old bucket to its new one"""
+        if before == after:
+            return
+
+        with transaction.atomic():
+            cls.apply(before, -1)
+            cls.apply(after, 1)
+
+    @classmethod
+    @transaction.atomic
+    def rebuild(cls, seller_ids=None, batch_size=1000):
+        """
+        Recompute rollups from raw transactions (all sellers, or only
+        ``seller_ids``). Returns the number of transactions scanned.
+        """
+        from apps.transactions.models import EscrowTransaction
+
+        queryset = EscrowTransaction.objects.all()
+        daily_rows = SellerDailyRollup.objects.all()
+        monthly_rows = SellerMonthlyRollup.objects.all()
+        if seller_ids is not None:
+            queryset = queryset.filter(seller_id__in=seller_ids)
+            daily_rows = daily_rows.filter(seller_id__in=seller_ids)
+            monthly_rows = monthly_rows.filter(seller_id__in=seller_ids)
+
+        daily = defaultdict(lambda: defaultdict(int))
+        monthly = defaultdict(lambda: defaultdict(int))
+        scanned = 0
+
+        for values in queryset.values(*ROLLUP_SOURCE_FIELDS).iterator(
+            chunk_size=batch_size
+        ):
+            day, month = cls._periods(values["created_at"])
+            for field, delta in cls._deltas(values, 1).items():
+                daily[(values["seller_id"], day, values["status"])][field] += delta
+                monthly[(values["seller_id"], month, values["status"])][field] += delta
+            scanned += 1
+
+        daily_rows.delete()
+        monthly_rows.delete()
+        SellerDailyRollup.objects.bulk_create(
+            [
+                SellerDailyRollup(seller_id=seller_id, day=day, status=status, **totals)
+                for (seller_id, day, status), totals in daily.items()
+            ],
+            batch_size=batch_size,
+        )
+        SellerMonthlyRollup.objects.bulk_create(
+            [
+                SellerMonthlyRollup(
+                    seller_id=seller_id, month=month, status=status, **totals
+                )
+                for (seller_id, month, status), totals in monthly.items()
+            ],
+            batch_size=batch_size,
+        )
+
+        logger.info(
+            f"Rebuilt seller rollups from {scanned} transactions "
+            f"({len(daily)} daily, {len(monthly)} monthly rows)"
+        )
+        return scanned
@@ -1,11 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.db import transaction
 
 
+from apps.transactions.models import EscrowTransaction
 from apps.users.models.base import CustomUser
 from apps.users.models.user_address import UserAddress
 from apps.users.models.user_profile import UserProfile
+from apps.users.services.seller_rollup_service import SellerRollupService
 
 
 @receiver(post_save, sender=CustomUser)
@@ -35,3 +37,25 @@ def create_user_profile(sender, instance, created, **kwargs):
             # Clear the temp field on the user
             instance.temp_profile_picture_url = None
             instance.save(update_fields=["temp_profile_picture_url"])
+
+
+@receiver(pre_save, sender=EscrowTransaction)
+def capture_rollup_snapshot(sender, instance, **kwargs):
+    """Remember the stored values so post_save can move the rollup contribution"""
+    instance._rollup_before = (
+        None
+        if instance._state.adding
+        else SellerRollupService.snapshot_from_db(instance.pk)
+    )
+
+
+@receiver(post_save, sender=EscrowTransaction)
+def update_seller_rollups(sender, instance, created, **kwargs):
+    """Apply the transaction's delta to the seller's daily and monthly rollups"""
+    before = getattr(instance, "_rollup_before", None)
+    SellerRollupService.record_change(before, SellerRollupService.snapshot(instance))
+
+
+@receiver(post_delete, sender=EscrowTransaction)
+def remove_from_seller_rollups(sender, instance, **kwargs):
+    SellerRollupService.apply(SellerRollupService.snapshot(instance), -1)
@@ -0,0 +1,100 @@
+from decimal import Decimal
+import pytest
+from django.contrib.auth import get_user_model
+
+from apps.categories.models import Category
+from apps.products.models import Product, ProductCondition
+from apps.transactions.models import EscrowTransaction
+from apps.users.models import SellerDailyRollup, SellerMonthlyRollup
+from apps.users.services.seller_analytics import SellerAnalyticsService
+from apps.users.services.seller_rollup_service import SellerRollupService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestSellerRollups:
+
+    @pytest.fixture(autouse=True)
+    def setup_data(self):
+        self.buyer = User.objects.create_user(
+            email="buyer@test.com", password="testpass123", first_name="Buyer"
+        )
+        self.seller = User.objects.create_user(
+            email="seller@test.com", password="testpass123", first_name="Seller"
+        )
+        condition = ProductCondition.objects.create(name="New", slug="new")
+        category = Category.objects.create(name="Electronics", slug="elec")
+        self.product = Product.objects.create(
+            title="Test Widget",
+            seller=self.seller,
+            condition=condition,
+            category=category,
+            price=Decimal("150.00"),
+        )
+
+    def _create_transaction(self, tracking_id, amount, quantity=1):
+        return EscrowTransaction.objects.create(
+            product=self.product,
+            buyer=self.buyer,
+            seller=self.seller,
+            tracking_id=tracking_id,
+            price=amount,
+            total_amount=amount,
+            quantity=quantity,
+            status=EscrowTransaction.STATUS_INITIATED,
+        )
+
+    def _monthly(self):
+        return {
+            row.status: row
+            for row in SellerMonthlyRollup.objects.filter(seller=self.seller)
+        }
+
+    def test_status_change_moves_contribution(self):
+        tx = self._create_transaction("ROLL-1", Decimal("150.00"), quantity=2)
+        self._create_transaction("ROLL-2", Decimal("20.00"))
+
+        tx.status = EscrowTransaction.STATUS_SHIPPED
+        tx.save()
+
+        rows = self._monthly()
+        assert rows["initiated"].order_count == 1
+        assert rows["initiated"].under_25_count == 1
+        assert rows["shipped"].order_count == 1
+        assert rows["shipped"].revenue == Decimal("150.00")
+        assert rows["shipped"].quantity == 2
+        assert rows["shipped"].fees == SellerRollupService.fee_for("150.00")
+        assert SellerDailyRollup.objects.get(
+            seller=self.seller, status="shipped"
+        ).high_count == 1
+
+    def test_rebuild_matches_incremental_rollups(self):
+        tx = self._create_transaction("ROLL-3", Decimal("60.00"))
+        tx.status = EscrowTransaction.STATUS_PAYMENT_RECEIVED
+        tx.save()
+        self._create_transaction("ROLL-4", Decimal("10.00"))
+
+        incremental = {
+            status: (row.order_count, row.revenue, row.mid_count)
+            for status, row in self._monthly().items()
+            if row.order_count
+        }
+        SellerRollupService.rebuild(seller_ids=[self.seller.id])
+        rebuilt = {
+            status: (row.order_count, row.revenue, row.mid_count)
+            for status, row in self._monthly().items()
+        }
+
+        assert rebuilt == incremental
+
+    def test_analytics_read_from_rollups(self):
+        tx = self._create_transaction("ROLL-5", Decimal("80.00"))
+        tx.status = EscrowTransaction.STATUS_DELIVERED
+        tx.save()
+
+        analytics = SellerAnalyticsService(self.seller).get_comprehensive_seller_analytics()
+
+        assert analytics["revenue_analytics"]["current_month"] == Decimal("80.00")
+        assert analytics["order_analytics"]["conversion_funnel"]["delivered"] == 1
+        assert analytics["product_performance"]["order_value_distribution"]["mid"] == 1
@@ -459,6 +459,7 @@ from .utils.logging import *  # noqa: F403 F401
 from .utils.cache_keys import *  # noqa: F403 F401
 from .utils.negotiation import *  # noqa: F403 F401
 from .utils.search_settings import *  # noqa: F403 F401
+from .utils.partitioning import *  # noqa: F403 F401
 
 # -----------------------------------------------------------------------------
 # Channels Configuration
@@ -478,5 +479,14 @@ CHANNEL_LAYERS = {
 PAYSTACK_SECRET_KEY = env.get("PAYSTACK_SECRET_KEY", default="sk_test_mock_secret_key_123456")
 PAYSTACK_PUBLIC_KEY = env.get("PAYSTACK_PUBLIC_KEY", default="pk_test_mock_public_key_123456")
 PAYSTACK_WEBHOOK_SECRET = env.get("PAYSTACK_WEBHOOK_SECRET", default="mock_webhook_secret_123456")
+PAYSTACK_BASE_URL = env.get("PAYSTACK_BASE_URL", default="https://api.paystack.co")
+# HTTP client tuning (see apps.paystack.clients)
+PAYSTACK_CONNECT_TIMEOUT = 3.05  # seconds
+PAYSTACK_READ_TIMEOUT = 10  # seconds
+PAYSTACK_POOL_MAXSIZE = 20  # keep-alive connections per process
+PAYSTACK_GET_MAX_RETRIES = 3  # idempotent GETs only; POSTs are never retried
+PAYSTACK_RETRY_BACKOFF = 0.3  # exponential backoff factor (seconds)
+PAYSTACK_RESOLVE_CACHE_TTL = 60 * 60 * 24  # account resolution is stable
+PAYSTACK_BANKS_CACHE_TTL = 60 * 60 * 12
 KYC_PROVIDER = env.get("KYC_PROVIDER", default="mock")
 
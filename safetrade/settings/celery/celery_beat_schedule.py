@@ -143,6 +143,39 @@ CELERY_BEAT_SCHEDULE = {
         "task": "apps.products.tasks.cleanup_search_logs",
         "schedule": crontab(minute=30, hour=3),  # Daily at 3:30 AM
     },
+    # ============================================
+    # PAYSTACK WEBHOOK INBOX
+    # ============================================
+    # Safety net: retry failed events and pick up any missed triggers
+    "process-paystack-webhook-events": {
+        "task": "apps.paystack.tasks.process_paystack_webhook_events",
+        "schedule": crontab(minute="*/1"),  # Every minute
+        "options": {
+            "expires": 60,  # Task expires after 1 minute
+        },
+    },
+    # ============================================
+    # PRODUCT ENGAGEMENT COUNTERS
+    # ============================================
+    "reconcile-product-counters": {
+        "task": "apps.products.tasks.counters.reconcile_product_counters",
+        "schedule": crontab(minute=0, hour=4),  # Daily at 4:00 AM
+    },
+    "recompute-dirty-rating-aggregates": {
+        "task": "apps.products.tasks.rating.recompute_dirty_rating_aggregates",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
+    # ============================================
+    # TABLE PARTITIONS
+    # ============================================
+    # Create upcoming monthly partitions, expire the ones past retention
+    "maintain-partitions": {
+        "task": "apps.core.tasks.maintain_partitions",
+        "schedule": crontab(minute=15, hour=3),  # Daily at 3:15 AM
+        "options": {
+            "expires": 3600,  # Task expires after 1 hour
+        },
+    },
 }
 
 # Additional configuration for development/testing environments
@@ -258,6 +291,39 @@ CELERY_BEAT_SCHEDULE_DEV = {
         "task": "apps.products.tasks.cleanup_search_logs",
         "schedule": crontab(minute=30, hour=3),  # Daily at 3:30 AM
     },
+    # ============================================
+    # PAYSTACK WEBHOOK INBOX
+    # ============================================
+    # Safety net: retry failed events and pick up any missed triggers
+    "process-paystack-webhook-events": {
+        "task": "apps.paystack.tasks.process_paystack_webhook_events",
+        "schedule": crontab(minute="*/1"),  # Every minute
+        "options": {
+            "expires": 60,  # Task expires after 1 minute
+        },
+    },
+    # ============================================
+    # PRODUCT ENGAGEMENT COUNTERS
+    # ============================================
+    "reconcile-product-counters": {
+        "task": "apps.products.tasks.counters.reconcile_product_counters",
+        "schedule": crontab(minute=0, hour=4),  # Daily at 4:00 AM
+    },
+    "recompute-dirty-rating-aggregates": {
+        "task": "apps.products.tasks.rating.recompute_dirty_rating_aggregates",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
+    # ============================================
+    # TABLE PARTITIONS
+    # ============================================
+    # Create upcoming monthly partitions, expire the ones past retention
+    "maintain-partitions": {
+        "task": "apps.core.tasks.maintain_partitions",
+        "schedule": crontab(minute=15, hour=3),  # Daily at 3:15 AM
+        "options": {
+            "expires": 3600,  # Task expires after 1 hour
+        },
+    },
 }
 
 # Testing configuration (even more frequent for testing)
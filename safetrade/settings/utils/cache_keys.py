@@ -86,6 +86,10 @@ CACHE_KEY_TEMPLATES = {
         "options": "variant:options:product_id:{product_id}:option_ids:{option_ids}",
         "popular_conditions": "variant:popular_conditions:{limit}",
         "analytics": "variant:analytics:{variant_id}",
+        "matrix": "variant:matrix:{product_id}",
+        "stock": "variant:stock:{product_id}",  # Redis hash, variant id -> stock
+        # Redis hash, variant id -> times its stock field was invalidated
+        "stock_version": "variant:stock_version:{product_id}",
     },
     "product_inventory": {
         "detail": "inventory:detail:{id}",
@@ -123,13 +127,19 @@ CACHE_KEY_TEMPLATES = {
         "detail": "category:detail:{id}",
         "list": "category:list:include_inactive:{include_inactive}",
         "tree": "category:tree:{max_depth}:{include_inactive}",
+        "tree_rebuild_pending": "category:tree_rebuild_pending",
         "subcategory_ids": "category:subcategory_ids:{category_id}",
         "popular_categories": "category:popular_categories:{limit}",
         "breadcrumb_path": "category:breadcrumb_path:{category_id}",
+        "breadcrumb_map": "category:breadcrumb_map:g{generation}",
+        "breadcrumb_generation": "category:breadcrumb_generation",
     },
     "escrow_transaction": {
         "detail": "escrow:transaction:detail:{id}",
-        "list_user": "escrow:transaction:list:{user_id}:{params}",
+        "list_user": "escrow:transaction:list:{user_id}:g{global_generation}.{generation}:{params}",
+        # Generation counters embedded in list_user keys (bumped with INCR)
+        "list_generation": "escrow:transaction:list_generation:{user_id}",
+        "list_global_generation": "escrow:transaction:list_generation:global",
         "my_purchases": "escrow:transaction:purchases:user:{user_id}",
         "my_sales": "escrow:transaction:sales:{user_id}",
         "tracking": "escrow:transaction:{user_id}:{tracking_id}",
@@ -154,6 +164,8 @@ CACHE_KEY_TEMPLATES = {
         "can_rate": "ratings:can_rate:{product_id}",
         "recent": "ratings:recent:limit:{limit}",
         "flagged": "ratings:flagged",
+        # Redis set of product ids whose aggregates need a full recompute
+        "dirty_aggregates": "ratings:aggregate:dirty",
         # Wildcard patterns for bulk deletion
         "all_ratings": "ratings:*",  # For all ratings
     },
@@ -166,8 +178,17 @@ CACHE_KEY_TEMPLATES = {
         "by_product": "watchlist:by_product:product:{product_id}",
         "product_count": "watchlist:product_count:product:{product_id}",
         "toggle_product": "watchlist:toggle_product:user:{user_id}:product:{product_id}",
+        # Per-product rate limit for watcher price/availability alerts
+        "alert_cooldown": "watchlist:alert_cooldown:{product_id}:{event}",
         # Wildcard patterns for bulk deletion
     },
+    # Raw Redis structures written through by WatchlistMembershipService
+    "watchlist_membership": {
+        "members": "watchlist:members:user:{user_id}",
+        "loaded": "watchlist:members_loaded:user:{user_id}",
+        # Bumped by every write-through so a concurrent rebuild backs off
+        "generation": "watchlist:members_generation:user:{user_id}",
+    },
     "rating": {
         "detail": "ratings:detail:{id}",
         "list": "ratings:list:user_id:{user_id}:page:{page}",
@@ -184,6 +205,18 @@ CACHE_KEY_TEMPLATES = {
         "stats": "dispute:stats:user_id:{user_id}",
         "open_disputes": "dispute:open:user_id:{user_id}",
     },
+    "paystack": {
+        "resolve_account": "paystack:resolve_account:{bank_code}:{account_number}",
+        "banks": "paystack:banks:{country}",
+    },
+    "pagination": {
+        # Cached totals for keyset pages, keyed by a hash of the filtered SQL
+        "count": "pagination:count:{model}:{filter_hash}",
+    },
+    "batch_delete": {
+        # Last primary key deleted by an unfinished BatchDeleter run
+        "checkpoint": "batch_delete:checkpoint:{name}",
+    },
     # …add new resources here as needed…
 }
 
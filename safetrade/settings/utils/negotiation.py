@@ -6,6 +6,7 @@ NEGOTIATION_SETTINGS = {
     "DEFAULT_NEGOTIATION_DEADLINE_HOURS": 72,  # Default 3 days
     "MIN_OFFER_PERCENTAGE": 30,  # Minimum 30% of original price
     "AUTO_EXPIRE_HOURS": 168,  # Auto-expire after 7 days
+    "EXPIRE_BATCH_SIZE": 500,  # Rows expired per UPDATE
     # Rate Limiting
     "HOURLY_NEGOTIATION_LIMIT": 20,
     "DAILY_NEGOTIATION_LIMIT": 50,
@@ -0,0 +1,41 @@
+from .get_env import env
+
+# Monthly range partitioning for append-only tables (PostgreSQL only).
+# Tables are converted once with `manage_partitions --convert`; afterwards the
+# `maintain_partitions` task creates upcoming months and expires old ones.
+#
+#   column            - timestamp the table is partitioned on
+#   retention_months  - whole months kept before a partition expires
+#                       (None keeps everything)
+#   expire            - "detach" keeps an expired partition as a standalone
+#                       table, "drop" removes it
+PARTITIONED_TABLES = {
+    "product_inventory_transactions": {
+        "column": "created_at",
+        "retention_months": 12,
+        "expire": "drop",
+    },
+    "search_log": {
+        "column": "created_at",
+        "retention_months": 1,
+        "expire": "drop",
+    },
+    # Escrow history and notifications are read by the app for as long as they
+    # exist; they are partitioned for pruning only and never expire
+    "transaction_history": {
+        "column": "timestamp",
+        "retention_months": None,
+        "expire": "detach",
+    },
+    "notifications_notification": {
+        "column": "created_at",
+        "retention_months": None,
+        "expire": "detach",
+    },
+}
+
+# Months of empty partitions kept ready ahead of the current one
+PARTITION_PREMAKE_MONTHS = 3
+
+# When set, expired partitions are exported here as gzipped CSV first
+PARTITION_ARCHIVE_DIR = env.get("PARTITION_ARCHIVE_DIR", default="") or None
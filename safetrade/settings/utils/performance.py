@@ -18,6 +18,7 @@ PERFORMANCE_API_PREFIXES = {
     "/api/v1/variants": "variant",
     "/api/v1/disputes": "disputes",
     "/api/v1/search": "search",
+    "/api/v1/paystack": "paystack",  # also used by the outbound PaystackClient
     # …add more as needed…
 }
 
@@ -37,3 +38,13 @@ CACHE_HIT_RATIO_THRESHOLD = 80  # in percent
 PERFORMANCE_CHECK_INTERVAL_SECONDS = 300  # run every 5 minutes
 
 SLOW_REQUEST_THRESHOLD_SEC = 2  # log any request taking longer than 2 seconds
+
+# 5) Chunked deletes used by the retention/cleanup tasks:
+BATCH_DELETE_SETTINGS = {
+    "BATCH_SIZE": 1000,  # rows in the first chunk, and the most per chunk
+    "MIN_BATCH_SIZE": 50,  # chunks never shrink below this
+    "CHUNK_SECONDS": 0.5,  # time budget per chunk, also the lock_timeout
+    "PAUSE_SECONDS": 0.1,  # sleep between chunks
+    "MAX_SECONDS": 240,  # stop and checkpoint after this long
+    "CHECKPOINT_TTL": 60 * 60 * 24 * 7,  # keep an unfinished run's checkpoint
+}